@@ -0,0 +1,260 @@
+"""Solve-result cache keyed by a canonical request fingerprint."""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable
+
+from .models import SolveRequest, SolveResponse
+
+
+def fingerprint(req: SolveRequest) -> str:
+    """
+    SHA-256 of the request in canonical form: ``schedule_id`` and
+    ``response_format`` (encoding only) are dropped and
+    every list whose order carries no meaning (courses, sections, lab groups,
+    faculty, rooms, batches, qualification / section ids, availability slots,
+    assignments, neighborhood) is sorted. Day order in the time config is
+    kept, since it defines the slot ordering the objective uses.
+    """
+    data = req.model_dump(exclude={"schedule_id", "response_format"})
+
+    def by_id(items: list[dict]) -> list[dict]:
+        return sorted(items, key=lambda item: item["id"])
+
+    def availability(avail: dict[str, list[int]]) -> dict[str, list[int]]:
+        return {day: sorted(set(slots)) for day, slots in avail.items()}
+
+    for course in data["courses"]:
+        for section in course["sections"]:
+            section["lab_groups"] = by_id(section["lab_groups"])
+        course["sections"] = by_id(course["sections"])
+    for fac in data["faculty"]:
+        fac["availability"] = availability(fac["availability"])
+        fac["qualified_course_ids"] = sorted(set(fac["qualified_course_ids"]))
+    for room in data["rooms"]:
+        room["availability"] = availability(room["availability"])
+    for batch in data["batches"]:
+        batch["section_ids"] = sorted(batch["section_ids"])
+    for key in ("courses", "faculty", "rooms", "batches"):
+        data[key] = by_id(data[key])
+    for key in ("previous_assignments", "locked_assignments"):
+        data[key] = sorted(data[key], key=lambda a: json.dumps(a, sort_keys=True))
+    data["neighborhood"] = sorted(set(data["neighborhood"]))
+
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+DEFINITIVE_STATUSES = ("OPTIMAL", "INFEASIBLE")
+
+
+def cacheable(res: SolveResponse) -> bool:
+    """
+    Outcomes that more search time cannot change: a timetable CP-SAT proved
+    optimal (or the fast-mode greedy timetable, which involves no search),
+    or infeasibility proven by CP-SAT or the prechecks. The time limit is
+    not part of the fingerprint, so anything a limit or a cancel cut short
+    - a feasible but unproven timetable, a timeout, the greedy fallback - is
+    left out and solved again next time.
+    """
+    if res.cancelled or res.status not in ("SUCCESS", "INFEASIBLE"):
+        return False
+    diagnostics = res.diagnostics
+    if diagnostics is None:
+        return True
+    if diagnostics.stats is not None and diagnostics.stats.solver_status not in DEFINITIVE_STATUSES:
+        return False
+    return all(
+        c.status != "FAILED" and c.solver_status in (None, *DEFINITIVE_STATUSES) for c in diagnostics.components
+    )
+
+
+class ResultCache:
+    """
+    In-memory LRU of ``SolveResponse`` by fingerprint, bounded by entry count
+    and age, optionally backed by one JSON file per entry in ``directory`` so
+    results survive restarts. Concurrent misses on one fingerprint share a
+    single solve.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 3600.0,
+        directory: str | None = None,
+        max_disk_entries: int = 1000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, SolveResponse]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "inflight_waits": 0, "evictions": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> SolveResponse | None:
+        """Cached response for ``key``, or None; counts a hit but never a miss."""
+        with self._lock:
+            res = self._memory_hit(key)
+        if res is not None:
+            return res
+
+        res, created = self._read_disk(key)
+        if res is None:
+            return None
+        with self._lock:
+            self._insert(key, res, created)
+            self.counters["disk_hits"] += 1
+        return res
+
+    def put(self, key: str, res: SolveResponse) -> None:
+        if not cacheable(res):
+            return
+        created = time.time()
+        with self._lock:
+            self._insert(key, res, created)
+        self._write_disk(key, res, created)
+
+    def get_or_solve(self, req: SolveRequest, solve_fn: Callable[[SolveRequest], SolveResponse]) -> SolveResponse:
+        """Serve ``req`` from the cache, join an identical solve in flight, or run ``solve_fn``."""
+        key = fingerprint(req)
+        res = self.get(key)
+        if res is not None:
+            return res
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                # an identical solve may have finished since the lookup above
+                res = self._memory_hit(key)
+                if res is not None:
+                    return res
+                future = self._inflight[key] = Future()
+                self.counters["misses"] += 1
+            else:
+                self.counters["inflight_waits"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            res = solve_fn(req)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            self.put(key, res)
+            future.set_result(res)
+            return res
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def render_metrics(self) -> str:
+        """Prometheus text lines for the cache counters."""
+        with self._lock:
+            lines = [
+                "# HELP timetable_cache_events_total Solve-result cache lookups and evictions.",
+                "# TYPE timetable_cache_events_total counter",
+            ]
+            lines += [f'timetable_cache_events_total{{event="{k}"}} {v}' for k, v in self.counters.items()]
+            lines += [
+                "# HELP timetable_cache_entries Results held in memory.",
+                "# TYPE timetable_cache_entries gauge",
+                f"timetable_cache_entries {len(self._entries)}",
+            ]
+            return "\n".join(lines) + "\n"
+
+    def _memory_hit(self, key: str) -> SolveResponse | None:
+        """Fresh in-memory entry for ``key``; caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, res = entry
+        if time.time() - created > self.ttl_seconds:
+            del self._entries[key]
+            self.counters["evictions"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return res
+
+    def _insert(self, key: str, res: SolveResponse, created: float) -> None:
+        self._entries[key] = (created, res)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> tuple[SolveResponse | None, float]:
+        if not self.directory:
+            return None, 0.0
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            created = stored["created"]
+            if time.time() - created > self.ttl_seconds:
+                os.remove(path)
+                return None, 0.0
+            res = SolveResponse.model_validate(stored["response"])
+            if not cacheable(res):  # written before the rule tightened
+                os.remove(path)
+                return None, 0.0
+            return res, created
+        except (OSError, ValueError, KeyError):
+            return None, 0.0
+
+    def _write_disk(self, key: str, res: SolveResponse, created: float) -> None:
+        if not self.directory:
+            return
+        tmp = self._path(key) + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"created": created, "response": res.model_dump(mode="json")}, f)
+            os.replace(tmp, self._path(key))
+            self._prune_disk()
+        except OSError:
+            pass  # the disk store is best effort; the memory cache still holds the result
+
+    def _prune_disk(self) -> None:
+        files = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory) if name.endswith(".json")
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("SOLVER_CACHE_ENTRIES", "128")),
+    ttl_seconds=float(os.environ.get("SOLVER_CACHE_TTL_SECONDS", "3600")),
+    directory=os.environ.get("SOLVER_CACHE_DIR") or None,
+    max_disk_entries=int(os.environ.get("SOLVER_CACHE_DISK_ENTRIES", "1000")),
+)
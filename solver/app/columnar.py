@@ -0,0 +1,113 @@
+"""Columnar response encoding: shared lookup tables plus integer columns per assignment.
+
+Opt-in alternative to the row-per-assignment JSON, chosen with
+``response_format="columnar"`` or ``Accept: application/vnd.timetable.columnar+json``.
+Every assignment list (``assignments``, and each alternative's
+``assignments`` / ``added`` / ``removed``) becomes a block of equal-length
+columns; string columns hold indices into ``tables``::
+
+    {"format": "columnar",
+     "tables": {"courses": [[code, name], ...], "faculty": [...], "rooms": [...],
+                "batches": [...], "sections": [...], "lab_groups": [...],
+                "days": [...], "times": ["09:00", ...]},
+     "assignments": {"course": [...], "faculty": [...], ..., "lab_group": [... -1 = none],
+                     "day": [...], "slot_index": [...], "duration": [...],
+                     "start_time": [...], "end_time": [...]},
+     ...}
+"""
+
+from __future__ import annotations
+import json
+
+from fastapi import Response
+
+from .models import AssignmentResult, SolveResponse
+from .domain.index import Interner
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.timetable.columnar+json"
+
+
+def wants_columnar(response_format: str, accept: str | None) -> bool:
+    return response_format == "columnar" or COLUMNAR_MEDIA_TYPE in (accept or "")
+
+
+class _Tables:
+    def __init__(self):
+        self.courses = Interner()  # "code\0name"
+        self.faculty = Interner()
+        self.rooms = Interner()
+        self.batches = Interner()
+        self.sections = Interner()
+        self.lab_groups = Interner()
+        self.days = Interner()
+        self.times = Interner()
+
+    def columns(self, rows: list[AssignmentResult]) -> dict[str, list[int]]:
+        """One block of columns; reads attributes directly, no per-row dumps."""
+        return {
+            "course": [self.courses.add(f"{a.course_code}\0{a.course_name}") for a in rows],
+            "faculty": [self.faculty.add(a.faculty_id) for a in rows],
+            "room": [self.rooms.add(a.room_id) for a in rows],
+            "batch": [self.batches.add(a.batch_id) for a in rows],
+            "section": [self.sections.add(a.section_id) for a in rows],
+            "lab_group": [self.lab_groups.add(a.lab_group_id) if a.lab_group_id else -1 for a in rows],
+            "day": [self.days.add(a.day) for a in rows],
+            "slot_index": [a.slot_index for a in rows],
+            "duration": [a.duration for a in rows],
+            "start_time": [self.times.add(a.start_time) for a in rows],
+            "end_time": [self.times.add(a.end_time) for a in rows],
+        }
+
+    def dump(self) -> dict[str, list]:
+        return {
+            "courses": [key.split("\0", 1) for key in self.courses.ids],
+            "faculty": self.faculty.ids,
+            "rooms": self.rooms.ids,
+            "batches": self.batches.ids,
+            "sections": self.sections.ids,
+            "lab_groups": self.lab_groups.ids,
+            "days": self.days.ids,
+            "times": self.times.ids,
+        }
+
+
+def encode(res: SolveResponse) -> dict:
+    """``res`` as a plain dict with every assignment list in columnar form."""
+    tables = _Tables()
+    payload = {
+        "format": "columnar",
+        "status": res.status,
+        "solve_time_ms": res.solve_time_ms,
+        "total_score": res.total_score,
+        "assignments": tables.columns(res.assignments),
+        "diagnostics": res.diagnostics.model_dump(mode="json") if res.diagnostics else None,
+        "alternatives": [
+            {
+                "objective": alt.objective,
+                "distance": alt.distance,
+                "assignments": tables.columns(alt.assignments),
+                "added": tables.columns(alt.added),
+                "removed": tables.columns(alt.removed),
+            }
+            for alt in res.alternatives
+        ],
+        "cancelled": res.cancelled,
+    }
+    payload["tables"] = tables.dump()
+    return payload
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def columnar_response(payload) -> Response:
+    """A response whose body is ``payload`` (already columnar-encoded where needed)."""
+    return Response(content=dumps(payload), media_type=COLUMNAR_MEDIA_TYPE)
@@ -0,0 +1,80 @@
+"""AvailabilityCompiler: turns availability dicts into bitmasks over global slot indices."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from ..models import SolveRequest
+from .types import Slot
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indices of set bits in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _run_mask(mask: int, duration: int) -> int:
+    """Bits ``gi`` such that ``gi .. gi + duration - 1`` are all set in ``mask``."""
+    run = mask
+    for d in range(1, duration):
+        run &= mask >> d
+    return run
+
+
+@dataclass
+class CompiledAvailability:
+    """Per-entity availability as integers; bit ``gi`` is global slot ``gi``."""
+    num_slots: int
+    faculty: dict[str, int]
+    rooms: dict[str, int]
+    day_masks: dict[str, int]
+    _start_cache: dict[tuple[str, int], int] = field(default_factory=dict)
+
+    def grid_starts(self, duration: int) -> int:
+        """Start slots whose ``duration`` slots fit inside a single day."""
+        key = ("", duration)
+        if key not in self._start_cache:
+            mask = 0
+            for day_mask in self.day_masks.values():
+                mask |= _run_mask(day_mask, duration)
+            self._start_cache[key] = mask
+        return self._start_cache[key]
+
+    def faculty_starts(self, fid: str, duration: int) -> int:
+        """Valid starts for ``duration`` slots during which faculty ``fid`` is available."""
+        return self._entity_starts("f:" + fid, self.faculty.get(fid, 0), duration)
+
+    def room_starts(self, rid: str, duration: int) -> int:
+        """Valid starts for ``duration`` slots during which room ``rid`` is available."""
+        return self._entity_starts("r:" + rid, self.rooms.get(rid, 0), duration)
+
+    def _entity_starts(self, key: str, avail: int, duration: int) -> int:
+        ck = (key, duration)
+        if ck not in self._start_cache:
+            self._start_cache[ck] = self.grid_starts(duration) & _run_mask(avail, duration)
+        return self._start_cache[ck]
+
+
+def compile_availability(req: SolveRequest, slots: list[Slot]) -> CompiledAvailability:
+    """Compile every faculty's and room's availability once per request."""
+    slot_bit = {(s.day, s.index): 1 << s.global_index for s in slots}
+    day_masks: dict[str, int] = {}
+    for s in slots:
+        day_masks[s.day] = day_masks.get(s.day, 0) | (1 << s.global_index)
+
+    def to_mask(availability: dict[str, list[int]]) -> int:
+        mask = 0
+        for day, indices in availability.items():
+            for idx in indices:
+                mask |= slot_bit.get((day, idx), 0)
+        return mask
+
+    return CompiledAvailability(
+        num_slots=len(slots),
+        faculty={f.id: to_mask(f.availability) for f in req.faculty},
+        rooms={r.id: to_mask(r.availability) for r in req.rooms},
+        day_masks=day_masks,
+    )
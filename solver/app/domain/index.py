@@ -0,0 +1,56 @@
+"""Interned integer ids for the entities of one request, used by the array-backed engine tables."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable
+
+from ..models import SolveRequest
+
+
+class Interner:
+    """Bidirectional map between string ids and dense integers 0..n-1, in first-seen order."""
+
+    __slots__ = ("ids", "index")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self.ids: list[str] = []
+        self.index: dict[str, int] = {}
+        for id_ in ids:
+            self.add(id_)
+
+    def add(self, id_: str) -> int:
+        """Integer for ``id_``, allocating the next one if it is new."""
+        i = self.index.get(id_)
+        if i is None:
+            i = self.index[id_] = len(self.ids)
+            self.ids.append(id_)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> str:
+        return self.ids[i]
+
+
+@dataclass(slots=True)
+class InstanceIndex:
+    courses: Interner
+    faculty: Interner
+    rooms: Interner
+    batches: Interner
+    sections: Interner
+    lab_groups: Interner
+
+
+def index_request(req: SolveRequest) -> InstanceIndex:
+    """Intern every course, faculty, room, batch, section and lab group id of ``req``."""
+    sections = [sec for c in req.courses for sec in c.sections]
+    return InstanceIndex(
+        courses=Interner(c.id for c in req.courses),
+        faculty=Interner(f.id for f in req.faculty),
+        rooms=Interner(r.id for r in req.rooms),
+        batches=Interner(b.id for b in req.batches),
+        sections=Interner(sec.id for sec in sections),
+        lab_groups=Interner(g.id for sec in sections for g in sec.lab_groups),
+    )
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Slot:
     day: str
     index: int  # 0-based index within day (excludes break slots)
@@ -11,7 +12,7 @@ class Slot:
     global_index: int  # unique index across all days
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """One atomic scheduling unit."""
     id: str
@@ -25,3 +26,11 @@ class Session:
     duration: int  # number of slots
     qualified_faculty_ids: list[str]
     eligible_room_ids: list[str]
+
+
+class Placement(NamedTuple):
+    """A session's chosen faculty, room and global start slot."""
+    session: Session
+    faculty_id: str
+    room_id: str
+    start_gi: int
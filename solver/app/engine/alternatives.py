@@ -0,0 +1,74 @@
+"""Solution pool: further timetables from an already solved model, kept apart by no-good cuts."""
+
+from __future__ import annotations
+import time
+from collections import Counter
+
+from ortools.sat.python import cp_model
+
+from ..models import AssignmentResult
+from ..domain.types import Placement
+from .progress import EventLike, cancel_watcher
+
+
+def collect_alternatives(
+    model: cp_model.CpModel,
+    handle,
+    solver: cp_model.CpSolver,
+    count: int,
+    min_distance: int,
+    budget: float,
+    cancel: EventLike | None = None,
+) -> list[tuple[float, list[Placement]]]:
+    """
+    Up to ``count`` more solutions of ``model`` after the one ``solver``
+    holds, best objective first. Before each re-solve a cut requires the
+    last solution found to change at least ``min_distance`` session
+    placements, so every pooled solution differs from all earlier ones. The
+    model is extended in place, not rebuilt; ``budget`` seconds are shared
+    evenly between the remaining re-solves. Placements use the model's room
+    ids (class representatives), like ``handle.decode``.
+    """
+    deadline = time.time() + budget
+    last = handle.decode(solver)
+    found: list[tuple[float, list[Placement]]] = []
+    for left in range(count, 0, -1):
+        lits = [handle.placement_literal(model, p) for p in last]
+        model.add(cp_model.LinearExpr.sum(lits) <= len(lits) - min_distance)
+        remaining = deadline - time.time()
+        if remaining <= 0 or (cancel is not None and cancel.is_set()):
+            break
+        sub = cp_model.CpSolver()
+        sub.parameters.CopyFrom(solver.parameters)
+        sub.parameters.max_time_in_seconds = remaining / left
+        sub.parameters.log_search_progress = False
+        with cancel_watcher(sub, cancel):
+            status = sub.solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            break  # no further solution that far from the pool, or out of time
+        last = handle.decode(sub)
+        found.append((sub.objective_value, last))
+    return sorted(found, key=lambda item: item[0])
+
+
+def _key(a: AssignmentResult) -> tuple:
+    return a.batch_id, a.section_id, a.lab_group_id, a.faculty_id, a.room_id, a.day, a.slot_index, a.duration
+
+
+def diff(
+    base: list[AssignmentResult], other: list[AssignmentResult],
+) -> tuple[int, list[AssignmentResult], list[AssignmentResult]]:
+    """(unchanged count, added, removed) going from ``base`` to ``other``, as multisets."""
+    remaining = Counter(_key(a) for a in base)
+    added = []
+    for a in other:
+        if remaining[_key(a)]:
+            remaining[_key(a)] -= 1
+        else:
+            added.append(a)
+    removed = []
+    for a in base:
+        if remaining[_key(a)]:
+            remaining[_key(a)] -= 1
+            removed.append(a)
+    return len(other) - len(added), added, removed
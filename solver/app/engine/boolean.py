@@ -0,0 +1,231 @@
+"""Element-based ("boolean") CP-SAT formulation: one literal per (faculty, room, start) option."""
+
+from __future__ import annotations
+import numpy as np
+from ortools.sat.python import cp_model
+
+from ..domain.types import Placement, Session
+from ..domain.index import InstanceIndex
+from ..metrics import PhaseTimer
+from .options import OptionTable, build_option_table, group_rows, join_tables, occupancy
+
+
+class BooleanModel:
+    """Handle on the option literals of a built boolean formulation; ``lits[r]`` is option row ``r``."""
+
+    def __init__(self, table: OptionTable, lits: list, objective, counts: dict[str, int], exactly_one: list[int]):
+        self.table = table
+        self.lits = lits
+        self.first = lits[0].index if lits else 0  # literals are consecutive model variables from here
+        self.objective = objective
+        self.counts = counts
+        self.exactly_one = exactly_one  # model constraint index of each session's exactly-one
+        self._position = {sess.id: i for i, sess in enumerate(table.sessions)}
+        self._by_faculty: dict[int, np.ndarray] | None = None
+
+    @property
+    def sessions(self) -> list[Session]:
+        return self.table.sessions
+
+    def decode(self, solver) -> list[Placement]:
+        """Chosen placement of every session; ``solver`` is a CpSolver or solution callback."""
+        if not self.lits:
+            return []
+        values = np.asarray(solver.response_proto.solution[self.first:self.first + len(self.lits)])
+        return [self.table.placement(r) for r in np.flatnonzero(values).tolist()]
+
+    def placement_literal(self, model: cp_model.CpModel, p: Placement):
+        """Literal true iff the session takes placement ``p``, or None if ``p`` is not an option."""
+        row = self.table.find(self._position[p.session.id], p)
+        return None if row is None else self.lits[row]
+
+    def hint(self, model: cp_model.CpModel, p: Placement) -> None:
+        """Suggest placement ``p`` to the search."""
+        lit = self.placement_literal(model, p)
+        if lit is not None:
+            model.add_hint(lit, True)
+
+    def add_start_order(self, model: cp_model.CpModel, a: str, b: str) -> None:
+        """Require session ``a`` to start no later than session ``b``."""
+        # Written as one proto row: the same constraint through LinearExpr
+        # took most of the build time of large instances with long chains
+        first = self.first
+        rows_a = self.table.rows(self._position[a])
+        rows_b = self.table.rows(self._position[b])
+        linear = model.proto.constraints.add().linear
+        linear.vars.extend([first + r for r in rows_a] + [first + r for r in rows_b])
+        linear.coeffs.extend(
+            self.table.start[rows_a.start:rows_a.stop].tolist()
+            + (-self.table.start[rows_b.start:rows_b.stop]).tolist()
+        )
+        linear.domain.extend([cp_model.INT_MIN, 0])
+
+    def faculty_load(self, faculty_id: str):
+        """Linear expression equal to the number of slots ``faculty_id`` teaches."""
+        table = self.table
+        if self._by_faculty is None:
+            keys, groups = group_rows(table.faculty, np.arange(len(table)))
+            self._by_faculty = dict(zip(keys.tolist(), groups))
+        rows = self._by_faculty.get(table.index.faculty.index[faculty_id], np.zeros(0, dtype=np.int64))
+        return cp_model.LinearExpr.weighted_sum(
+            [self.lits[r] for r in rows.tolist()], table.duration[table.session[rows]].tolist(),
+        )
+
+    def extend(
+        self,
+        model: cp_model.CpModel,
+        sessions: list[Session],
+        fac_starts: dict[str, dict[str, int]],
+        room_starts: dict[str, dict[str, int]],
+        room_capacity: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Add ``sessions`` to the built model: their option rows and literals
+        go after the existing ones, and conflicts are added only at the
+        (resource, slot) keys a new option occupies, each covering the old
+        and new literals there. ``model`` must have gained no variables
+        since the last build or extension.
+        """
+        old = len(self.table)
+        if len(model.proto.variables) != self.first + old:
+            raise ValueError("Option literals must stay consecutive model variables")
+        tail = build_option_table(sessions, fac_starts, room_starts, self.table.index)
+        self.table = join_tables(self.table, tail)
+        self.lits += [model.new_bool_var("") for _ in range(len(tail))]
+        first = self.first + old
+        for lo, hi in zip(tail.offsets[:-1].tolist(), tail.offsets[1:].tolist()):
+            self.exactly_one.append(len(model.proto.constraints))
+            model.proto.constraints.add().exactly_one.literals.extend(range(first + lo, first + hi))
+        self.counts["option_literals"] = len(self.lits)
+        capacity = {self.table.index.rooms.index[rid]: cap for rid, cap in (room_capacity or {}).items()}
+        _add_conflicts(model, self.table, self.first, capacity, self.counts, since=old)
+        offset = len(self.table.sessions) - len(sessions)
+        self._position.update({sess.id: offset + i for i, sess in enumerate(sessions)})
+        self._by_faculty = None
+
+
+def build_boolean_model(
+    model: cp_model.CpModel,
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    index: InstanceIndex,
+    room_capacity: dict[str, int] | None = None,
+    timer: PhaseTimer | None = None,
+) -> BooleanModel:
+    """
+    Add one boolean per (faculty, room, start) option and per-(resource, slot)
+    at-most-one constraints. ``room_capacity`` gives the number of identical
+    rooms a collapsed room id stands for (default 1). The "prefer earlier
+    slots" objective is returned on the handle rather than set on ``model``.
+    """
+    room_capacity = room_capacity or {}
+    timer = timer or PhaseTimer()
+    counts = {"option_literals": 0, "at_most_one": 0, "capacity_sums": 0}
+
+    table = build_option_table(sessions, fac_starts, room_starts, index)
+    lits = [model.new_bool_var("") for _ in range(len(table))]
+    first = lits[0].index if lits else 0  # literal of row r is model variable first + r
+    # Exactly one option chosen per session
+    exactly_one = []
+    for lo, hi in zip(table.offsets[:-1].tolist(), table.offsets[1:].tolist()):
+        exactly_one.append(len(model.proto.constraints))
+        model.proto.constraints.add().exactly_one.literals.extend(range(first + lo, first + hi))
+    counts["option_literals"] = len(lits)
+    timer.lap("variables")
+
+    capacity = {index.rooms.index[rid]: cap for rid, cap in room_capacity.items()}
+    _add_conflicts(model, table, first, capacity, counts)
+    timer.lap("constraints")
+
+    # --- Objective: prefer earlier slots (compact schedules) ---
+    objective = cp_model.LinearExpr.weighted_sum(lits, table.start.tolist())
+    timer.lap("objective")
+
+    return BooleanModel(table, lits, objective, counts, exactly_one)
+
+
+def _add_conflicts(
+    model, table: OptionTable, first: int, room_capacity: dict[int, int], counts, since: int = 0,
+) -> None:
+    """
+    Faculty, room and batch conflicts over the option literals; tallies into
+    ``counts``. Every (option, occupied slot) pair is expanded as arrays,
+    sorted by (resource, slot) key and split into groups, each of which
+    becomes one at-most-one written straight into the model proto. With
+    ``since``, only keys that a row from ``since`` on occupies are written.
+    """
+    row, slot = occupancy(table)
+    num_slots = int(slot.max()) + 1 if len(slot) else 0
+    session = table.session[row]
+
+    def touched(keys: np.ndarray) -> np.ndarray:
+        """Positions whose key a row from ``since`` on also occupies (all of them without ``since``)."""
+        return np.flatnonzero(np.isin(keys, keys[row >= since])) if since else np.arange(len(keys))
+
+    def add_at_most_one(rows: np.ndarray) -> None:
+        model.proto.constraints.add().at_most_one.literals.extend((rows + first).tolist())
+        counts["at_most_one"] += 1
+
+    # Faculty: at most one session per slot per faculty
+    keys = table.faculty[row].astype(np.int64) * num_slots + slot
+    picked = touched(keys)
+    for rows in group_rows(keys[picked], row[picked])[1]:
+        if len(rows) > 1:
+            add_at_most_one(rows)
+
+    # Room: at most one session per slot per room (or per identical room in a class)
+    keys = table.room[row].astype(np.int64) * num_slots + slot
+    picked = touched(keys)
+    keys, groups = group_rows(keys[picked], row[picked])
+    for key, rows in zip(keys.tolist(), groups):
+        cap = room_capacity.get(key // num_slots, 1)
+        if len(rows) > cap:
+            if cap == 1:
+                add_at_most_one(rows)
+            else:
+                linear = model.proto.constraints.add().linear
+                linear.vars.extend((rows + first).tolist())
+                linear.coeffs.extend([1] * len(rows))
+                linear.domain.extend([cp_model.INT_MIN, cap])
+                counts["capacity_sums"] += 1
+
+    # Batch: one at-most-one per conflict clique, no auxiliary variables. A
+    # slot with lab sessions is split by (section, lab group), None for
+    # non-lab sessions, so parallel lab groups can be expressed.
+    lab_group = table.lab_group[session]
+    keys = table.batch[session].astype(np.int64) * num_slots + slot
+    picked = touched(keys)
+    for rows in group_rows(keys[picked], picked)[1]:
+        if len(rows) < 2:
+            continue
+        if (lab_group[rows] < 0).all():
+            add_at_most_one(row[rows])
+            continue
+        by_group: dict[tuple[int, int] | None, list] = {}
+        for r, s in zip(row[rows].tolist(), session[rows].tolist()):
+            key = (int(table.section[s]), int(table.lab_group[s])) if table.lab_group[s] >= 0 else None
+            by_group.setdefault(key, []).append(r)
+        for clique in batch_cliques(by_group):
+            if len(clique) > 1:
+                add_at_most_one(np.array(clique))
+
+
+def batch_cliques(by_group: dict[tuple | None, list]) -> list[list]:
+    """
+    Conflict cliques among one batch's literals at one slot, given them by
+    (section, lab group), None for non-lab sessions. A non-lab session
+    excludes everything else, a lab group excludes itself and groups of
+    other sections, and groups of the same section may run together. Every
+    such conflict lies in a clique "non-lab + two groups of different
+    sections" (or "non-lab + group" when only one section has labs there).
+    """
+    non_lab = by_group.get(None, [])
+    groups = [(key, lits) for key, lits in by_group.items() if key is not None]
+    cliques = [
+        non_lab + lits_a + lits_b
+        for i, ((sec_a, _), lits_a) in enumerate(groups)
+        for (sec_b, _), lits_b in groups[i + 1:]
+        if sec_a != sec_b
+    ]
+    return cliques or [non_lab + lits for _, lits in groups] or [non_lab]
@@ -0,0 +1,178 @@
+"""Split a request into independent components and solve them in parallel."""
+
+from __future__ import annotations
+import math
+import time
+from concurrent.futures import Future, as_completed
+from typing import Callable
+
+from ..models import SolveRequest, SolveResponse, DiagnosticsPayload, ComponentReport, SolutionEvent
+from ..domain.types import Session
+from ..domain.time_grid import build_time_grid
+from ..domain.session_expander import expand_sessions
+from ..domain.availability import compile_availability
+from .pool import available_cores, get_pool, pool_size
+from .profiles import MIN_PORTFOLIO
+
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent: dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: str, b: str) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def find_components(req: SolveRequest, sessions: list[Session]) -> list[list[Session]]:
+    """
+    Connected components of the session-resource conflict graph: two sessions
+    are linked if they share a batch, or a qualified faculty / eligible room
+    that can actually host them given its availability.
+    """
+    slots = build_time_grid(req.time_config)
+    avail = compile_availability(req, slots)
+    ds = _DisjointSet()
+
+    for sess in sessions:
+        ds.union(sess.id, "b:" + sess.batch_id)
+        for fid in sess.qualified_faculty_ids:
+            if avail.faculty_starts(fid, sess.duration):
+                ds.union(sess.id, "f:" + fid)
+        for rid in sess.eligible_room_ids:
+            if avail.room_starts(rid, sess.duration):
+                ds.union(sess.id, "r:" + rid)
+
+    groups: dict[str, list[Session]] = {}
+    for sess in sessions:
+        groups.setdefault(ds.find(sess.id), []).append(sess)
+    return list(groups.values())
+
+
+def split_request(req: SolveRequest, component: list[Session]) -> SolveRequest:
+    """Sub-request containing only the batches, faculty and rooms one component uses."""
+    batch_ids = {s.batch_id for s in component}
+    faculty_ids = {fid for s in component for fid in s.qualified_faculty_ids}
+    room_ids = {rid for s in component for rid in s.eligible_room_ids}
+    return req.model_copy(update={
+        "decompose": False,
+        "batches": [b for b in req.batches if b.id in batch_ids],
+        "faculty": [f for f in req.faculty if f.id in faculty_ids],
+        "rooms": [r for r in req.rooms if r.id in room_ids],
+        "previous_assignments": [a for a in req.previous_assignments if a.batch_id in batch_ids],
+        "locked_assignments": [a for a in req.locked_assignments if a.batch_id in batch_ids],
+    })
+
+
+def solve_decomposed(
+    req: SolveRequest,
+    solve_fn: Callable[..., SolveResponse],
+    on_solution: Callable[[SolutionEvent], None] | None = None,
+    cancel=None,
+    time_limit: float | None = None,
+) -> SolveResponse:
+    """
+    Solve each component as its own model on the shared process pool and merge
+    the results. Components are independent, so an infeasible one still lets
+    the others return their assignments.
+
+    The CP-SAT workers (``req.solver.num_workers``, else every core) are
+    shared among the components that run at once, and the remaining deadline
+    and ``time_limit`` among the waves the pool runs them in. ``on_solution``
+    gets one event per solved component, adding its assignments.
+    """
+    t0 = time.time()
+    sessions = expand_sessions(req)
+    components = find_components(req, sessions)
+
+    if len(components) <= 1:
+        return solve_fn(req.model_copy(update={"decompose": False}), on_solution, cancel, time_limit)
+
+    concurrent = min(len(components), pool_size())
+    waves = math.ceil(len(components) / concurrent)
+    workers = req.solver.num_workers or max(available_cores(), MIN_PORTFOLIO)
+    update = {"solver": req.solver.model_copy(update={"num_workers": max(1, workers // concurrent)})}
+    if req.deadline_seconds is not None:
+        update["deadline_seconds"] = max(0.0, req.deadline_seconds - (time.time() - t0)) / waves
+    sub_limit = time_limit / waves if time_limit is not None else None
+    subs = [split_request(req, comp).model_copy(update=update) for comp in components]
+    pool = get_pool()
+    futures: dict[Future, int] = {pool.submit(solve_fn, sub, None, cancel, sub_limit): i for i, sub in enumerate(subs)}
+
+    results: list[SolveResponse | None] = [None] * len(subs)
+    objective = bound = 0.0
+    solved = 0
+    for fut in as_completed(futures):
+        try:
+            res = fut.result()
+        except Exception as exc:  # worker crashed; report and keep the other components
+            res = SolveResponse(
+                status="FAILED", solve_time_ms=0,
+                diagnostics=DiagnosticsPayload(reasons=[f"Component solve failed: {exc!r}"]),
+            )
+        results[futures[fut]] = res
+        if on_solution is not None and res.status == "SUCCESS":
+            solved += 1
+            stats = res.diagnostics.stats if res.diagnostics else None
+            objective += res.total_score or 0.0
+            bound += stats.best_bound if stats and stats.best_bound is not None else res.total_score or 0.0
+            on_solution(SolutionEvent(
+                index=solved,
+                objective=objective,
+                best_bound=bound,
+                elapsed_ms=int((time.time() - t0) * 1000),
+                added=res.assignments,
+            ))
+
+    reports: list[ComponentReport] = []
+    assignments = []
+    reasons = []
+    scores = []
+    for i, (sub, res) in enumerate(zip(subs, results)):
+        reports.append(ComponentReport(
+            index=i,
+            batch_ids=[b.id for b in sub.batches],
+            sessions=len(components[i]),
+            status=res.status,
+            solve_time_ms=res.solve_time_ms,
+            objective=res.total_score,
+            solver_status=res.diagnostics.stats.solver_status if res.diagnostics and res.diagnostics.stats else None,
+        ))
+        assignments.extend(res.assignments)
+        scores.append(res.total_score)
+        if res.status != "SUCCESS":
+            batch_names = ", ".join(b.name for b in sub.batches)
+            reasons.append(f"Component {i} ({batch_names}): {res.status}")
+            reasons.extend(f"  {r}" for r in (res.diagnostics.reasons if res.diagnostics else []))
+
+    failed = [r for r in reports if r.status != "SUCCESS"]
+    elapsed = int((time.time() - t0) * 1000)
+    status = "SUCCESS" if not failed else ("FAILED" if all(r.status == "FAILED" for r in failed) else "INFEASIBLE")
+    total = sum(scores) if all(s is not None for s in scores) else None
+
+    return SolveResponse(
+        status=status,
+        solve_time_ms=elapsed,
+        total_score=total,
+        assignments=assignments,
+        diagnostics=DiagnosticsPayload(
+            hard_score=0,
+            soft_score=total or 0,
+            reasons=[
+                f"Decomposed into {len(components)} independent components "
+                f"({len(components) - len(failed)} solved)",
+                f"Total assignments: {len(assignments)}",
+                f"Solve time: {elapsed}ms",
+            ] + reasons,
+            components=reports,
+        ),
+        cancelled=any(res.cancelled for res in results),
+    )
@@ -0,0 +1,205 @@
+"""Infeasibility explanation: a small set of requirements that cannot all hold together.
+
+Builds a boolean model over availability-relaxed domains in which each
+requirement group is switched on by an assumption literal:
+
+  * a faculty member's or room's availability,
+  * a batch attending one session at a time,
+  * a section's (or lab group's) weekly sessions all being scheduled,
+  * a faculty member's ``max_hours``,
+  * each locked or fixed placement.
+
+Faculty and room double-booking, qualification, room type and capacity
+stay hard. CP-SAT's ``sufficient_assumptions_for_infeasibility`` gives an
+initial core, which is shrunk by trying to drop one requirement at a time.
+The model build counts against the same budget as the search.
+"""
+
+from __future__ import annotations
+import time
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+
+from ..models import SolveRequest
+from ..domain.types import Placement, Session, Slot
+from ..domain.availability import CompiledAvailability, iter_bits
+from .boolean import batch_cliques
+from .feasibility import max_slots_for
+from .reduction import students_per_session
+
+
+def explain_infeasibility(
+    req: SolveRequest,
+    sessions: list[Session],
+    avail: CompiledAvailability,
+    slots: list[Slot],
+    fixed: dict[str, Placement],
+    budget: float,
+    locked: set[str] = frozenset(),
+) -> list[str]:
+    """
+    Reasons naming a conflicting set of requirements, found within
+    ``budget`` seconds. ``fixed`` are pinned placements by session id, of
+    which those in ``locked`` were locked by the user.
+    """
+    t0 = time.time()
+    deadline = t0 + budget
+    not_explained = [f"Explanation: not attempted; building the model took longer than {budget:g}s"]
+    model = cp_model.CpModel()
+    labels: dict[int, str] = {}  # guard literal index -> requirement
+
+    def guard(label: str):
+        lit = model.new_bool_var(label)
+        labels[lit.index] = label
+        return lit
+
+    faculty = {f.id: f for f in req.faculty}
+    rooms = {r.id: r for r in req.rooms}
+    batches = {b.id: b for b in req.batches}
+    sections = {sec.id: sec for c in req.courses for sec in c.sections}
+    slot_of = {s.global_index: s for s in slots}
+    cap_slots = {f.id: max_slots_for(f.max_hours, req.time_config.slot_duration) for f in req.faculty}
+    students = students_per_session(req, sessions)
+
+    options: dict[str, list[tuple]] = {}
+    unavailable: dict[tuple[str, str], list] = defaultdict(list)  # ("f" | "r", id) -> options outside availability
+    for sess in sessions:
+        if time.time() >= deadline:
+            return not_explained
+        grid = avail.grid_starts(sess.duration)
+        facs = [f for f in sess.qualified_faculty_ids if cap_slots[f] >= sess.duration]
+        eligible = [r for r in sess.eligible_room_ids if rooms[r].capacity >= students[sess.id]]
+        opts = []
+        for fid in facs:
+            fmask = avail.faculty_starts(fid, sess.duration)
+            for rid in eligible:
+                rmask = avail.room_starts(rid, sess.duration)
+                for gi in iter_bits(grid):
+                    lit = model.new_bool_var("")
+                    opts.append((lit, fid, rid, gi))
+                    if not fmask >> gi & 1:
+                        unavailable[("f", fid)].append(lit)
+                    if not rmask >> gi & 1:
+                        unavailable[("r", rid)].append(lit)
+        options[sess.id] = opts
+
+    for (kind, eid), lits in unavailable.items():
+        name = faculty[eid].name if kind == "f" else rooms[eid].name
+        g = guard(f"Availability of {'faculty' if kind == 'f' else 'room'} {name}")
+        model.add(sum(lits) == 0).only_enforce_if(g)
+
+    # Demand: every session of a section (or lab group) for a batch is scheduled
+    demand: dict[tuple, list[Session]] = defaultdict(list)
+    for sess in sessions:
+        demand[(sess.batch_id, sess.section_id, sess.lab_group_id)].append(sess)
+    for (batch_id, section_id, group_id), group in demand.items():
+        sess = group[0]
+        section = sections[section_id]
+        group_name = next((f" {g.name}" for g in section.lab_groups if g.id == group_id), "")
+        g = guard(
+            f"{sess.course_code} section {section.name}{group_name} for batch {batches[batch_id].name}: "
+            f"{_count(len(group), 'session')} of {_count(sess.duration, 'slot')}"
+        )
+        for s in group:
+            lits = [o[0] for o in options[s.id]]
+            model.add(sum(lits) <= 1)
+            model.add(sum(lits) == 1).only_enforce_if(g)
+
+    fac_slot: dict[tuple[str, int], list] = defaultdict(list)
+    room_slot: dict[tuple[str, int], list] = defaultdict(list)
+    batch_slot: dict[tuple[str, int], dict] = defaultdict(lambda: defaultdict(list))
+    load: dict[str, list[tuple]] = defaultdict(list)
+    for sess in sessions:
+        key = (sess.section_id, sess.lab_group_id) if sess.lab_group_id else None
+        for lit, fid, rid, gi in options[sess.id]:
+            load[fid].append((lit, sess.duration))
+            for d in range(sess.duration):
+                fac_slot[(fid, gi + d)].append(lit)
+                room_slot[(rid, gi + d)].append(lit)
+                batch_slot[(sess.batch_id, gi + d)][key].append(lit)
+    for lits in (*fac_slot.values(), *room_slot.values()):
+        if len(lits) > 1:
+            model.add_at_most_one(lits)
+    if time.time() >= deadline:
+        return not_explained
+
+    batch_guards = {}
+    for (batch_id, _), by_group in batch_slot.items():
+        for clique in batch_cliques(by_group):
+            if len(clique) > 1:
+                if batch_id not in batch_guards:
+                    batch_guards[batch_id] = guard(f"Batch {batches[batch_id].name} attends one session at a time")
+                model.add(sum(clique) <= 1).only_enforce_if(batch_guards[batch_id])
+
+    for fid, terms in load.items():
+        if sum(d for _, d in terms) > cap_slots[fid]:
+            g = guard(f"max_hours of faculty {faculty[fid].name} ({faculty[fid].max_hours}h)")
+            model.add(sum(d * lit for lit, d in terms) <= cap_slots[fid]).only_enforce_if(g)
+
+    for sid, p in fixed.items():
+        slot = slot_of[p.start_gi]
+        g = guard(
+            f"{'Locked' if sid in locked else 'Fixed'} {p.session.course_code} (section "
+            f"{sections[p.session.section_id].name}) at {slot.day} slot {slot.index} with "
+            f"{faculty[p.faculty_id].name} in {rooms[p.room_id].name}"
+        )
+        match = [lit for lit, fid, rid, gi in options[sid] if (fid, rid, gi) == (p.faculty_id, p.room_id, p.start_gi)]
+        model.add_bool_or(match + [g.Not()])
+
+    if time.time() >= deadline:
+        return not_explained
+    guards = [model.get_bool_var_from_proto_index(i) for i in labels]
+    core, proved = _core(model, guards, deadline)
+    if core is None:
+        return [
+            "Explanation: the requirements can all hold together; the search ran out of time before finding a timetable"
+            if proved else f"Explanation: no conflicting set found within {budget:g}s"
+        ]
+    core, minimal = _minimize(model, core, deadline)
+    return [
+        f"Explanation: these {len(core)} requirements cannot all hold"
+        + (" (dropping any one of them makes the rest satisfiable)" if minimal else ""),
+    ] + [f"  - {labels[lit.index]}" for lit in core]
+
+
+def _count(n: int, noun: str) -> str:
+    return f"{n} {noun}" + ("" if n == 1 else "s")
+
+
+def _solve(model: cp_model.CpModel, assumptions: list, deadline: float) -> tuple[int, list[int]]:
+    model.clear_assumptions()
+    model.add_assumptions(assumptions)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max(0.0, deadline - time.time())
+    solver.parameters.num_workers = 1  # core extraction is a single-thread feature
+    status = solver.solve(model)
+    core = solver.sufficient_assumptions_for_infeasibility() if status == cp_model.INFEASIBLE else []
+    return status, core
+
+
+def _core(model: cp_model.CpModel, guards: list, deadline: float) -> tuple[list | None, bool]:
+    """(core, proved): an infeasible subset of ``guards``, or None with whether feasibility was shown."""
+    status, core = _solve(model, guards, deadline)
+    if status != cp_model.INFEASIBLE:
+        return None, status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    by_index = {g.index: g for g in guards}
+    return [by_index[i] for i in core] or guards, True
+
+
+def _minimize(model: cp_model.CpModel, core: list, deadline: float) -> tuple[list, bool]:
+    """Drop requirements one at a time while the rest stay infeasible; minimal if every drop was tried."""
+    i = 0
+    while i < len(core):
+        if time.time() >= deadline:
+            return core, False
+        rest = core[:i] + core[i + 1:]
+        status, sub = _solve(model, rest, deadline)
+        if status == cp_model.INFEASIBLE:
+            keep = set(sub) or {g.index for g in rest}
+            core = [g for g in rest if g.index in keep]
+        elif status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            i += 1
+        else:
+            return core, False  # out of time on this check
+    return core, True
@@ -1,21 +1,34 @@
-"""Pre-validation checks before running the solver."""
+"""Pre-validation checks before running the solver.
+
+Every check is a necessary condition of the CP-SAT model, so a reported
+reason always means the model is infeasible:
+
+  * sessions with no qualified faculty, no eligible room, or no window of
+    their duration where some faculty and some room are both free,
+  * per room type and duration: sessions needing a room vs disjoint windows
+    of that length in the rooms' availability,
+  * per batch and duration: weekly demand vs disjoint windows in the grid,
+  * faculty load: a max-flow from courses to qualified faculty, capped by
+    ``max_hours`` and availability; a deficit names the faculty pool that
+    cannot cover its courses.
+"""
 
 from __future__ import annotations
-from ..domain.types import Session, Slot
+from collections import deque
+
+from ..models import SolveRequest
+from ..domain.types import Session
+from ..domain.availability import CompiledAvailability
 
 
 def check_feasibility(
+    req: SolveRequest,
     sessions: list[Session],
-    slots: list[Slot],
-    faculty_availability: dict[str, dict[str, list[int]]],
-    room_availability: dict[str, dict[str, list[int]]],
+    avail: CompiledAvailability,
 ) -> list[str]:
     """Return list of reasons the problem is infeasible, or empty if OK."""
     reasons: list[str] = []
 
-    total_slot_count = len(slots)
-    total_session_slots = sum(s.duration for s in sessions)
-
     # Check: sessions with no qualified faculty
     for s in sessions:
         if not s.qualified_faculty_ids:
@@ -31,16 +44,322 @@ def check_feasibility(
                 f"Session {s.id} ({s.course_code}) has no eligible rooms"
             )
 
-    # Check: not enough total room-slots
-    unique_rooms = set()
+    if reasons:
+        return reasons
+
+    reasons = _check_windows(sessions, avail)
+    if reasons:
+        return reasons
+
+    reasons += _check_room_supply(req, sessions, avail)
+    reasons += _check_batch_load(req, sessions, avail)
+    reasons += _check_faculty_load(req, sessions, avail)
+    return reasons
+
+
+def max_slots_for(max_hours: int, slot_duration: int) -> int:
+    """Number of slots a faculty member may teach per week."""
+    return max_hours * 60 // slot_duration
+
+
+def _windows(mask: int, avail: CompiledAvailability, duration: int) -> int:
+    """Number of disjoint runs of ``duration`` set bits in ``mask``, counted per day."""
+    total = 0
+    for day_mask in avail.day_masks.values():
+        run = 0
+        m = mask & day_mask
+        while m:
+            low = m & -m
+            run = 1
+            m ^= low
+            nxt = low << 1
+            while m & nxt:
+                run += 1
+                m ^= nxt
+                nxt <<= 1
+            total += run // duration
+    return total
+
+
+def _durations(sessions: list[Session]) -> list[int]:
+    return sorted({s.duration for s in sessions})
+
+
+def _check_windows(sessions: list[Session], avail: CompiledAvailability) -> list[str]:
+    """Each course needs a window of its duration where a qualified faculty and a room are both free."""
+    reasons = []
+    seen: set[tuple] = set()
     for s in sessions:
-        for r in s.eligible_room_ids:
-            unique_rooms.add(r)
-    total_room_slots = total_slot_count * len(unique_rooms)
-    if total_session_slots > total_room_slots:
-        reasons.append(
-            f"Total session-slots ({total_session_slots}) exceeds "
-            f"available room-slots ({total_room_slots})"
+        key = (s.course_id, s.duration, tuple(s.qualified_faculty_ids), tuple(s.eligible_room_ids))
+        if key in seen:
+            continue
+        seen.add(key)
+        if not avail.grid_starts(s.duration):
+            reasons.append(
+                f"{s.course_code} needs {s.duration} consecutive slots, "
+                f"but no day in the time grid is that long"
+            )
+            continue
+        fac = 0
+        for fid in s.qualified_faculty_ids:
+            fac |= avail.faculty_starts(fid, s.duration)
+        room = 0
+        for rid in s.eligible_room_ids:
+            room |= avail.room_starts(rid, s.duration)
+        if not fac:
+            reasons.append(
+                f"{s.course_code}: no qualified faculty is available for "
+                f"{s.duration} consecutive slots"
+            )
+        elif not room:
+            reasons.append(
+                f"{s.course_code}: no {_room_type(s)} room is available for "
+                f"{s.duration} consecutive slots"
+            )
+        elif not fac & room:
+            reasons.append(
+                f"{s.course_code}: qualified faculty and {_room_type(s)} rooms "
+                f"are never free at the same time for {s.duration} consecutive slots"
+            )
+    return reasons
+
+
+def _room_type(sess: Session) -> str:
+    """Room type the session can use, as the session expander assigns rooms: LAB courses get LAB rooms, others LECTURE."""
+    return "LAB" if sess.course_type == "LAB" else "LECTURE"
+
+
+def _check_room_supply(req: SolveRequest, sessions: list[Session], avail: CompiledAvailability) -> list[str]:
+    """Per room type, sessions of duration >= d cannot outnumber disjoint d-windows in those rooms."""
+    reasons = []
+    by_type: dict[str, list[Session]] = {}
+    for s in sessions:
+        by_type.setdefault(_room_type(s), []).append(s)
+
+    for room_type, group in by_type.items():
+        rooms = [r for r in req.rooms if r.type == room_type]
+        demand_slots = sum(s.duration for s in group)
+        supply_slots = sum(bin(avail.rooms[r.id]).count("1") for r in rooms)
+        if demand_slots > supply_slots:
+            reasons.append(
+                f"{room_type} sessions need {demand_slots} room-slots per week, but the "
+                f"{len(rooms)} {room_type} rooms are available for only {supply_slots}"
+            )
+            continue
+        for d in _durations(group):
+            if d == 1:
+                continue
+            need = sum(1 for s in group if s.duration >= d)
+            have = sum(_windows(avail.rooms[r.id], avail, d) for r in rooms)
+            if need > have:
+                reasons.append(
+                    f"{need} {room_type} sessions need {d} consecutive slots, but "
+                    f"{room_type} room availability only has {have} such windows"
+                )
+    return reasons
+
+
+def _batch_units(batch_sessions: list[Session], duration: int) -> tuple[int, int]:
+    """
+    (slots, sessions of length >= duration) a batch occupies. Lab groups of a
+    section run in parallel, so a section's labs count as its busiest group.
+    """
+    slots = 0
+    count = 0
+    lab_groups: dict[str, dict[str, list[Session]]] = {}
+    for s in batch_sessions:
+        if s.lab_group_id:
+            lab_groups.setdefault(s.section_id, {}).setdefault(s.lab_group_id, []).append(s)
+        else:
+            slots += s.duration
+            count += s.duration >= duration
+    for groups in lab_groups.values():
+        slots += max(sum(s.duration for s in g) for g in groups.values())
+        count += max(sum(1 for s in g if s.duration >= duration) for g in groups.values())
+    return slots, count
+
+
+def _check_batch_load(req: SolveRequest, sessions: list[Session], avail: CompiledAvailability) -> list[str]:
+    """A batch attends one session at a time, so its weekly demand must fit the grid."""
+    reasons = []
+    by_batch: dict[str, list[Session]] = {}
+    for s in sessions:
+        by_batch.setdefault(s.batch_id, []).append(s)
+    names = {b.id: b.name for b in req.batches}
+    grid = 0
+    for day_mask in avail.day_masks.values():
+        grid |= day_mask
+
+    for bid, group in by_batch.items():
+        need_slots, _ = _batch_units(group, 1)
+        if need_slots > avail.num_slots:
+            reasons.append(
+                f"Batch {names.get(bid, bid)} needs {need_slots} slots per week, "
+                f"but the time grid has only {avail.num_slots}"
+            )
+            continue
+        for d in _durations(group):
+            if d == 1:
+                continue
+            _, need = _batch_units(group, d)
+            have = _windows(grid, avail, d)
+            if need > have:
+                reasons.append(
+                    f"Batch {names.get(bid, bid)} has {need} sessions of {d}+ consecutive "
+                    f"slots, but the time grid fits only {have} per week"
+                )
+    return reasons
+
+
+def _check_faculty_load(req: SolveRequest, sessions: list[Session], avail: CompiledAvailability) -> list[str]:
+    """
+    Max-flow from course demand to faculty capacity. Sessions are aggregated by
+    (course, usable faculty set) so the network stays small; each faculty can
+    take min(max_hours, available slots). Any connected part of the min cut
+    whose demand exceeds its capacity is reported.
+    """
+    fac_by_id = {f.id: f for f in req.faculty}
+    slot_duration = req.time_config.slot_duration
+
+    demand: dict[tuple, int] = {}
+    codes: dict[tuple, set[str]] = {}
+    for s in sessions:
+        usable = tuple(sorted({
+            fid for fid in s.qualified_faculty_ids
+            if fid in fac_by_id and avail.faculty_starts(fid, s.duration)
+        }))
+        if not usable:
+            continue  # reported by _check_windows
+        demand[usable] = demand.get(usable, 0) + s.duration
+        codes.setdefault(usable, set()).add(s.course_code)
+
+    faculty_ids = sorted({fid for usable in demand for fid in usable})
+    capacity = {
+        fid: min(
+            max_slots_for(fac_by_id[fid].max_hours, slot_duration),
+            bin(avail.faculty[fid]).count("1"),
         )
+        for fid in faculty_ids
+    }
+
+    # Node layout: 0 = source, 1 = sink, then demand classes, then faculty
+    classes = list(demand)
+    class_node = {c: 2 + i for i, c in enumerate(classes)}
+    fac_node = {fid: 2 + len(classes) + i for i, fid in enumerate(faculty_ids)}
+    flow = _MaxFlow(2 + len(classes) + len(faculty_ids))
+    total_demand = 0
+    for c in classes:
+        flow.add_edge(0, class_node[c], demand[c])
+        total_demand += demand[c]
+        for fid in c:
+            flow.add_edge(class_node[c], fac_node[fid], demand[c])
+    for fid in faculty_ids:
+        flow.add_edge(fac_node[fid], 1, capacity[fid])
+
+    if flow.max_flow(0, 1) >= total_demand:
+        return []
+
+    # Source side of the min cut: classes that cannot be fully served, plus
+    # the faculty they can reach. Split into independent faculty pools.
+    reach = flow.source_side(0)
+    short = [c for c in classes if class_node[c] in reach]
+    pools: dict[str, list[tuple]] = {}
+    parent: dict[str, str] = {}
 
+    def find(x: str) -> str:
+        while parent.setdefault(x, x) != x:
+            x = parent[x]
+        return x
+
+    for c in short:
+        for fid in c[1:]:
+            parent[find(fid)] = find(c[0])
+    for c in short:
+        pools.setdefault(find(c[0]), []).append(c)
+
+    reasons = []
+    for group in pools.values():
+        fids = sorted({fid for c in group for fid in c})
+        need = sum(demand[c] for c in group)
+        cap = sum(capacity[fid] for fid in fids)
+        if need <= cap:
+            continue
+        course_codes = sorted({code for c in group for code in codes[c]})
+        fac_desc = ", ".join(
+            f"{fac_by_id[fid].name} (max {fac_by_id[fid].max_hours}h, "
+            f"{bin(avail.faculty[fid]).count('1')} slots available)"
+            for fid in fids
+        )
+        reasons.append(
+            f"Courses {', '.join(course_codes)} need {need} teaching slots per week, but their "
+            f"qualified faculty can cover at most {cap}: {fac_desc}"
+        )
+    if not reasons:
+        reasons.append(
+            f"Faculty can cover at most {flow.value} of "
+            f"{total_demand} required teaching slots per week"
+        )
     return reasons
+
+
+class _MaxFlow:
+    """Dinic's algorithm on a small integer-capacity network."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.graph: list[list[int]] = [[] for _ in range(n)]
+        self.to: list[int] = []
+        self.cap: list[int] = []
+        self.value = 0
+
+    def add_edge(self, u: int, v: int, cap: int) -> None:
+        self.graph[u].append(len(self.to))
+        self.to.append(v)
+        self.cap.append(cap)
+        self.graph[v].append(len(self.to))
+        self.to.append(u)
+        self.cap.append(0)
+
+    def _levels(self, s: int) -> list[int]:
+        level = [-1] * self.n
+        level[s] = 0
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            for e in self.graph[u]:
+                if self.cap[e] > 0 and level[self.to[e]] < 0:
+                    level[self.to[e]] = level[u] + 1
+                    q.append(self.to[e])
+        return level
+
+    def max_flow(self, s: int, t: int) -> int:
+        while True:
+            level = self._levels(s)
+            if level[t] < 0:
+                return self.value
+            it = [0] * self.n
+
+            def push(u: int, f: int) -> int:
+                if u == t:
+                    return f
+                while it[u] < len(self.graph[u]):
+                    e = self.graph[u][it[u]]
+                    v = self.to[e]
+                    if self.cap[e] > 0 and level[v] == level[u] + 1:
+                        pushed = push(v, min(f, self.cap[e]))
+                        if pushed:
+                            self.cap[e] -= pushed
+                            self.cap[e ^ 1] += pushed
+                            return pushed
+                    it[u] += 1
+                return 0
+
+            while True:
+                f = push(s, 1 << 60)
+                if not f:
+                    break
+                self.value += f
+
+    def source_side(self, s: int) -> set[int]:
+        """Nodes reachable from ``s`` in the residual graph."""
+        return {u for u, lv in enumerate(self._levels(s)) if lv >= 0}
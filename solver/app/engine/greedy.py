@@ -0,0 +1,172 @@
+"""Greedy constructive engine: most constrained session first, first fit, bounded backtracking.
+
+Works on the start masks the CP-SAT engines get (after domain reduction,
+before rooms are collapsed) and keeps faculty, room and batch occupancy
+as bitmasks over global slots, so checking a candidate is a few integer
+operations. Used as the whole answer with ``mode="fast"`` and, in the
+default mode, as a solution hint for CP-SAT.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from ..domain.types import Placement, Session
+from ..domain.availability import iter_bits
+
+# Candidates abandoned before the search gives up; keeps a stuck construction within milliseconds
+MAX_BACKTRACKS = 2000
+
+
+@dataclass
+class Construction:
+    placements: list[Placement]  # the deepest partial timetable reached, all sessions when complete
+    complete: bool
+    backtracks: int = 0
+
+
+def _blocked(busy: int, duration: int) -> int:
+    """Starts whose ``duration`` slots would overlap ``busy``."""
+    mask = busy
+    for d in range(1, duration):
+        mask |= busy >> d
+    return mask
+
+
+@dataclass
+class _Occupancy:
+    faculty: dict[str, int] = field(default_factory=dict)
+    rooms: dict[str, int] = field(default_factory=dict)
+    load: dict[str, int] = field(default_factory=dict)  # slots taught per faculty
+    non_lab: dict[str, int] = field(default_factory=dict)  # per batch
+    lab: dict[str, dict[tuple[str, str], int]] = field(default_factory=dict)  # per batch, per (section, lab group)
+
+    def batch_busy(self, sess: Session) -> int:
+        """Slots the session's batch cannot take it at: non-lab sessions exclude everything, lab groups
+        exclude themselves and other sections' groups but may run beside their own section's groups."""
+        busy = self.non_lab.get(sess.batch_id, 0)
+        for (section, group), mask in self.lab.get(sess.batch_id, {}).items():
+            if sess.lab_group_id is None or section != sess.section_id or group == sess.lab_group_id:
+                busy |= mask
+        return busy
+
+    def toggle(self, p: Placement) -> None:
+        """Add placement ``p``, or remove it again; the masks it touches hold none of its slots otherwise."""
+        sess = p.session
+        run = ((1 << sess.duration) - 1) << p.start_gi
+        self.faculty[p.faculty_id] = self.faculty.get(p.faculty_id, 0) ^ run
+        self.rooms[p.room_id] = self.rooms.get(p.room_id, 0) ^ run
+        sign = 1 if self.faculty[p.faculty_id] & run else -1
+        self.load[p.faculty_id] = self.load.get(p.faculty_id, 0) + sign * sess.duration
+        if sess.lab_group_id is None:
+            self.non_lab[sess.batch_id] = self.non_lab.get(sess.batch_id, 0) ^ run
+        else:
+            groups = self.lab.setdefault(sess.batch_id, {})
+            key = (sess.section_id, sess.lab_group_id)
+            groups[key] = groups.get(key, 0) ^ run
+
+
+def construct(
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    room_capacity: dict[str, int],
+    max_slots: dict[str, int],
+    max_backtracks: int = MAX_BACKTRACKS,
+) -> Construction:
+    """
+    Place sessions with the fewest start slots first (then the longest, and
+    the lab groups of a section one after another so they can share a slot),
+    each at its earliest free start with the least loaded faculty and the
+    smallest free room; its later candidates are the other free faculty and
+    rooms at that start, then the next start. A session with no free
+    candidate sends the search back to the previous session's next
+    candidate, at most ``max_backtracks`` times. ``max_slots`` is each
+    faculty's weekly cap.
+    """
+
+    def start_union(sess: Session) -> int:
+        fac = room = 0
+        for mask in fac_starts[sess.id].values():
+            fac |= mask
+        for mask in room_starts[sess.id].values():
+            room |= mask
+        return fac & room
+
+    order = sorted(
+        sessions,
+        key=lambda s: (
+            bin(start_union(s)).count("1"), -s.duration, s.batch_id, s.section_id, s.course_id,
+            s.lab_group_id or "",
+        ),
+    )
+    occ = _Occupancy()
+
+    def candidates(sess: Session) -> Iterator[Placement]:
+        d = sess.duration
+        facs = sorted(
+            (
+                (fid, mask & ~_blocked(occ.faculty.get(fid, 0), d))
+                for fid, mask in fac_starts[sess.id].items()
+                if occ.load.get(fid, 0) + d <= max_slots[fid]
+            ),
+            key=lambda item: occ.load.get(item[0], 0),
+        )
+        rooms = sorted(
+            ((rid, mask & ~_blocked(occ.rooms.get(rid, 0), d)) for rid, mask in room_starts[sess.id].items()),
+            key=lambda item: room_capacity[item[0]],
+        )
+        fac_union = room_union = 0
+        for _, mask in facs:
+            fac_union |= mask
+        for _, mask in rooms:
+            room_union |= mask
+        for gi in iter_bits(fac_union & room_union & ~_blocked(occ.batch_busy(sess), d)):
+            bit = 1 << gi
+            free_rooms = [rid for rid, mask in rooms if mask & bit]
+            for fid, mask in facs:
+                if mask & bit:
+                    for rid in free_rooms:
+                        yield Placement(sess, fid, rid, gi)
+
+    chosen: list[Placement | None] = [None] * len(order)
+    pending: list[Iterator[Placement] | None] = [None] * len(order)
+    best: list[Placement] = []
+    backtracks = 0
+    i = 0
+    while 0 <= i < len(order):
+        if pending[i] is None:
+            pending[i] = candidates(order[i])
+        elif chosen[i] is not None:
+            occ.toggle(chosen[i])
+            chosen[i] = None
+        p = next(pending[i], None)
+        if p is None:
+            pending[i] = None
+            backtracks += 1
+            if backtracks > max_backtracks:
+                break
+            i -= 1
+            continue
+        occ.toggle(p)
+        chosen[i] = p
+        i += 1
+        if i > len(best):
+            best = chosen[:i]
+    return Construction(best, complete=len(best) == len(order), backtracks=backtracks)
+
+
+def follow_chains(placements: list[Placement], chains: list[list[str]]) -> list[Placement]:
+    """
+    ``placements`` with the sessions of each symmetry chain re-dealt so
+    their starts are non-decreasing along the chain, as the model requires;
+    sessions in a chain have identical options, so any order is valid.
+    """
+    by_id = {p.session.id: p for p in placements}
+    for chain in chains:
+        placed = [sid for sid in chain if sid in by_id]
+        slots = sorted((by_id[sid] for sid in placed), key=lambda p: p.start_gi)
+        sessions = {sid: by_id[sid].session for sid in placed}
+        for sid, p in zip(placed, slots):
+            by_id[sid] = p._replace(session=sessions[sid])
+    return list(by_id.values())
@@ -0,0 +1,149 @@
+"""Large neighborhood search: improve a solution by re-solving parts of it with the rest fixed."""
+
+from __future__ import annotations
+import random
+import time
+from typing import Callable
+
+from ..models import SolveRequest, SolveResponse, AssignmentResult, ImprovementPoint
+from ..domain.types import Slot
+from ..domain.time_grid import build_time_grid
+from .pool import get_pool
+
+# Search time cap per neighborhood, so one hard neighborhood cannot use up the budget
+NEIGHBORHOOD_SECONDS = 1.0
+
+
+def objective_of(assignments: list[AssignmentResult], slots: list[Slot]) -> int:
+    """The "prefer earlier slots" objective of a complete timetable: sum of start slot indices."""
+    gi = {(s.day, s.index): s.global_index for s in slots}
+    return sum(gi[(a.day, a.slot_index)] for a in assignments)
+
+
+def neighborhoods(req: SolveRequest, assignments: list[AssignmentResult]) -> list[tuple[str, list[str]]]:
+    """
+    Candidate ``(label, neighborhood ids)``: each day, each batch, each
+    teaching faculty member and each room type. The ids are interpreted like
+    ``SolveRequest.neighborhood``.
+    """
+    result = [(f"day {day}", [day]) for day in req.time_config.days]
+    result += [(f"batch {b.id}", [b.id]) for b in req.batches]
+    result += [(f"faculty {fid}", [fid]) for fid in sorted({a.faculty_id for a in assignments})]
+    by_type: dict[str, list[str]] = {}
+    for room in req.rooms:
+        by_type.setdefault(room.type, []).append(room.id)
+    result += [(f"rooms {rtype}", ids) for rtype, ids in sorted(by_type.items())]
+    return result
+
+
+def improve(
+    req: SolveRequest,
+    incumbent: SolveResponse,
+    solve_fn: Callable[..., SolveResponse],
+    cancel=None,
+) -> SolveResponse:
+    """
+    Spend ``req.improve_seconds`` re-solving neighborhoods of ``incumbent``:
+    the neighborhood's sessions are free (hinted at their current placement),
+    every other session is fixed, and a result is accepted if it lowers the
+    objective. Each round re-solves ``req.improve_workers`` neighborhoods of
+    the same incumbent, in worker processes when more than one, and keeps the
+    best. Stops early once every neighborhood has failed to improve in a row.
+    """
+    if incumbent.status != "SUCCESS" or not incumbent.assignments:
+        return incumbent
+    if incumbent.total_score is not None:
+        return _with_note(incumbent, "Improvement skipped: solution is already optimal")
+    if req.previous_assignments:
+        return _with_note(incumbent, "Improvement skipped: warm-start requests optimise for stability")
+
+    t0 = time.time()
+    deadline = t0 + req.improve_seconds
+    slots = build_time_grid(req.time_config)
+    best = incumbent.assignments
+    start_obj = best_obj = objective_of(best, slots)
+    trace = [ImprovementPoint(elapsed_ms=incumbent.solve_time_ms, objective=best_obj)]
+
+    hoods = neighborhoods(req, best)
+    workers = max(1, min(req.improve_workers, len(hoods)))
+    rnd = random.Random(0)
+    queue: list[tuple[str, list[str]]] = []
+    stale = tried = 0
+    while stale < len(hoods) and not (cancel is not None and cancel.is_set()):
+        remaining = deadline - time.time()
+        if remaining < 0.05:
+            break
+        if len(queue) < workers:
+            order = list(hoods)
+            rnd.shuffle(order)
+            queue = order + queue
+        batch = [queue.pop() for _ in range(workers)]
+        limit = min(NEIGHBORHOOD_SECONDS, remaining)
+        subs = [
+            req.model_copy(update={
+                "previous_assignments": best, "neighborhood": ids, "improve_seconds": 0.0, "decompose": False,
+            })
+            for _, ids in batch
+        ]
+        results = _solve_all(subs, solve_fn, cancel, limit)
+        tried += len(batch)
+
+        candidates = [
+            (objective_of(res.assignments, slots), label, res.assignments)
+            for (label, _), res in zip(batch, results)
+            if res is not None and res.status == "SUCCESS" and len(res.assignments) == len(best)
+        ]
+        obj, label, assignments = min(candidates, key=lambda c: c[0], default=(best_obj, None, best))
+        if obj < best_obj:
+            best, best_obj, stale = assignments, obj, 0
+            trace.append(ImprovementPoint(
+                elapsed_ms=incumbent.solve_time_ms + int((time.time() - t0) * 1000),
+                objective=obj,
+                neighborhood=label,
+            ))
+        else:
+            stale += len(batch)
+
+    lns_ms = int((time.time() - t0) * 1000)
+    diagnostics = incumbent.diagnostics.model_copy(deep=True)
+    diagnostics.reasons.append(
+        f"Improvement: objective {start_obj} -> {best_obj} over {tried} neighborhoods "
+        f"({len(trace) - 1} accepted) in {lns_ms}ms"
+    )
+    diagnostics.improvement = trace
+    if diagnostics.stats is not None:
+        stats = diagnostics.stats
+        stats.objective = float(best_obj)
+        if stats.best_bound is not None:
+            stats.gap = abs(best_obj - stats.best_bound) / max(1.0, abs(best_obj))
+        stats.phases["improvement"] = lns_ms
+    return incumbent.model_copy(update={
+        "solve_time_ms": incumbent.solve_time_ms + lns_ms,
+        "assignments": best,
+        "diagnostics": diagnostics,
+        "cancelled": incumbent.cancelled or (cancel is not None and cancel.is_set()),
+    })
+
+
+def _solve_all(
+    subs: list[SolveRequest], solve_fn: Callable[..., SolveResponse], cancel, limit: float,
+) -> list[SolveResponse | None]:
+    """Solve neighborhood requests, in-process for one and on the shared pool for several."""
+    if len(subs) == 1:
+        return [solve_fn(subs[0], None, cancel, time_limit=limit, stability=False)]
+    pool = get_pool()
+    futures = [pool.submit(solve_fn, sub, None, cancel, time_limit=limit, stability=False) for sub in subs]
+    results = []
+    for fut in futures:
+        try:
+            results.append(fut.result())
+        except Exception:  # a crashed worker just loses its neighborhood
+            results.append(None)
+    return results
+
+
+def _with_note(res: SolveResponse, note: str) -> SolveResponse:
+    diagnostics = res.diagnostics.model_copy(deep=True) if res.diagnostics else None
+    if diagnostics is not None:
+        diagnostics.reasons.append(note)
+    return res.model_copy(update={"diagnostics": diagnostics})
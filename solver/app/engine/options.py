@@ -0,0 +1,164 @@
+"""Option table: every (session, faculty, room, start) choice as parallel integer arrays.
+
+Row ``r`` is one option; the boolean engine creates its literals in row
+order, so the row number is also the literal's position. Courses, faculty,
+rooms, batches, sections and lab groups are interned integers (see
+``domain.index``); string ids are looked up again only when an option is
+turned back into a ``Placement``.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..domain.types import Placement, Session
+from ..domain.index import InstanceIndex
+
+
+@dataclass(slots=True)
+class OptionTable:
+    sessions: list[Session]
+    index: InstanceIndex
+    # Per session, aligned with ``sessions``
+    duration: np.ndarray
+    course: np.ndarray
+    batch: np.ndarray
+    section: np.ndarray
+    lab_group: np.ndarray  # -1 for sessions that are not split into lab groups
+    offsets: np.ndarray  # options of session i are rows offsets[i]:offsets[i + 1]
+    # Per option
+    session: np.ndarray
+    faculty: np.ndarray
+    room: np.ndarray
+    start: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def rows(self, i: int) -> range:
+        """Rows of the options of session ``i``."""
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def placement(self, row: int) -> Placement:
+        """The option in ``row`` with its string ids reattached."""
+        return Placement(
+            self.sessions[self.session[row]],
+            self.index.faculty[self.faculty[row]],
+            self.index.rooms[self.room[row]],
+            int(self.start[row]),
+        )
+
+    def find(self, i: int, p: Placement) -> int | None:
+        """Row of placement ``p`` among session ``i``'s options, or None."""
+        f = self.index.faculty.index.get(p.faculty_id)
+        r = self.index.rooms.index.get(p.room_id)
+        if f is None or r is None:
+            return None
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        hit = np.flatnonzero(
+            (self.faculty[lo:hi] == f) & (self.room[lo:hi] == r) & (self.start[lo:hi] == p.start_gi)
+        )
+        return int(lo + hit[0]) if len(hit) else None
+
+
+def build_option_table(
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    index: InstanceIndex,
+) -> OptionTable:
+    """
+    One row per start bit shared by a faculty and a room mask of a session,
+    grouped by session, then ordered by faculty, room and start. Each
+    session's rows come from one broadcast AND of its faculty and room
+    start masks unpacked to (entities x slots) bit arrays.
+    """
+    width = max(
+        (
+            mask.bit_length()
+            for table in (fac_starts, room_starts) for masks in table.values() for mask in masks.values()
+        ),
+        default=0,
+    )
+    nbytes = (width + 7) // 8
+    unpacked: dict[int, np.ndarray] = {}  # sessions share masks (same entity, same duration)
+
+    def bits(masks) -> np.ndarray:
+        rows = []
+        for mask in masks:
+            if mask not in unpacked:
+                raw = np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8)
+                unpacked[mask] = np.unpackbits(raw, bitorder="little")[:width].astype(bool)
+            rows.append(unpacked[mask])
+        return np.array(rows, dtype=bool).reshape(len(rows), width)
+
+    session_cols, faculty_cols, room_cols, start_cols = [], [], [], []
+    offsets = np.zeros(len(sessions) + 1, dtype=np.int64)
+    for i, sess in enumerate(sessions):
+        facs, rooms = fac_starts[sess.id], room_starts[sess.id]
+        f, r, gi = np.nonzero(bits(facs.values())[:, None, :] & bits(rooms.values())[None, :, :])
+        faculty_cols.append(np.array([index.faculty.index[fid] for fid in facs], dtype=np.int32)[f])
+        room_cols.append(np.array([index.rooms.index[rid] for rid in rooms], dtype=np.int32)[r])
+        start_cols.append(gi.astype(np.int32))
+        session_cols.append(np.full(len(gi), i, dtype=np.int32))
+        offsets[i + 1] = offsets[i] + len(gi)
+
+    def column(values) -> np.ndarray:
+        return np.asarray(values, dtype=np.int32)
+
+    def joined(cols) -> np.ndarray:
+        return np.concatenate(cols) if cols else np.zeros(0, dtype=np.int32)
+
+    return OptionTable(
+        sessions=sessions,
+        index=index,
+        duration=column([s.duration for s in sessions]),
+        course=column([index.courses.index[s.course_id] for s in sessions]),
+        batch=column([index.batches.index[s.batch_id] for s in sessions]),
+        section=column([index.sections.index[s.section_id] for s in sessions]),
+        lab_group=column([index.lab_groups.index[s.lab_group_id] if s.lab_group_id else -1 for s in sessions]),
+        offsets=offsets,
+        session=joined(session_cols),
+        faculty=joined(faculty_cols),
+        room=joined(room_cols),
+        start=joined(start_cols),
+    )
+
+
+def join_tables(head: OptionTable, tail: OptionTable) -> OptionTable:
+    """``head`` followed by ``tail``, whose sessions and rows are renumbered after it; same index."""
+    return OptionTable(
+        sessions=head.sessions + tail.sessions,
+        index=head.index,
+        duration=np.concatenate([head.duration, tail.duration]),
+        course=np.concatenate([head.course, tail.course]),
+        batch=np.concatenate([head.batch, tail.batch]),
+        section=np.concatenate([head.section, tail.section]),
+        lab_group=np.concatenate([head.lab_group, tail.lab_group]),
+        offsets=np.concatenate([head.offsets, tail.offsets[1:] + head.offsets[-1]]),
+        session=np.concatenate([head.session, tail.session + len(head.sessions)]).astype(np.int32),
+        faculty=np.concatenate([head.faculty, tail.faculty]),
+        room=np.concatenate([head.room, tail.room]),
+        start=np.concatenate([head.start, tail.start]),
+    )
+
+
+def group_rows(keys: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    ``rows`` grouped by equal ``keys``: (the distinct keys ascending, the
+    rows of each in their original order).
+    """
+    order = np.argsort(keys, kind="stable")
+    keys, rows = keys[order], rows[order]
+    cuts = np.flatnonzero(np.diff(keys)) + 1
+    return keys[np.r_[0, cuts]] if len(keys) else keys, np.split(rows, cuts)
+
+
+def occupancy(table: OptionTable) -> tuple[np.ndarray, np.ndarray]:
+    """(row, slot) for every slot every option occupies: each row repeated over its session's duration."""
+    durations = table.duration[table.session].astype(np.int64)
+    row = np.repeat(np.arange(len(table), dtype=np.int64), durations)
+    first = np.repeat(np.cumsum(durations) - durations, durations)
+    slot = table.start[row].astype(np.int64) + (np.arange(len(row), dtype=np.int64) - first)
+    return row, slot
@@ -0,0 +1,56 @@
+"""Shared worker-process pool for solving independent sub-models in parallel."""
+
+from __future__ import annotations
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def available_cores() -> int:
+    """
+    Cores this process may use: ``SOLVER_CORES`` if set, else the CPU affinity
+    mask, further limited by a cgroup v2 CPU quota (container CPU limits).
+    """
+    if os.environ.get("SOLVER_CORES"):
+        return max(1, int(os.environ["SOLVER_CORES"]))
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cores = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cores = min(cores, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+
+def pool_size() -> int:
+    """Worker count, from ``SOLVER_POOL_WORKERS`` or the cores available."""
+    return max(1, int(os.environ.get("SOLVER_POOL_WORKERS", available_cores())))
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
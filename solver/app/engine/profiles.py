@@ -0,0 +1,117 @@
+"""CP-SAT parameter profiles chosen from measured instance features, with per-request overrides."""
+
+from __future__ import annotations
+import os
+from dataclasses import dataclass, replace
+from ortools.sat import sat_parameters_pb2
+
+from ..models import SolveRequest, SolverOptions
+from .pool import available_cores
+
+BRANCHING = sat_parameters_pb2.SatParameters.SearchBranching
+
+
+@dataclass(frozen=True)
+class InstanceFeatures:
+    sessions: int
+    variables: int
+    constraints: int
+    utilisation: float  # session slots / room slots available; near 1 means a tight instance
+    cores: int
+
+
+@dataclass(frozen=True)
+class SolverProfile:
+    name: str
+    max_time_seconds: float
+    num_workers: int  # 0 = every available core, at least MIN_PORTFOLIO
+    linearization_level: int = 1
+    presolve: bool = True
+    search_branching: str = "AUTOMATIC_SEARCH"
+
+    def apply(self, parameters, cores: int) -> None:
+        parameters.max_time_in_seconds = self.max_time_seconds
+        parameters.num_workers = self.num_workers or max(cores, MIN_PORTFOLIO)
+        parameters.linearization_level = self.linearization_level
+        parameters.cp_model_presolve = self.presolve
+        parameters.search_branching = BRANCHING.Value(self.search_branching)
+
+
+# A single worker has no portfolio: on the tiny bench tier it failed to prove
+# optimality in 5s where 4 workers did in 0.4s, even on one core
+MIN_PORTFOLIO = 4
+
+# Synchronous endpoints keep to the 5s limit /solve always had unless the
+# request sets its own deadline or time limit; the longer medium, large and
+# xlarge profiles are for /jobs
+SYNC_TIME_LIMIT = float(os.environ.get("SOLVER_SYNC_TIME_LIMIT", "5"))
+
+# Picked with ``python -m bench tune``; see PROFILE_LIMITS for when each applies
+PROFILES: dict[str, SolverProfile] = {
+    "small": SolverProfile("small", max_time_seconds=5.0, num_workers=4),
+    "medium": SolverProfile("medium", max_time_seconds=15.0, num_workers=8),
+    "large": SolverProfile("large", max_time_seconds=60.0, num_workers=0),
+    "xlarge": SolverProfile("xlarge", max_time_seconds=120.0, num_workers=0, linearization_level=0),
+}
+
+# Largest (sessions, variables) each profile is chosen for, smallest first.
+# Sessions matter for the interval engine, whose models have few variables.
+PROFILE_LIMITS = [("small", 40, 5_000), ("medium", 400, 50_000), ("large", 3_000, 300_000)]
+
+
+def choose_profile(features: InstanceFeatures) -> SolverProfile:
+    """Smallest profile whose limits fit the instance; tight instances (high utilisation) move up one size."""
+    names = [name for name, _, _ in PROFILE_LIMITS] + ["xlarge"]
+    index = next(
+        (
+            i for i, (_, sessions, variables) in enumerate(PROFILE_LIMITS)
+            if features.sessions <= sessions and features.variables <= variables
+        ),
+        len(names) - 1,
+    )
+    if features.utilisation > 0.8:
+        index = min(index + 1, len(names) - 1)
+    return PROFILES[names[index]]
+
+
+def sync_time_limit(req: SolveRequest) -> float | None:
+    """SYNC_TIME_LIMIT for a synchronous solve of ``req``; None when it sets deadline_seconds or max_time_seconds."""
+    if req.deadline_seconds is None and req.solver.max_time_seconds is None:
+        return SYNC_TIME_LIMIT
+    return None
+
+
+def validate_options(options: SolverOptions) -> list[str]:
+    """Problems with per-request solver options; an empty list means they are usable."""
+    problems = []
+    if options.profile is not None and options.profile not in PROFILES:
+        problems.append(f"Unknown solver profile '{options.profile}'; expected one of {', '.join(PROFILES)}")
+    if options.search_branching is not None and options.search_branching not in BRANCHING.keys():
+        problems.append(
+            f"Unknown search_branching '{options.search_branching}'; expected one of {', '.join(BRANCHING.keys())}"
+        )
+    if options.linearization_level is not None and options.linearization_level not in (0, 1, 2):
+        problems.append("linearization_level must be 0, 1 or 2")
+    return problems
+
+
+def resolve_profile(
+    features: InstanceFeatures,
+    options: SolverOptions,
+    remaining_seconds: float | None = None,
+) -> SolverProfile:
+    """
+    The chosen (or requested) profile with the request's overrides applied,
+    its time limit cut to ``remaining_seconds`` of the request deadline.
+    """
+    profile = PROFILES[options.profile] if options.profile else choose_profile(features)
+    overrides = {
+        field: value
+        for field in ("max_time_seconds", "num_workers", "linearization_level", "presolve", "search_branching")
+        if (value := getattr(options, field)) is not None
+    }
+    if overrides:
+        profile = replace(profile, **overrides)
+    if remaining_seconds is not None:
+        profile = replace(profile, max_time_seconds=max(0.0, min(profile.max_time_seconds, remaining_seconds)))
+    return profile
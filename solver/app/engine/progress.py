@@ -0,0 +1,108 @@
+"""Solution streaming and cancellation hooks for a running CP-SAT search."""
+
+from __future__ import annotations
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Protocol
+from ortools.sat.python import cp_model
+
+from ..models import AssignmentResult, SolutionEvent
+
+
+class EventLike(Protocol):
+    """``threading.Event`` or a multiprocessing manager proxy of one."""
+
+    def is_set(self) -> bool: ...
+
+    def wait(self, timeout: float | None = None) -> bool: ...
+
+
+class ProgressCallback(cp_model.CpSolverSolutionCallback):
+    """Reports each improving solution as a ``SolutionEvent`` with an assignment delta."""
+
+    def __init__(
+        self,
+        decode: Callable,
+        to_assignment: Callable[[tuple], AssignmentResult],
+        on_solution: Callable[[SolutionEvent], None],
+        t0: float,
+    ):
+        super().__init__()
+        self._decode = decode
+        self._to_assignment = to_assignment
+        self._on_solution = on_solution
+        self._t0 = t0
+        self._count = 0
+        self._last: dict[str, tuple] = {}
+
+    def on_solution_callback(self) -> None:
+        self._count += 1
+        current = {p[0].id: p for p in self._decode(self)}
+
+        added, removed = [], []
+        for sid, placement in current.items():
+            previous = self._last.get(sid)
+            if previous is not None and previous[1:] == placement[1:]:
+                continue
+            added.append(self._to_assignment(placement))
+            if previous is not None:
+                removed.append(self._to_assignment(previous))
+        self._last = current
+
+        self._on_solution(SolutionEvent(
+            index=self._count,
+            objective=self.objective_value,
+            best_bound=self.best_objective_bound,
+            elapsed_ms=int((time.time() - self._t0) * 1000),
+            added=added,
+            removed=removed,
+        ))
+
+
+search_logger = logging.getLogger("app.engine.search")
+
+
+class SearchLog:
+    """
+    CP-SAT log callback: forwards every line to ``search_logger`` at DEBUG
+    (silent unless that logger is enabled) and records when presolve ends
+    and the search starts.
+    """
+
+    def __init__(self):
+        self.presolve_seconds: float | None = None
+        self._forward = search_logger.isEnabledFor(logging.DEBUG)
+
+    def __call__(self, line: str) -> None:
+        if self.presolve_seconds is None and line.startswith("Starting search at "):
+            self.presolve_seconds = float(line.split()[3].rstrip("s"))
+        if self._forward:
+            search_logger.debug(line)
+
+
+@contextmanager
+def cancel_watcher(solver: cp_model.CpSolver, cancel: EventLike | None) -> Iterator[None]:
+    """While the block runs, call ``solver.stop_search()`` as soon as ``cancel`` is set."""
+    if cancel is None:
+        yield
+        return
+
+    done = threading.Event()
+
+    def watch() -> None:
+        while not done.is_set():
+            if cancel.wait(0.1):
+                # Keep signalling: a stop issued before the search has
+                # started is not remembered by the solver.
+                solver.stop_search()
+                done.wait(0.1)
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        done.set()
+        watcher.join()
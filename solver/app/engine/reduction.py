@@ -0,0 +1,226 @@
+"""Domain reduction: remove provably unusable (faculty, room, start) options before the model is built.
+
+Works on the per-session start bitmasks (``fac_starts`` / ``room_starts``,
+bit gi set = may start at gi) in place:
+
+  * static bounds: rooms that cannot seat the batch (or its lab group) and
+    faculty whose ``max_hours`` cannot cover the session,
+  * propagation to a fixpoint: a session's compulsory part (slots it
+    occupies whatever start it takes) blocks its batch, and its faculty /
+    room when it has only one left; load already forced onto a faculty
+    member removes them from sessions that would exceed ``max_hours``.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+
+from ..models import SolveRequest
+from ..domain.types import Session
+from .feasibility import max_slots_for
+
+MAX_ROUNDS = 20
+
+
+@dataclass
+class ReductionReport:
+    options_before: int = 0
+    options_after: int = 0
+    rounds: int = 0
+    small_rooms: int = 0  # (session, room) pairs removed for capacity
+    overloaded_faculty: int = 0  # (session, faculty) pairs removed for max_hours
+    reasons: list[str] = field(default_factory=list)  # sessions left without any option
+
+    @property
+    def removed(self) -> int:
+        return self.options_before - self.options_after
+
+
+def count_options(
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+) -> int:
+    """Number of (faculty, room, start) combinations, i.e. boolean-engine option literals before room collapsing."""
+    total = 0
+    for sess in sessions:
+        for fmask in fac_starts[sess.id].values():
+            for rmask in room_starts[sess.id].values():
+                total += (fmask & rmask).bit_count()
+    return total
+
+
+def students_per_session(req: SolveRequest, sessions: list[Session]) -> dict[str, int]:
+    """Students attending each session: the batch, or its share when the section is split into lab groups."""
+    batch_size = {b.id: b.student_count for b in req.batches}
+    groups = {sec.id: len(sec.lab_groups) for c in req.courses for sec in c.sections}
+    return {
+        s.id: -(-batch_size[s.batch_id] // groups[s.section_id]) if s.lab_group_id else batch_size[s.batch_id]
+        for s in sessions
+    }
+
+
+def apply_bounds(
+    req: SolveRequest,
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    report: ReductionReport,
+) -> None:
+    """Drop rooms too small for a session and faculty who may not teach its duration at all."""
+    capacity = {r.id: r.capacity for r in req.rooms}
+    cap_slots = {f.id: max_slots_for(f.max_hours, req.time_config.slot_duration) for f in req.faculty}
+    students = students_per_session(req, sessions)
+    for sess in sessions:
+        rooms = room_starts[sess.id]
+        for rid in [r for r in rooms if capacity[r] < students[sess.id]]:
+            del rooms[rid]
+            report.small_rooms += 1
+        facs = fac_starts[sess.id]
+        for fid in [f for f in facs if cap_slots[f] < sess.duration]:
+            del facs[fid]
+            report.overloaded_faculty += 1
+        if not rooms:
+            room_type = "lab" if sess.course_type == "LAB" else "lecture"
+            reason = (
+                f"No {room_type} room seats the {students[sess.id]} students of "
+                f"{sess.course_code} (section {sess.section_id}"
+                + (f", lab group {sess.lab_group_id}" if sess.lab_group_id else "") + ")"
+            )
+        elif not facs:
+            reason = (
+                f"No qualified faculty for {sess.course_code} (section {sess.section_id}) "
+                f"may teach a {sess.duration}-slot session within their max_hours"
+            )
+        else:
+            continue
+        if reason not in report.reasons:  # repeated sessions of a section share the reason
+            report.reasons.append(reason)
+
+
+def propagate(
+    req: SolveRequest,
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    report: ReductionReport,
+) -> None:
+    """Shrink domains until nothing changes (or MAX_ROUNDS); empty sessions are added to ``report.reasons``."""
+    cap_slots = {f.id: max_slots_for(f.max_hours, req.time_config.slot_duration) for f in req.faculty}
+    changed = True
+    while changed and report.rounds < MAX_ROUNDS and not report.reasons:
+        report.rounds += 1
+        changed = _align(sessions, fac_starts, room_starts, report)
+        if report.reasons:
+            return
+
+        compulsory = {s.id: _compulsory(_starts(s.id, fac_starts, room_starts), s.duration) for s in sessions}
+        fac_occ: dict[str, int] = {}
+        fac_load: dict[str, int] = {}
+        room_occ: dict[str, int] = {}
+        # batch -> (section, lab group) -> occupied slots; (None, None) for non-lab sessions
+        batch_occ: dict[str, dict[tuple, int]] = {}
+        for sess in sessions:
+            c = compulsory[sess.id]
+            facs, rooms = fac_starts[sess.id], room_starts[sess.id]
+            if len(facs) == 1:
+                fid = next(iter(facs))
+                fac_occ[fid] = fac_occ.get(fid, 0) | c
+                fac_load[fid] = fac_load.get(fid, 0) + sess.duration
+            if len(rooms) == 1:
+                rid = next(iter(rooms))
+                room_occ[rid] = room_occ.get(rid, 0) | c
+            key = (sess.section_id, sess.lab_group_id) if sess.lab_group_id else (None, None)
+            by_group = batch_occ.setdefault(sess.batch_id, {})
+            by_group[key] = by_group.get(key, 0) | c
+
+        for sess in sessions:
+            own = compulsory[sess.id]
+            blocked = _batch_blocked(sess, batch_occ[sess.batch_id]) & ~own
+            facs, rooms = fac_starts[sess.id], room_starts[sess.id]
+            forced_fac = len(facs) == 1
+            for fid in list(facs):
+                if not forced_fac and fac_load.get(fid, 0) + sess.duration > cap_slots[fid]:
+                    del facs[fid]
+                    report.overloaded_faculty += 1
+                    changed = True
+                    continue
+                keep = facs[fid] & ~_starts_hitting(blocked | (fac_occ.get(fid, 0) & ~own), sess.duration)
+                if keep != facs[fid]:
+                    facs[fid] = keep
+                    changed = True
+            for rid in list(rooms):
+                keep = rooms[rid] & ~_starts_hitting(blocked | (room_occ.get(rid, 0) & ~own), sess.duration)
+                if keep != rooms[rid]:
+                    rooms[rid] = keep
+                    changed = True
+    _align(sessions, fac_starts, room_starts, report)
+
+
+def _starts(sid: str, fac_starts, room_starts) -> int:
+    fac_union = room_union = 0
+    for mask in fac_starts[sid].values():
+        fac_union |= mask
+    for mask in room_starts[sid].values():
+        room_union |= mask
+    return fac_union & room_union
+
+
+def _align(sessions, fac_starts, room_starts, report: ReductionReport) -> bool:
+    """
+    Restrict every faculty / room mask to starts some partner of the other
+    kind also allows, dropping emptied entries. Returns whether anything changed.
+    """
+    changed = False
+    for sess in sessions:
+        starts = _starts(sess.id, fac_starts, room_starts)
+        if not starts:
+            report.reasons.append(
+                f"No feasible (faculty, room, slot) left for {sess.course_code} (section {sess.section_id}) "
+                f"once forced sessions and capacity are taken into account"
+            )
+            return changed
+        for table in (fac_starts[sess.id], room_starts[sess.id]):
+            for key in list(table):
+                keep = table[key] & starts
+                if keep != table[key]:
+                    changed = True
+                    if keep:
+                        table[key] = keep
+                    else:
+                        del table[key]
+    return changed
+
+
+def _compulsory(starts: int, duration: int) -> int:
+    """Slots occupied by every start in ``starts``: from the latest start to the end of the earliest run."""
+    if not starts:
+        return 0
+    lo = (starts & -starts).bit_length() - 1
+    hi = starts.bit_length() - 1
+    if hi >= lo + duration:
+        return 0
+    return ((1 << (lo + duration - hi)) - 1) << hi
+
+
+def _starts_hitting(occupied: int, duration: int) -> int:
+    """Starts whose run of ``duration`` slots overlaps ``occupied``."""
+    hit = 0
+    for k in range(duration):
+        hit |= occupied >> k
+    return hit
+
+
+def _batch_blocked(sess: Session, by_group: dict[tuple, int]) -> int:
+    """
+    Slots occupied by conflicting sessions of the batch: non-lab sessions
+    conflict with everything, lab groups with themselves and with groups of
+    other sections; groups of one section may run in parallel.
+    """
+    blocked = 0
+    for (section_id, group_id), occ in by_group.items():
+        if (
+            sess.lab_group_id is None or section_id is None
+            or section_id != sess.section_id or group_id == sess.lab_group_id
+        ):
+            blocked |= occ
+    return blocked
@@ -0,0 +1,439 @@
+"""Resident boolean models: built once per schedule, then updated in place for each new request.
+
+The model is built over every option the time grid, qualifications, room
+types, room sizes and faculty max_hours allow, availability ignored.
+Availability and locks only set variable domains: an option outside its
+faculty's or room's availability is fixed to 0, a locked placement to 1.
+Sessions that appear (a course added, or split into different sessions)
+append option rows plus conflicts at the slots they touch; sessions that
+disappear have their options fixed to 0 and their exactly-one cleared.
+A different time grid, faculty set, max_hours, room set, room type or
+room size needs a new build (``compatible`` is False).
+
+The last solution is hinted and, as with ``previous_assignments`` in
+``solve``, moving one of its placements costs more than any slot shift.
+"""
+
+from __future__ import annotations
+import dataclasses
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from ..models import SolveRequest, SolveResponse, DiagnosticsPayload, SolveStats
+from ..domain.types import Session
+from ..domain.time_grid import build_time_grid
+from ..domain.session_expander import expand_sessions
+from ..domain.availability import CompiledAvailability, compile_availability
+from ..domain.index import index_request
+from ..metrics import PhaseTimer
+from .boolean import build_boolean_model
+from .feasibility import check_feasibility, max_slots_for
+from .options import group_rows
+from .pool import available_cores
+from .profiles import InstanceFeatures, resolve_profile
+from .progress import SearchLog
+from .reduction import students_per_session
+from .solver import to_assignment
+from .warm_start import match_assignments
+
+# Python-side size of one option literal object (CPython 3.11), for the memory estimate
+LITERAL_BYTES = 212
+
+
+def resident_problems(req: SolveRequest) -> list[str]:
+    """Request options a resident model does not support; empty if it can serve ``req``."""
+    problems = []
+    if req.engine != "boolean":
+        problems.append("Resident models need the boolean engine")
+    if req.room_assignment != "model":
+        problems.append("Resident models keep rooms in the model; room_assignment must be 'model'")
+    if req.decompose or req.improve_seconds > 0 or req.solutions > 1:
+        problems.append("Resident models do not support decompose, improve_seconds or solutions")
+    if req.neighborhood:
+        problems.append("Resident models do not support neighborhood; lock the placements to keep instead")
+    if req.mode != "default":
+        problems.append("Resident models always search with CP-SAT; mode must be 'default'")
+    if req.explain_seconds > 0:
+        problems.append("Resident models do not explain infeasibility; explain_seconds must be 0")
+    return problems
+
+
+def _structure(req: SolveRequest) -> tuple:
+    """What the option rows depend on besides the sessions: a change here needs a new build."""
+    return (
+        req.time_config.model_dump_json(),
+        tuple((f.id, f.max_hours) for f in req.faculty),
+        tuple((r.id, r.type, r.capacity) for r in req.rooms),
+    )
+
+
+def _signature(sess: Session, students: int) -> tuple:
+    """Everything that shapes a session's options; equal signatures are interchangeable sessions."""
+    return (
+        sess.course_id, sess.course_code, sess.course_name, sess.course_type, sess.section_id,
+        sess.lab_group_id, sess.batch_id, sess.duration,
+        tuple(sess.qualified_faculty_ids), tuple(sess.eligible_room_ids), students,
+    )
+
+
+class ResidentModel:
+    """One schedule's built model and its last solution; callers serialise ``run`` with ``lock``."""
+
+    def __init__(self, req: SolveRequest):
+        t0 = time.time()
+        self.lock = threading.Lock()
+        self.req = req
+        self.structure = _structure(req)
+        self.slots = build_time_grid(req.time_config)
+        self.slot_global_map = {s.global_index: s for s in self.slots}
+        self.grid = compile_availability(req, self.slots)  # only its grid starts are used
+
+        sessions = expand_sessions(req)
+        students = students_per_session(req, sessions)
+        self.signatures = [_signature(s, students[s.id]) for s in sessions]
+        self.active = [True] * len(sessions)
+        self._next_id = len(sessions)  # expansion names sessions s0..s{n-1}; later ones continue from here
+
+        self.model = cp_model.CpModel()
+        fac_starts, room_starts = self._open_masks(sessions, students)
+        self.handle = build_boolean_model(self.model, sessions, fac_starts, room_starts, index_request(req))
+        self._loads: dict[int, int] = {}  # faculty index -> constraint index of its max_hours bound
+        self._add_loads(0)
+        objective = self.model.proto.objective
+        objective.vars.extend(range(self.handle.first, self.handle.first + len(self.handle.table)))
+        objective.coeffs.extend(self.handle.table.start.tolist())
+
+        # Per option row: current domain, and whether its faculty / room is available
+        n = len(self.handle.table)
+        self.lo = np.zeros(n, dtype=np.int8)
+        self.hi = np.ones(n, dtype=np.int8)
+        self._fac_ok = np.zeros(n, dtype=bool)
+        self._room_ok = np.zeros(n, dtype=bool)
+        self._seen: dict[tuple[str, str], int] = {}  # availability mask each entity's rows were computed from
+        self._groups: dict[str, list[tuple[int, int, np.ndarray]]] | None = None
+        self._keep = np.zeros(0, dtype=np.int64)  # rows whose objective coefficient carries the keep penalty
+        self.last = self._rows_of(req.previous_assignments)
+        self.pending_build_ms = int((time.time() - t0) * 1000)
+
+    def compatible(self, req: SolveRequest) -> bool:
+        return _structure(req) == self.structure
+
+    def nbytes(self) -> int:
+        """Estimated memory held: the model proto, the literal objects and the per-row arrays."""
+        table = self.handle.table
+        arrays = [table.session, table.faculty, table.room, table.start, self.lo, self.hi, self._fac_ok, self._room_ok]
+        return self.model.proto.ByteSize() + LITERAL_BYTES * len(self.handle.lits) + sum(a.nbytes for a in arrays)
+
+    def run(self, req: SolveRequest, time_limit: float | None = None) -> SolveResponse:
+        """Bring the model in line with ``req`` (same ``structure``) and solve it; ``time_limit`` caps the search."""
+        t0 = time.time()
+        timer = PhaseTimer()
+        build_ms, self.pending_build_ms = self.pending_build_ms, 0
+        if build_ms:
+            timer.phases["build"] = build_ms
+        added, removed = self._update_sessions(req)
+        self.req = req
+        timer.lap("sessions")
+
+        avail = compile_availability(req, self.slots)
+        sessions = [s for s, on in zip(self.handle.sessions, self.active) if on]
+        reasons = check_feasibility(req, sessions, avail)
+        timer.lap("feasibility")
+        if reasons:
+            return self._infeasible(reasons, t0, build_ms)
+
+        changed, reasons = self._set_domains(avail, sessions)
+        timer.lap("domains")
+        if reasons:
+            return self._infeasible(reasons, t0, build_ms)
+
+        self._set_objective_and_hints()
+        timer.lap("objective")
+
+        cores = available_cores()
+        model = self.model
+        features = InstanceFeatures(
+            sessions=len(sessions),
+            variables=len(model.proto.variables),
+            constraints=len(model.proto.constraints),
+            utilisation=sum(s.duration for s in sessions) / max(1, sum(bin(m).count("1") for m in avail.rooms.values())),
+            cores=cores,
+        )
+        remaining = None
+        if req.deadline_seconds is not None:
+            remaining = req.deadline_seconds - (time.time() - t0) - build_ms / 1000
+        if time_limit is not None:
+            remaining = time_limit if remaining is None else min(remaining, time_limit)
+        profile = resolve_profile(features, req.solver, remaining)
+        solver = cp_model.CpSolver()
+        profile.apply(solver.parameters, cores)
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        search_log = SearchLog()
+        solver.log_callback = search_log
+
+        t_search = time.time()
+        status = solver.solve(model)
+        timer.lap("search")
+        cp_ms = int((time.time() - t_search) * 1000)
+        presolve_ms = min(cp_ms, int((search_log.presolve_seconds or 0) * 1000))
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+        assignments = []
+        if found:
+            first, n = self.handle.first, len(self.handle.table)
+            self.last = np.flatnonzero(np.asarray(solver.response_proto.solution[first:first + n]))
+            assignments = [
+                to_assignment(self.handle.table.placement(r), self.slot_global_map) for r in self.last.tolist()
+            ]
+            timer.lap("extraction")
+
+        elapsed = int((time.time() - t0) * 1000) + build_ms
+        stats = SolveStats(
+            solver_status=solver.status_name(status),
+            build_time_ms=int((t_search - t0) * 1000) + build_ms,
+            presolve_time_ms=presolve_ms,
+            search_time_ms=cp_ms - presolve_ms,
+            num_variables=len(model.proto.variables),
+            num_constraints=len(model.proto.constraints),
+            objective=solver.objective_value if found else None,
+            best_bound=solver.best_objective_bound if found else None,
+            gap=(
+                abs(solver.objective_value - solver.best_objective_bound) / max(1.0, abs(solver.objective_value))
+                if found else None
+            ),
+            branches=solver.num_branches,
+            conflicts=solver.num_conflicts,
+            sessions=len(sessions),
+            phases=timer.phases,
+            model_counts=self.handle.counts,
+            profile=profile.name,
+            num_workers=solver.parameters.num_workers,
+            max_time_seconds=round(profile.max_time_seconds, 3),
+        )
+        summary = (
+            f"Resident model: built in {build_ms}ms" if build_ms else
+            f"Resident model: updated in place, {added} sessions added, {removed} removed, "
+            f"{changed} option domains changed"
+        )
+        if not found:
+            return SolveResponse(
+                status="INFEASIBLE",
+                solve_time_ms=elapsed,
+                diagnostics=DiagnosticsPayload(
+                    reasons=[
+                        f"Solver status: {solver.status_name(status)}",
+                        "The problem may be over-constrained. Try adding more rooms or faculty.",
+                        summary,
+                    ],
+                    stats=stats,
+                ),
+            )
+        optimal = status == cp_model.OPTIMAL
+        return SolveResponse(
+            status="SUCCESS",
+            solve_time_ms=elapsed,
+            total_score=solver.objective_value if optimal else None,
+            assignments=assignments,
+            diagnostics=DiagnosticsPayload(
+                hard_score=0,
+                soft_score=solver.objective_value if optimal else 0,
+                reasons=[
+                    f"Solver status: {'OPTIMAL' if optimal else 'FEASIBLE'}",
+                    f"Total assignments: {len(assignments)}",
+                    f"Solve time: {elapsed}ms",
+                    f"Model size (boolean, resident): {len(model.proto.variables)} variables, "
+                    f"{len(model.proto.constraints)} constraints",
+                    summary,
+                ],
+                stats=stats,
+            ),
+        )
+
+    def _infeasible(self, reasons: list[str], t0: float, build_ms: int) -> SolveResponse:
+        return SolveResponse(
+            status="INFEASIBLE",
+            solve_time_ms=int((time.time() - t0) * 1000) + build_ms,
+            diagnostics=DiagnosticsPayload(reasons=reasons),
+        )
+
+    def _open_masks(
+        self, sessions: list[Session], students: dict[str, int],
+    ) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+        """Start masks of every grid start for the faculty and rooms a session may ever use."""
+        capacity = {r.id: r.capacity for r in self.req.rooms}
+        cap_slots = {f.id: max_slots_for(f.max_hours, self.req.time_config.slot_duration) for f in self.req.faculty}
+        fac_starts, room_starts = {}, {}
+        for sess in sessions:
+            starts = self.grid.grid_starts(sess.duration)
+            fac_starts[sess.id] = {f: starts for f in sess.qualified_faculty_ids if cap_slots[f] >= sess.duration}
+            room_starts[sess.id] = {r: starts for r in sess.eligible_room_ids if capacity[r] >= students[sess.id]}
+        return fac_starts, room_starts
+
+    def _add_loads(self, since: int) -> None:
+        """Extend (or create) each faculty's max_hours bound with the option rows from ``since`` on."""
+        table = self.handle.table
+        constraints = self.model.proto.constraints
+        max_hours = {f.id: f.max_hours for f in self.req.faculty}
+        rows = np.arange(since, len(table))
+        for f, group in zip(*group_rows(table.faculty[rows], rows)):
+            f = int(f)
+            if f not in self._loads:
+                cap = max_slots_for(max_hours[table.index.faculty[f]], self.req.time_config.slot_duration)
+                self._loads[f] = len(constraints)
+                constraints.add().linear.domain.extend([cp_model.INT_MIN, cap])
+            linear = constraints[self._loads[f]].linear
+            linear.vars.extend((group + self.handle.first).tolist())
+            linear.coeffs.extend(table.duration[table.session[group]].tolist())
+
+    def _update_sessions(self, req: SolveRequest) -> tuple[int, int]:
+        """Match ``req``'s sessions to the resident ones by signature; returns (added, removed)."""
+        sessions = expand_sessions(req)
+        students = students_per_session(req, sessions)
+        wanted = Counter(_signature(s, students[s.id]) for s in sessions)
+        removed = []
+        for i, sig in enumerate(self.signatures):
+            if not self.active[i]:
+                continue
+            if wanted[sig]:
+                wanted[sig] -= 1
+            else:
+                removed.append(i)
+        added, added_students = [], {}
+        for sess in sessions:
+            sig = _signature(sess, students[sess.id])
+            if wanted[sig]:
+                wanted[sig] -= 1
+                new = dataclasses.replace(sess, id=f"s{self._next_id}")
+                self._next_id += 1
+                added.append(new)
+                added_students[new.id] = students[sess.id]
+                self.signatures.append(sig)
+
+        constraints = self.model.proto.constraints
+        for i in removed:
+            self.active[i] = False
+            constraints[self.handle.exactly_one[i]].Clear()  # its options are fixed to 0 by _set_domains
+        if added:
+            index = self.handle.table.index
+            for sess in added:
+                index.courses.add(sess.course_id)
+                index.batches.add(sess.batch_id)
+                index.sections.add(sess.section_id)
+                if sess.lab_group_id:
+                    index.lab_groups.add(sess.lab_group_id)
+            since = len(self.handle.table)
+            fac_starts, room_starts = self._open_masks(added, added_students)
+            self.handle.extend(self.model, added, fac_starts, room_starts)
+            self.active += [True] * len(added)
+            self._add_loads(since)
+            table = self.handle.table
+            self.model.proto.objective.vars.extend(range(self.handle.first + since, self.handle.first + len(table)))
+            self.model.proto.objective.coeffs.extend(table.start[since:].tolist())
+            grow = len(table) - since
+            self.lo = np.concatenate([self.lo, np.zeros(grow, dtype=np.int8)])
+            self.hi = np.concatenate([self.hi, np.ones(grow, dtype=np.int8)])
+            self._fac_ok = np.concatenate([self._fac_ok, np.zeros(grow, dtype=bool)])
+            self._room_ok = np.concatenate([self._room_ok, np.zeros(grow, dtype=bool)])
+            self._groups = None
+            self._seen.clear()
+        return len(added), len(removed)
+
+    def _refresh_availability(self, avail: CompiledAvailability) -> None:
+        """Recompute ``_fac_ok`` / ``_room_ok`` for the rows of entities whose availability changed."""
+        table = self.handle.table
+        if self._groups is None:
+            duration = table.duration[table.session].astype(np.int64)
+            width = int(duration.max()) + 1 if len(duration) else 1
+            self._groups = {}
+            for kind, column in (("f", table.faculty), ("r", table.room)):
+                keys, groups = group_rows(column.astype(np.int64) * width + duration, np.arange(len(table)))
+                self._groups[kind] = [(k // width, k % width, g) for k, g in zip(keys.tolist(), groups)]
+        nbytes = (avail.num_slots + 7) // 8
+        for kind, ids, masks, starts, ok in (
+            ("f", table.index.faculty, avail.faculty, avail.faculty_starts, self._fac_ok),
+            ("r", table.index.rooms, avail.rooms, avail.room_starts, self._room_ok),
+        ):
+            fresh = {}
+            for entity, duration, rows in self._groups[kind]:
+                eid = ids[entity]
+                if self._seen.get((kind, eid)) == masks.get(eid, 0):
+                    continue
+                raw = np.frombuffer(starts(eid, duration).to_bytes(nbytes, "little"), dtype=np.uint8)
+                bits = np.unpackbits(raw, bitorder="little")[:avail.num_slots].astype(bool)
+                ok[rows] = bits[table.start[rows]]
+                fresh[(kind, eid)] = masks.get(eid, 0)
+            self._seen.update(fresh)
+
+    def _set_domains(self, avail: CompiledAvailability, sessions: list[Session]) -> tuple[int, list[str]]:
+        """
+        Fix unavailable and inactive options to 0 and locked placements to 1;
+        only variables whose domain changes are written. Returns (changed
+        count, reasons the request is infeasible).
+        """
+        self._refresh_availability(avail)
+        table = self.handle.table
+        active = np.asarray(self.active, dtype=bool)
+        hi = (self._fac_ok & self._room_ok & active[table.session]).astype(np.int8)
+        lo = np.zeros(len(table), dtype=np.int8)
+
+        reasons = []
+        open_rows = np.concatenate([[0], np.cumsum(hi, dtype=np.int64)])
+        per_session = open_rows[table.offsets[1:]] - open_rows[table.offsets[:-1]]
+        for i in np.flatnonzero((per_session == 0) & active).tolist():
+            sess = table.sessions[i]
+            reason = f"No feasible (faculty, room, slot) for {sess.course_code}"
+            if reason not in reasons:
+                reasons.append(reason)
+
+        for p in match_assignments(sessions, self.req.locked_assignments, self.slots).values():
+            lit = self.handle.placement_literal(self.model, p)
+            row = None if lit is None else lit.index - self.handle.first
+            if row is None or not hi[row]:
+                slot = self.slot_global_map[p.start_gi]
+                reasons.append(
+                    f"Locked {p.session.course_code} (section {p.session.section_id}) at {slot.day} slot "
+                    f"{slot.index} is no longer feasible for faculty {p.faculty_id} / room {p.room_id}"
+                )
+                continue
+            lo[row] = 1
+
+        changed = np.flatnonzero((lo != self.lo) | (hi != self.hi))
+        variables = self.model.proto.variables
+        for r in changed.tolist():
+            domain = variables[self.handle.first + r].domain
+            del domain[:]
+            domain.extend([int(lo[r]), int(hi[r])])
+        self.lo, self.hi = lo, hi
+        return len(changed), reasons
+
+    def _set_objective_and_hints(self) -> None:
+        """Hint the last solution and charge ``num_slots`` for leaving each of its still-open placements."""
+        keep = self.last[self.hi[self.last] == 1] if len(self.last) else self.last
+        objective = self.model.proto.objective
+        start = self.handle.table.start
+        penalty = len(self.slots)
+        for r in self._keep.tolist():
+            objective.coeffs[r] = int(start[r])
+        for r in keep.tolist():
+            objective.coeffs[r] = int(start[r]) - penalty
+        objective.offset = float(penalty * len(keep))
+        self._keep = keep
+
+        hint = self.model.proto.solution_hint
+        hint.Clear()
+        hint.vars.extend((keep + self.handle.first).tolist())
+        hint.values.extend([1] * len(keep))
+
+    def _rows_of(self, records) -> np.ndarray:
+        """Option rows of previous assignments, for the first hint."""
+        rows = []
+        for p in match_assignments(self.handle.sessions, records, self.slots).values():
+            lit = self.handle.placement_literal(self.model, p)
+            if lit is not None:
+                rows.append(lit.index - self.handle.first)
+        return np.asarray(sorted(rows), dtype=np.int64)
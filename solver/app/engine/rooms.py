@@ -0,0 +1,191 @@
+"""Deferred room assignment: the model picks times and faculty, rooms are matched afterwards.
+
+With ``room_assignment="deferred"`` every room type is modelled as one
+room id (its first room) standing for all rooms of the type, so options
+no longer multiply by the rooms of a type. Per (type, slot) the model
+only bounds how many sessions may run, by the rooms of the type that are
+available then and large enough for each session size. After the solve
+each start slot's sessions are matched to free rooms (augmenting paths,
+smallest fitting room first); a type whose sessions do not all match is
+re-assigned by a small CP-SAT model over rooms only, times fixed.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from ..models import SolveRequest
+from ..domain.types import Placement
+from ..domain.availability import CompiledAvailability
+from .options import group_rows, occupancy
+from .symmetry import RoomClasses
+
+REPAIR_SECONDS = 2.0
+
+
+@dataclass
+class RoomMatch:
+    placements: list[Placement]
+    repaired: int = 0  # sessions of room types that needed the repair model
+    unmatched: int = 0  # sessions left on their type's representative room
+
+
+def type_classes(req: SolveRequest) -> RoomClasses:
+    """Every room grouped with the others of its type; the first room of a type represents it."""
+    rep_of: dict[str, str] = {}
+    members: dict[str, list[str]] = {}
+    by_type: dict[str, str] = {}
+    for room in req.rooms:
+        rep = by_type.setdefault(room.type, room.id)
+        rep_of[room.id] = rep
+        members.setdefault(rep, []).append(room.id)
+    return RoomClasses(rep_of, members)
+
+
+def add_type_capacity(
+    model: cp_model.CpModel,
+    handle,
+    req: SolveRequest,
+    avail: CompiledAvailability,
+    classes: RoomClasses,
+    students: dict[str, int],
+) -> int:
+    """
+    For every room type, slot and session size ``c``: sessions of at least
+    ``c`` students at the slot fit in the rooms of the type seating ``c``
+    and available then. Only bounds tighter than the type's room count are
+    added (the boolean engine already enforces that one). Returns how many.
+    """
+    capacity = {r.id: r.capacity for r in req.rooms}
+    table = handle.table
+    row, slot = occupancy(table)
+    need = np.asarray([students[s.id] for s in table.sessions], dtype=np.int64)[table.session[row]]
+    added = 0
+    for rep, members in classes.members.items():
+        of_type = table.room[row] == table.index.rooms.index[rep]
+        for c in np.unique(need[of_type]).tolist():
+            fitting = [avail.rooms[m] for m in members if capacity[m] >= c]
+            selected = of_type & (need >= c)
+            keys, groups = group_rows(slot[selected], row[selected])
+            for gi, rows in zip(keys.tolist(), groups):
+                bound = sum(mask >> gi & 1 for mask in fitting)
+                if bound < len(members) and len(rows) > bound:
+                    linear = model.proto.constraints.add().linear
+                    linear.vars.extend((rows + handle.first).tolist())
+                    linear.coeffs.extend([1] * len(rows))
+                    linear.domain.extend([cp_model.INT_MIN, bound])
+                    added += 1
+    return added
+
+
+def match_rooms(
+    placements: list[Placement],
+    room_options: dict[str, dict[str, int]],
+    capacity: dict[str, int],
+    preferred: dict[str, str] | None = None,
+) -> RoomMatch:
+    """
+    Replace type representatives with concrete rooms. ``room_options`` are
+    each session's rooms and their start masks from before the collapse,
+    so availability, size and pinned rooms are respected; a session's
+    ``preferred`` room (its previous one) is tried first.
+    """
+    preferred = preferred or {}
+    by_type: dict[str, list[int]] = {}
+    for i, p in enumerate(placements):
+        by_type.setdefault(p.room_id, []).append(i)
+
+    def allowed(i: int) -> list[str]:
+        p = placements[i]
+        rooms = [r for r, mask in room_options[p.session.id].items() if mask >> p.start_gi & 1]
+        rooms.sort(key=lambda r: (r != preferred.get(p.session.id), capacity[r]))
+        return rooms
+
+    result = list(placements)
+    match = RoomMatch(result)
+    for idxs in by_type.values():
+        rooms = _greedy(placements, idxs, allowed)
+        if None in rooms.values():
+            repaired = _repair(placements, idxs, allowed, rooms)
+            match.repaired += len(idxs)
+            if repaired is not None:
+                rooms = repaired
+        for i, rid in rooms.items():
+            if rid is None:
+                match.unmatched += 1
+            else:
+                result[i] = placements[i]._replace(room_id=rid)
+    return match
+
+
+def _run(p: Placement) -> int:
+    return ((1 << p.session.duration) - 1) << p.start_gi
+
+
+def _greedy(placements: list[Placement], idxs: list[int], allowed) -> dict[int, str | None]:
+    """Sessions with a single room first, then start slot by start slot, each slot a maximum matching."""
+    busy: dict[str, int] = {}
+    rooms: dict[int, str | None] = {}
+    options = {i: allowed(i) for i in idxs}
+    fixed = [i for i in idxs if len(options[i]) == 1]
+    by_start: dict[int, list[int]] = {}
+    for i in idxs:
+        if len(options[i]) != 1:
+            by_start.setdefault(placements[i].start_gi, []).append(i)
+    for batch in [[i] for i in fixed] + [by_start[gi] for gi in sorted(by_start)]:
+        adj = [[r for r in options[i] if not busy.get(r, 0) & _run(placements[i])] for i in batch]
+        for i, rid in zip(batch, _max_matching(adj)):
+            rooms[i] = rid
+            if rid is not None:
+                busy[rid] = busy.get(rid, 0) | _run(placements[i])
+    return rooms
+
+
+def _max_matching(adj: list[list[str]]) -> list[str | None]:
+    """Maximum bipartite matching of left vertices to rooms (Kuhn's augmenting paths, adjacency order first)."""
+    owner: dict[str, int] = {}
+
+    def augment(i: int, seen: set[str]) -> bool:
+        for r in adj[i]:
+            if r in seen:
+                continue
+            seen.add(r)
+            if r not in owner or augment(owner[r], seen):
+                owner[r] = i
+                return True
+        return False
+
+    for i in range(len(adj)):
+        augment(i, set())
+    result: list[str | None] = [None] * len(adj)
+    for r, i in owner.items():
+        result[i] = r
+    return result
+
+
+def _repair(
+    placements: list[Placement], idxs: list[int], allowed, hint: dict[int, str | None],
+) -> dict[int, str] | None:
+    """Rooms for all of one type's sessions at their solved times, or None if none exist in time."""
+    model = cp_model.CpModel()
+    choice: dict[int, dict[str, cp_model.IntVar]] = {}
+    by_slot: dict[tuple[str, int], list] = {}
+    for i in idxs:
+        p = placements[i]
+        choice[i] = {r: model.new_bool_var("") for r in allowed(i)}
+        model.add_exactly_one(choice[i].values())
+        for r, lit in choice[i].items():
+            if hint.get(i) == r:
+                model.add_hint(lit, True)
+            for gi in range(p.start_gi, p.start_gi + p.session.duration):
+                by_slot.setdefault((r, gi), []).append(lit)
+    for lits in by_slot.values():
+        if len(lits) > 1:
+            model.add_at_most_one(lits)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = REPAIR_SECONDS
+    if solver.solve(model) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return {i: next(r for r, lit in options.items() if solver.value(lit)) for i, options in choice.items()}
@@ -1,27 +1,108 @@
 """CP-SAT constraint solver for timetable generation."""
 
 from __future__ import annotations
+import logging
+import os
 import time
-from collections import defaultdict
+from typing import Callable
 from ortools.sat.python import cp_model
 
-from ..models import SolveRequest, SolveResponse, AssignmentResult, DiagnosticsPayload
-from ..domain.types import Session, Slot
+from ..models import (
+    SolveRequest, SolveResponse, AssignmentResult, AlternativeSolution, DiagnosticsPayload, SolutionEvent,
+    SolveStats,
+)
+from ..domain.types import Placement, Slot
 from ..domain.time_grid import build_time_grid, slots_per_day
 from ..domain.session_expander import expand_sessions
-from .feasibility import check_feasibility
+from ..domain.availability import compile_availability
+from ..domain.index import index_request
+from .feasibility import check_feasibility, max_slots_for
+from .alternatives import collect_alternatives, diff
+from .boolean import build_boolean_model
+from .explain import explain_infeasibility
+from .greedy import construct, follow_chains
+from .decompose import solve_decomposed
+from .interval import build_interval_model
+from .lns import improve
+from .pool import available_cores
+from .profiles import InstanceFeatures, resolve_profile, validate_options
+from .symmetry import assign_rooms, collapse_rooms, room_classes, symmetric_chains
+from .warm_start import in_neighborhood, match_assignments, pin, without_records
+from .verifier import verify
+from .reduction import ReductionReport, apply_bounds, count_options, propagate, students_per_session
+from .rooms import RoomMatch, add_type_capacity, match_rooms, type_classes
+from .progress import EventLike, ProgressCallback, SearchLog, cancel_watcher
+from ..metrics import PhaseTimer
+
+# With SOLVER_DEBUG set every solution is re-checked by the independent verifier
+DEBUG_VERIFY = bool(os.environ.get("SOLVER_DEBUG"))
+logger = logging.getLogger(__name__)
+
+
+def solve(
+    req: SolveRequest,
+    on_solution: Callable[[SolutionEvent], None] | None = None,
+    cancel: EventLike | None = None,
+    time_limit: float | None = None,
+    stability: bool = True,
+) -> SolveResponse:
+    """
+    Run the full pipeline for one request.
+
+    ``on_solution`` is called with a ``SolutionEvent`` for every improving
+    solution CP-SAT finds; setting ``cancel`` stops the search immediately.
+    With ``req.decompose`` independent components are solved in parallel and
+    ``on_solution`` is called once per solved component; with
+    ``req.improve_seconds`` the solution is then improved by large
+    neighborhood search (lns.py). With ``req.solutions`` above 1, further
+    timetables are drawn from the same model afterwards (alternatives.py).
+
+    CP-SAT parameters come from a profile chosen by model size (profiles.py),
+    overridden by ``req.solver`` and cut to fit ``req.deadline_seconds``.
+    ``time_limit`` caps the search time further. ``stability=False`` keeps
+    previous assignments as hints only, without penalising changes to them.
+
+    A greedy construction (greedy.py) runs on the reduced domains first: with
+    ``req.mode == "fast"`` it is the answer when it places every session,
+    otherwise it hints CP-SAT for the sessions without a previous placement.
+    """
+    problems = validate_options(req.solver)
+    if req.mode not in ("default", "fast"):
+        problems.append(f"Unknown mode '{req.mode}'; expected 'default' or 'fast'")
+    if req.room_assignment not in ("model", "deferred"):
+        problems.append(f"Unknown room_assignment '{req.room_assignment}'; expected 'model' or 'deferred'")
+    elif req.room_assignment == "deferred" and req.engine == "interval":
+        problems.append("room_assignment 'deferred' needs the boolean engine")
+    if problems:
+        return SolveResponse(status="FAILED", solve_time_ms=0, diagnostics=DiagnosticsPayload(reasons=problems))
+
+    if req.solutions > 1 and (req.improve_seconds > 0 or req.decompose or req.mode == "fast"):
+        # The pool is drawn from one model; the merged, improved or greedy result has none
+        res = solve(req.model_copy(update={"solutions": 1}), on_solution, cancel, time_limit, stability)
+        if res.diagnostics is not None:
+            res.diagnostics.reasons.append("Solution pool: not collected with decompose, improve_seconds or fast mode")
+        return res
+    if req.improve_seconds > 0:
+        first = solve(req.model_copy(update={"improve_seconds": 0.0}), on_solution, cancel, time_limit, stability)
+        budget = req.improve_seconds
+        if req.deadline_seconds is not None:
+            budget = min(budget, req.deadline_seconds - first.solve_time_ms / 1000)
+        return improve(req.model_copy(update={"improve_seconds": budget}), first, solve, cancel)
+    if req.decompose:
+        return solve_decomposed(req, solve, on_solution, cancel, time_limit)
 
-
-def solve(req: SolveRequest) -> SolveResponse:
     t0 = time.time()
+    timer = PhaseTimer()
 
     # 1. Build time grid
     slots = build_time_grid(req.time_config)
     by_day = slots_per_day(slots)
     num_slots = len(slots)
+    timer.lap("time_grid")
 
     # 2. Expand sessions
     sessions = expand_sessions(req)
+    timer.lap("expand_sessions")
 
     if not sessions:
         return SolveResponse(
@@ -29,16 +110,15 @@ def solve(req: SolveRequest) -> SolveResponse:
             diagnostics=DiagnosticsPayload(reasons=["No sessions to schedule"]),
         )
 
-    # 3. Lookups
-    faculty_avail = {f.id: f.availability for f in req.faculty}
-    room_avail = {r.id: r.availability for r in req.rooms}
+    # 3. Lookups. Faculty/room availability compiled to bitmasks over global
+    # slot indices (bit gi set = available at gi)
     slot_global_map = {s.global_index: s for s in slots}
-    day_slot_indices: dict[str, list[int]] = {}
-    for s in slots:
-        day_slot_indices.setdefault(s.day, []).append(s.global_index)
+    avail = compile_availability(req, slots)
+    timer.lap("availability")
 
     # 4. Feasibility check
-    reasons = check_feasibility(sessions, slots, faculty_avail, room_avail)
+    reasons = check_feasibility(req, sessions, avail)
+    timer.lap("feasibility")
     if reasons:
         return SolveResponse(
             status="INFEASIBLE",
@@ -46,53 +126,19 @@ def solve(req: SolveRequest) -> SolveResponse:
             diagnostics=DiagnosticsPayload(reasons=reasons),
         )
 
-    # 5. Build CP-SAT model using ALTERNATIVE decomposition
-    # Instead of pairwise booleans, use per-(resource, slot) at-most-one.
+    # 5. Build CP-SAT model. The default "boolean" engine (boolean.py) uses one
+    # literal per option with per-(resource, slot) at-most-one; the "interval"
+    # engine (interval.py) uses start variables with optional intervals and
+    # no-overlap constraints.
     model = cp_model.CpModel()
 
-    # --- Decision variables ---
-    # For each session, for each (faculty, room, start_slot) combination,
-    # create a boolean. Then exactly one must be true.
-    # This is the "element-based" formulation, much more efficient for CP-SAT.
-
-    # Pre-compute valid start slots per session
-    def valid_starts_for_session(sess: Session) -> list[int]:
-        starts = []
-        for day, day_gis in day_slot_indices.items():
-            sorted_gis = sorted(day_gis)
-            for i in range(len(sorted_gis) - sess.duration + 1):
-                if all(sorted_gis[i + d] == sorted_gis[i] + d for d in range(sess.duration)):
-                    starts.append(sorted_gis[i])
-        return starts
-
-    def valid_starts_for_faculty(sess: Session, fid: str, all_starts: list[int]) -> list[int]:
-        avail = faculty_avail.get(fid, {})
-        valid_gi = set()
-        for day, indices in avail.items():
-            if day in day_slot_indices:
-                for gi in day_slot_indices[day]:
-                    slot = slot_global_map[gi]
-                    if slot.index in indices:
-                        valid_gi.add(gi)
-        return [s for s in all_starts if all((s + d) in valid_gi for d in range(sess.duration))]
-
-    def valid_starts_for_room(sess: Session, rid: str, all_starts: list[int]) -> list[int]:
-        avail = room_avail.get(rid, {})
-        valid_gi = set()
-        for day, indices in avail.items():
-            if day in day_slot_indices:
-                for gi in day_slot_indices[day]:
-                    slot = slot_global_map[gi]
-                    if slot.index in indices:
-                        valid_gi.add(gi)
-        return [s for s in all_starts if all((s + d) in valid_gi for d in range(sess.duration))]
-
-    # Per-session: list of (bool_var, fac_id, room_id, start_gi)
-    session_options: dict[str, list[tuple]] = {}
+    # Per-session start candidates allowed by each faculty's / room's availability,
+    # as bitmasks over global slot indices (bit gi set = may start at gi)
+    fac_starts: dict[str, dict[str, int]] = {}
+    room_starts: dict[str, dict[str, int]] = {}
 
     for sess in sessions:
-        all_starts = valid_starts_for_session(sess)
-        if not all_starts:
+        if not avail.grid_starts(sess.duration):
             return SolveResponse(
                 status="INFEASIBLE",
                 solve_time_ms=int((time.time() - t0) * 1000),
@@ -101,17 +147,22 @@ def solve(req: SolveRequest) -> SolveResponse:
                 ),
             )
 
-        options = []
-        for fid in sess.qualified_faculty_ids:
-            fac_starts = valid_starts_for_faculty(sess, fid, all_starts)
-            for rid in sess.eligible_room_ids:
-                room_starts = valid_starts_for_room(sess, rid, all_starts)
-                both_starts = sorted(set(fac_starts) & set(room_starts))
-                for gi in both_starts:
-                    bv = model.new_bool_var(f"opt_{sess.id}_{fid}_{rid}_{gi}")
-                    options.append((bv, fid, rid, gi))
-
-        if not options:
+        fac_starts[sess.id] = {
+            fid: avail.faculty_starts(fid, sess.duration)
+            for fid in sess.qualified_faculty_ids
+        }
+        room_starts[sess.id] = {
+            rid: avail.room_starts(rid, sess.duration)
+            for rid in sess.eligible_room_ids
+        }
+
+        fac_union = 0
+        for mask in fac_starts[sess.id].values():
+            fac_union |= mask
+        room_union = 0
+        for mask in room_starts[sess.id].values():
+            room_union |= mask
+        if not fac_union & room_union:
             return SolveResponse(
                 status="INFEASIBLE",
                 solve_time_ms=int((time.time() - t0) * 1000),
@@ -120,142 +171,278 @@ def solve(req: SolveRequest) -> SolveResponse:
                 ),
             )
 
-        # Exactly one option chosen per session
-        model.add_exactly_one([o[0] for o in options])
-        session_options[sess.id] = options
-
-    # --- Resource no-overlap via at-most-one per (resource, global_slot) ---
-
-    # Build: for each (faculty_id, global_slot_index) → list of bool_vars
-    fac_slot_vars: dict[tuple[str, int], list] = defaultdict(list)
-    room_slot_vars: dict[tuple[str, int], list] = defaultdict(list)
-    batch_slot_vars: dict[tuple[str, int], list] = defaultdict(list)
+    # Domain reduction, part 1: capacity and max_hours bounds, applied before
+    # pinning so a previous placement in a room that is now too small is freed
+    timer.lap("domains")
+    reduction = ReductionReport(options_before=count_options(sessions, fac_starts, room_starts))
+    apply_bounds(req, sessions, fac_starts, room_starts, reduction)
+    if reduction.reasons:
+        return SolveResponse(
+            status="INFEASIBLE",
+            solve_time_ms=int((time.time() - t0) * 1000),
+            diagnostics=DiagnosticsPayload(reasons=reduction.reasons),
+        )
 
-    sess_map = {s.id: s for s in sessions}
+    # Lock-and-regenerate: locked sessions, and with a neighborhood every previous
+    # placement outside it, are pinned by pruning their options to one.
+    locked = match_assignments(sessions, req.locked_assignments, slots)
+    previous = match_assignments(
+        sessions, without_records(req.previous_assignments, req.locked_assignments), slots,
+        taken=set(locked),
+    )
+    frozen = dict(locked)
+    if req.neighborhood:
+        changed = set(req.neighborhood)
+        frozen.update({
+            sid: p for sid, p in previous.items()
+            if not in_neighborhood(p, changed, slot_global_map[p.start_gi].day)
+        })
+
+    for sid, placement in list(frozen.items()):
+        if pin(fac_starts, room_starts, placement):
+            continue
+        if sid in locked:
+            sess = placement.session
+            return SolveResponse(
+                status="INFEASIBLE",
+                solve_time_ms=int((time.time() - t0) * 1000),
+                diagnostics=DiagnosticsPayload(reasons=[
+                    f"Locked {sess.course_code} (section {sess.section_id}) at "
+                    f"{slot_global_map[placement.start_gi].day} slot "
+                    f"{slot_global_map[placement.start_gi].index} is no longer feasible "
+                    f"for faculty {placement.faculty_id} / room {placement.room_id}"
+                ]),
+            )
+        del frozen[sid]  # stale previous placement: leave the session free
+
+    # Domain reduction, part 2: propagate pinned and otherwise forced sessions
+    propagate(req, sessions, fac_starts, room_starts, reduction)
+    if reduction.reasons:
+        if req.explain_seconds > 0:
+            reduction.reasons += explain_infeasibility(
+                req, sessions, avail, slots, frozen, req.explain_seconds, locked=set(locked),
+            )
+        return SolveResponse(
+            status="INFEASIBLE",
+            solve_time_ms=int((time.time() - t0) * 1000),
+            diagnostics=DiagnosticsPayload(reasons=reduction.reasons),
+        )
+    reduction.options_after = count_options(sessions, fac_starts, room_starts)
+    timer.lap("reduction")
+
+    # Greedy construction over the reduced domains, concrete rooms
+    room_capacity = {r.id: r.capacity for r in req.rooms}
+    greedy = construct(
+        sessions, fac_starts, room_starts, room_capacity,
+        {f.id: max_slots_for(f.max_hours, req.time_config.slot_duration) for f in req.faculty},
+    )
+    timer.lap("greedy")
+    greedy_note = (
+        f"Greedy construction: {len(greedy.placements)} of {len(sessions)} sessions placed, "
+        f"{greedy.backtracks} backtracks"
+    )
+    if req.mode == "fast":
+        if greedy.complete:
+            return _greedy_response(
+                req, greedy.placements, slot_global_map, t0,
+                ["Fast mode: greedy timetable, not searched for a better one", greedy_note],
+            )
+        greedy_note += "; fast mode fell back to CP-SAT"
+
+    # Symmetry: interchangeable rooms are modelled as one room id with a
+    # capacity and assigned concretely after the solve. Deferred room
+    # assignment collapses every room of a type and matches rooms afterwards.
+    room_options = None
+    if req.room_assignment == "deferred":
+        room_options = {sid: dict(rooms) for sid, rooms in room_starts.items()}
+        classes = type_classes(req)
+    else:
+        classes = room_classes(req, avail, exclude={p.room_id for p in frozen.values()})
+    collapse_rooms(room_starts, classes)
+    timer.lap("domains")
 
-    for sess in sessions:
-        for (bv, fid, rid, start_gi) in session_options[sess.id]:
-            for d in range(sess.duration):
-                gi = start_gi + d
-                fac_slot_vars[(fid, gi)].append(bv)
-                room_slot_vars[(rid, gi)].append(bv)
-                # Batch conflict: sessions from same batch must not overlap
-                # UNLESS they are parallel lab groups from the same section
-                batch_slot_vars[(sess.batch_id, gi, sess.section_id, bool(sess.lab_group_id))].append(bv)
-
-    # Faculty: at most one session per slot per faculty
-    for (fid, gi), bvs in fac_slot_vars.items():
-        if len(bvs) > 1:
-            model.add_at_most_one(bvs)
-
-    # Room: at most one session per slot per room
-    for (rid, gi), bvs in room_slot_vars.items():
-        if len(bvs) > 1:
-            model.add_at_most_one(bvs)
-
-    # Batch: at most one session per slot per batch
-    # Collect all booleans for a (batch_id, gi) but allow parallel lab groups
-    batch_gi_vars: dict[tuple[str, int], list] = defaultdict(list)
-    batch_gi_lab_section: dict[tuple[str, int], dict[str, list]] = defaultdict(lambda: defaultdict(list))
+    if req.engine == "interval":
+        handle = build_interval_model(model, sessions, fac_starts, room_starts, classes.capacity, timer)
+    else:
+        handle = build_boolean_model(
+            model, sessions, fac_starts, room_starts, index_request(req), classes.capacity, timer,
+        )
+        if room_options is not None:
+            handle.counts["room_type_capacity"] = add_type_capacity(
+                model, handle, req, avail, classes, students_per_session(req, sessions),
+            )
 
-    for sess in sessions:
-        for (bv, fid, rid, start_gi) in session_options[sess.id]:
-            for d in range(sess.duration):
-                gi = start_gi + d
-                if sess.lab_group_id:
-                    # Lab groups from same section can overlap
-                    batch_gi_lab_section[(sess.batch_id, gi)][sess.section_id].append(bv)
-                else:
-                    batch_gi_vars[(sess.batch_id, gi)].append(bv)
-
-    # Non-lab sessions in same batch at same time: at most one
-    # Plus at most one non-lab + any lab section at same time
-    # Simplification: collect all per (batch, gi) and add at-most-one,
-    # but for lab groups from the SAME section, pick at most one representative
-    # Actually the simplest correct approach: for each (batch, gi),
-    # all non-lab booleans + one boolean per lab-section group must sum ≤ 1
-    # But lab groups from same section CAN run in parallel.
-    # So: non-lab sessions + (any lab group from each distinct section) ≤ 1 would be wrong
-    # since a batch has one lecture and one lab in different time slots.
-    #
-    # The correct constraint: within a batch, at any given slot,
-    # - at most one lecture can happen
-    # - lab groups from the SAME section can run simultaneously
-    # - a lecture and a lab cannot happen simultaneously
-    #
-    # Simplest: for each (batch, gi), sum of all options from non-lab sessions
-    # plus sum of (max over lab groups from each section) ≤ 1
-    # But max over lab groups is hard to express.
-    #
-    # Alternative: for each (batch, gi), create one "section active" bool per lab-section,
-    # that is true iff ANY lab group from that section is active at that slot.
-    # Then: all non-lab bools + all section-active bools ≤ 1.
-
-    for (bid, gi), non_lab_bvs in batch_gi_vars.items():
-        lab_sections = batch_gi_lab_section.get((bid, gi), {})
-        all_exclusive = list(non_lab_bvs)
-
-        for sec_id, lab_bvs in lab_sections.items():
-            # Create a "section active" bool
-            sec_active = model.new_bool_var(f"secact_{bid}_{gi}_{sec_id}")
-            # sec_active == 1 iff any lab_bv is 1
-            model.add_max_equality(sec_active, lab_bvs)
-            all_exclusive.append(sec_active)
-
-        if len(all_exclusive) > 1:
-            model.add_at_most_one(all_exclusive)
-
-    # Handle slots that only have lab sessions (no non-lab)
-    for (bid, gi), lab_secs in batch_gi_lab_section.items():
-        if (bid, gi) in batch_gi_vars:
-            continue  # already handled above
-        section_actives = []
-        for sec_id, lab_bvs in lab_secs.items():
-            sec_active = model.new_bool_var(f"secact2_{bid}_{gi}_{sec_id}")
-            model.add_max_equality(sec_active, lab_bvs)
-            section_actives.append(sec_active)
-        if len(section_actives) > 1:
-            model.add_at_most_one(section_actives)
-
-    # --- Objective: prefer earlier slots (compact schedules) ---
-    obj_terms = []
-    for sess in sessions:
-        for (bv, fid, rid, start_gi) in session_options[sess.id]:
-            obj_terms.append(start_gi * bv)
-    model.minimize(sum(obj_terms))
+    # Faculty weekly load: at most max_hours of teaching, in slots
+    for f in req.faculty:
+        cap = max_slots_for(f.max_hours, req.time_config.slot_duration)
+        possible = sum(s.duration for s in sessions if f.id in fac_starts[s.id])
+        if possible > cap:
+            model.add(handle.faculty_load(f.id) <= cap)
+
+    # Symmetry: repeated sessions with identical options start in id order
+    chains = symmetric_chains(sessions, fac_starts, room_starts, set(frozen) | set(previous))
+    for chain in chains:
+        for a, b in zip(chain, chain[1:]):
+            handle.add_start_order(model, a, b)
+
+    previous_rooms = {sid: p.room_id for sid, p in previous.items()}
+
+    def concrete(placements: list[Placement]) -> RoomMatch:
+        if room_options is None:
+            return RoomMatch(assign_rooms(placements, classes, previous_rooms))
+        return match_rooms(placements, room_options, room_capacity, previous_rooms)
+
+    def decode(values) -> list[Placement]:
+        return concrete(handle.decode(values)).placements
+
+    # Warm start: hint every free session's previous placement and (with
+    # ``stability``) penalise moving it, weighted so one kept assignment
+    # outweighs any slot shift.
+    keep_lits = []
+    for sid, placement in previous.items():
+        if sid in frozen:
+            continue
+        placement = placement._replace(room_id=classes.rep_of.get(placement.room_id, placement.room_id))
+        handle.hint(model, placement)
+        if not stability:
+            continue
+        lit = handle.placement_literal(model, placement)
+        if lit is not None:
+            keep_lits.append(lit)
+    # The greedy timetable hints every other session, re-dealt along the symmetry chains
+    for placement in follow_chains(greedy.placements, chains):
+        if placement.session.id not in previous and placement.session.id not in frozen:
+            handle.hint(model, placement._replace(room_id=classes.rep_of.get(placement.room_id, placement.room_id)))
+    if keep_lits:
+        model.minimize(handle.objective + num_slots * (len(keep_lits) - sum(keep_lits)))
+    else:
+        model.minimize(handle.objective)
+    timer.lap("constraints")
 
     # --- Solve ---
+    cores = available_cores()
+    features = InstanceFeatures(
+        sessions=len(sessions),
+        variables=len(model.proto.variables),
+        constraints=len(model.proto.constraints),
+        utilisation=sum(s.duration for s in sessions) / max(1, sum(bin(m).count("1") for m in avail.rooms.values())),
+        cores=cores,
+    )
+    remaining = None
+    if req.deadline_seconds is not None:
+        remaining = req.deadline_seconds - (time.time() - t0)
+    if time_limit is not None:
+        remaining = time_limit if remaining is None else min(remaining, time_limit)
+    profile = resolve_profile(features, req.solver, remaining)
+
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 5.0
-    solver.parameters.num_workers = 4
+    profile.apply(solver.parameters, cores)
+    # The search log is always produced (presolve time is read from it) but
+    # only reaches the "app.engine.search" logger, which is silent by default
     solver.parameters.log_search_progress = True
+    solver.parameters.log_to_stdout = False
+    search_log = SearchLog()
+    solver.log_callback = search_log
+
+    callback = None
+    if on_solution is not None:
+        callback = ProgressCallback(
+            decode,
+            lambda p: to_assignment(p, slot_global_map),
+            on_solution,
+            t0,
+        )
 
-    status = solver.solve(model)
+    t_search = time.time()
+    with cancel_watcher(solver, cancel):
+        status = solver.solve(model, callback)
     elapsed = int((time.time() - t0) * 1000)
-
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        assignments = []
-        for sess in sessions:
-            for (bv, fid, rid, start_gi) in session_options[sess.id]:
-                if solver.value(bv):
-                    start_slot = slot_global_map[start_gi]
-                    end_gi = start_gi + sess.duration - 1
-                    end_slot = slot_global_map[end_gi]
-                    assignments.append(AssignmentResult(
-                        section_id=sess.section_id,
-                        lab_group_id=sess.lab_group_id,
-                        faculty_id=fid,
-                        room_id=rid,
-                        batch_id=sess.batch_id,
-                        day=start_slot.day,
-                        slot_index=start_slot.index,
-                        duration=sess.duration,
-                        course_code=sess.course_code,
-                        course_name=sess.course_name,
-                        start_time=start_slot.start_time,
-                        end_time=end_slot.end_time,
-                    ))
-                    break
+    cancelled = cancel is not None and cancel.is_set()
+
+    timer.lap("search")
+
+    cp_ms = int((time.time() - t_search) * 1000)
+    presolve_ms = min(cp_ms, int((search_log.presolve_seconds or 0) * 1000))
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    stats = SolveStats(
+        solver_status=solver.status_name(status),
+        build_time_ms=int((t_search - t0) * 1000),
+        presolve_time_ms=presolve_ms,
+        search_time_ms=cp_ms - presolve_ms,
+        num_variables=len(model.proto.variables),
+        num_constraints=len(model.proto.constraints),
+        objective=solver.objective_value if found else None,
+        best_bound=solver.best_objective_bound if found else None,
+        gap=(
+            abs(solver.objective_value - solver.best_objective_bound) / max(1.0, abs(solver.objective_value))
+            if found else None
+        ),
+        branches=solver.num_branches,
+        conflicts=solver.num_conflicts,
+        sessions=len(sessions),
+        phases=timer.phases,
+        model_counts=handle.counts,
+        profile=profile.name,
+        num_workers=solver.parameters.num_workers,
+        max_time_seconds=round(profile.max_time_seconds, 3),
+        options_before_reduction=reduction.options_before,
+        options_removed=reduction.removed,
+    )
+
+    if found:
+        matched = concrete(handle.decode(solver))
+        if matched.unmatched:
+            # Times the room types cannot host after all: solve again with rooms in the model
+            res = solve(req.model_copy(update={"room_assignment": "model"}), on_solution, cancel, time_limit, stability)
+            if res.diagnostics is not None:
+                res.diagnostics.reasons.append(
+                    f"Rooms: deferred matching left {matched.unmatched} sessions without a room; "
+                    f"solved again with rooms in the model"
+                )
+            return res
+        placements = matched.placements
+        assignments = [to_assignment(p, slot_global_map) for p in placements]
+        timer.lap("extraction")
+        alternatives = []
+        if req.solutions > 1 and not cancelled:
+            budget = profile.max_time_seconds
+            if remaining is not None:
+                budget = min(budget, remaining - (time.time() - t_search))
+            best = {p.session.id: p[1:] for p in placements}
+            for objective, raw in collect_alternatives(
+                model, handle, solver, req.solutions - 1, max(1, req.min_distance), budget, cancel,
+            ):
+                other_match = concrete(raw)
+                if other_match.unmatched:
+                    continue
+                other = other_match.placements
+                other_assignments = [to_assignment(p, slot_global_map) for p in other]
+                _, added, removed = diff(assignments, other_assignments)
+                alternatives.append(AlternativeSolution(
+                    objective=objective,
+                    distance=sum(1 for p in other if best[p.session.id] != p[1:]),
+                    assignments=other_assignments,
+                    added=added,
+                    removed=removed,
+                ))
+            timer.lap("alternatives")
+            elapsed = int((time.time() - t0) * 1000)
+        violations = verify(req, assignments) if DEBUG_VERIFY else []
+        for v in violations:
+            logger.error("Solver output violates %s: %s", v.kind, v.message)
+        if DEBUG_VERIFY:
+            timer.lap("verification")
+        stats.phases = dict(timer.phases)
+        warm_start_notes = []
+        if previous or locked:
+            changed_count = sum(
+                1 for p in placements
+                if p.session.id in previous and previous[p.session.id][1:] != p[1:]
+            )
+            warm_start_notes.append(
+                f"Warm start: {len(locked)} locked, {len(frozen) - len(locked)} fixed outside "
+                f"neighborhood, {changed_count} of {len(previous)} previous assignments changed"
+            )
 
         return SolveResponse(
             status="SUCCESS",
@@ -269,17 +456,117 @@ def solve(req: SolveRequest) -> SolveResponse:
                     f"Solver status: {'OPTIMAL' if status == cp_model.OPTIMAL else 'FEASIBLE'}",
                     f"Total assignments: {len(assignments)}",
                     f"Solve time: {elapsed}ms",
-                ],
+                    f"Model size ({req.engine}): {len(model.proto.variables)} variables, "
+                    f"{len(model.proto.constraints)} constraints",
+                    f"Domain reduction: removed {reduction.removed} of {reduction.options_before} options "
+                    f"in {reduction.rounds} rounds",
+                    greedy_note,
+                ] + warm_start_notes
+                + ([f"Verifier: {len(violations)} hard-constraint violations"] if DEBUG_VERIFY else [])
+                + (["Search cancelled; returning best solution so far"] if cancelled else [])
+                + (
+                    [f"Rooms: matched after the solve ({matched.repaired} sessions through the repair model)"]
+                    if room_options is not None else []
+                )
+                + (
+                    [
+                        f"Solution pool: {len(alternatives)} of {req.solutions - 1} alternatives found, "
+                        f"each at least {max(1, req.min_distance)} placements from the others"
+                    ]
+                    if req.solutions > 1 else []
+                ),
+                stats=stats,
+                violations=violations,
             ),
+            alternatives=alternatives,
+            cancelled=cancelled,
+        )
+    elif greedy.complete and status == cp_model.UNKNOWN:
+        # CP-SAT found nothing in time (or was cancelled); the greedy timetable is still a valid one
+        stats.phases = dict(timer.phases)
+        return _greedy_response(
+            req, greedy.placements, slot_global_map, t0,
+            ["Solver status: UNKNOWN; returning the greedy timetable", greedy_note]
+            + (["Search cancelled; returning best solution so far"] if cancelled else []),
+            stats,
+            cancelled,
+        )
+    elif cancelled:
+        return SolveResponse(
+            status="FAILED",
+            solve_time_ms=elapsed,
+            diagnostics=DiagnosticsPayload(
+                reasons=["Search cancelled before a solution was found"], stats=stats,
+            ),
+            cancelled=True,
         )
     else:
+        explanation = []
+        if req.explain_seconds > 0:
+            explanation = explain_infeasibility(
+                req, sessions, avail, slots, frozen, req.explain_seconds, locked=set(locked),
+            )
+            timer.lap("explain")
+            stats.phases = dict(timer.phases)
         return SolveResponse(
             status="INFEASIBLE",
-            solve_time_ms=elapsed,
+            solve_time_ms=int((time.time() - t0) * 1000),
             diagnostics=DiagnosticsPayload(
                 reasons=[
                     f"Solver status: {solver.status_name(status)}",
                     "The problem may be over-constrained. Try adding more rooms or faculty.",
-                ],
+                ] + explanation,
+                stats=stats,
             ),
         )
+
+
+def _greedy_response(
+    req: SolveRequest,
+    placements: list[Placement],
+    slot_global_map: dict[int, Slot],
+    t0: float,
+    reasons: list[str],
+    stats: SolveStats | None = None,
+    cancelled: bool = False,
+) -> SolveResponse:
+    """A greedy timetable (greedy.py) as the answer; ``reasons[0]`` says why."""
+    assignments = [to_assignment(p, slot_global_map) for p in placements]
+    violations = verify(req, assignments) if DEBUG_VERIFY else []
+    for v in violations:
+        logger.error("Greedy output violates %s: %s", v.kind, v.message)
+    elapsed = int((time.time() - t0) * 1000)
+    return SolveResponse(
+        status="SUCCESS",
+        solve_time_ms=elapsed,
+        assignments=assignments,
+        diagnostics=DiagnosticsPayload(
+            reasons=[reasons[0], f"Total assignments: {len(assignments)}", f"Solve time: {elapsed}ms"]
+            + reasons[1:]
+            + ([f"Verifier: {len(violations)} hard-constraint violations"] if DEBUG_VERIFY else []),
+            stats=stats,
+            violations=violations,
+        ),
+        cancelled=cancelled,
+    )
+
+
+def to_assignment(placement: Placement, slot_global_map: dict[int, Slot]) -> AssignmentResult:
+    sess, fid, rid, start_gi = placement
+    start_slot = slot_global_map[start_gi]
+    end_slot = slot_global_map[start_gi + sess.duration - 1]
+    # Built from already-typed solver data, so pydantic validation is skipped
+    return AssignmentResult.model_construct(
+        section_id=sess.section_id,
+        lab_group_id=sess.lab_group_id,
+        faculty_id=fid,
+        room_id=rid,
+        batch_id=sess.batch_id,
+        day=start_slot.day,
+        slot_index=start_slot.index,
+        duration=sess.duration,
+        course_code=sess.course_code,
+        course_name=sess.course_name,
+        start_time=start_slot.start_time,
+        end_time=end_slot.end_time,
+    )
@@ -0,0 +1,121 @@
+"""Symmetry breaking for interchangeable rooms and repeated sessions."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+
+from ..models import SolveRequest
+from ..domain.types import Placement, Session
+from ..domain.availability import CompiledAvailability
+
+
+@dataclass
+class RoomClasses:
+    """Rooms grouped by (type, capacity, availability); each class is modelled by its first room."""
+    rep_of: dict[str, str]
+    members: dict[str, list[str]]
+
+    @property
+    def capacity(self) -> dict[str, int]:
+        return {rep: len(rooms) for rep, rooms in self.members.items()}
+
+
+def room_classes(req: SolveRequest, avail: CompiledAvailability, exclude: set[str]) -> RoomClasses:
+    """
+    Group fully interchangeable rooms. Rooms in ``exclude`` (e.g. targets of
+    locked assignments) always form their own class so they can be addressed
+    individually.
+    """
+    rep_of: dict[str, str] = {}
+    members: dict[str, list[str]] = {}
+    by_key: dict[tuple, str] = {}
+    for room in req.rooms:
+        key = (room.type, room.capacity, avail.rooms[room.id]) if room.id not in exclude else (room.id,)
+        rep = by_key.setdefault(key, room.id)
+        rep_of[room.id] = rep
+        members.setdefault(rep, []).append(room.id)
+    return RoomClasses(rep_of, members)
+
+
+def collapse_rooms(room_starts: dict[str, dict[str, int]], classes: RoomClasses) -> None:
+    """Keep only each class representative in every session's room options (in place)."""
+    for sid, rooms in room_starts.items():
+        collapsed: dict[str, int] = {}
+        for rid, mask in rooms.items():
+            rep = classes.rep_of[rid]
+            collapsed[rep] = collapsed.get(rep, 0) | mask
+        room_starts[sid] = collapsed
+
+
+def assign_rooms(
+    placements: list[Placement],
+    classes: RoomClasses,
+    preferred: dict[str, str] | None = None,
+) -> list[Placement]:
+    """
+    Replace class representatives with concrete rooms. Within a class the
+    model only bounds how many sessions share a slot, so sessions are taken
+    in start order and each gets a member free at its start - a greedy
+    interval colouring that never needs more rooms than that bound. A
+    session's ``preferred`` room (its previous one) is used when free.
+    """
+    preferred = preferred or {}
+    by_class: dict[str, list[int]] = {}
+    for i, p in enumerate(placements):
+        if len(classes.members.get(p.room_id, ())) > 1:
+            by_class.setdefault(p.room_id, []).append(i)
+
+    result = list(placements)
+    for rep, idxs in by_class.items():
+        free_at = {rid: -1 for rid in classes.members[rep]}
+        for i in sorted(idxs, key=lambda i: placements[i].start_gi):
+            p = placements[i]
+            rid = preferred.get(p.session.id)
+            if free_at.get(rid, p.start_gi + 1) > p.start_gi:
+                rid = next(r for r, t in free_at.items() if t <= p.start_gi)
+            free_at[rid] = p.start_gi + p.session.duration
+            result[i] = p._replace(room_id=rid)
+    return result
+
+
+def _signature(sess: Session, fac_starts, room_starts) -> tuple:
+    return (
+        sess.course_id, sess.duration,
+        tuple(sorted(fac_starts[sess.id].items())),
+        tuple(sorted(room_starts[sess.id].items())),
+    )
+
+
+def symmetric_chains(
+    sessions: list[Session],
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    distinguished: set[str],
+) -> list[list[str]]:
+    """
+    Chains of session ids whose start slots may be required to be
+    non-decreasing without losing any solution: repeated sessions of one
+    section with identical options. Lab groups of a section are
+    interchangeable as whole groups, so with one session per group the
+    groups chain together; with several, two groups may run their sessions
+    side by side, which no order across groups admits, so each group's
+    sessions chain on their own.
+
+    Sessions in ``distinguished`` (pinned or carrying a previous placement)
+    are left out, since swapping them would change the answer.
+    """
+    groups: dict[tuple, list[Session]] = {}
+    for sess in sessions:
+        if sess.id in distinguished:
+            continue
+        key = (sess.batch_id, sess.section_id, _signature(sess, fac_starts, room_starts))
+        groups.setdefault(key, []).append(sess)
+    chains = []
+    for members in groups.values():
+        by_lab_group: dict[str | None, list[str]] = {}
+        for sess in members:
+            by_lab_group.setdefault(sess.lab_group_id, []).append(sess.id)
+        if len(by_lab_group) > 1 and any(len(ids) > 1 for ids in by_lab_group.values()):
+            chains += by_lab_group.values()
+        else:
+            chains.append([sess.id for sess in members])
+    return [chain for chain in chains if len(chain) > 1]
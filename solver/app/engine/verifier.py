@@ -0,0 +1,349 @@
+"""Independent hard-constraint check of a timetable, with incremental move / swap validation.
+
+Checks exactly what the solver guarantees, without building a model:
+references (batch, section, lab group, faculty, room, slot), session
+duration and contiguity on the time grid, faculty qualification, room type
+and capacity, faculty / room availability, faculty / room / batch overlaps
+(lab groups of one section may run in parallel), ``max_hours`` and that
+every expanded session is scheduled exactly once.
+"""
+
+from __future__ import annotations
+from collections import Counter, defaultdict
+from typing import NamedTuple
+
+from ..models import SolveRequest, AssignmentResult, EditPayload, Violation
+from ..domain.time_grid import build_time_grid
+from ..domain.session_expander import expand_sessions
+from ..domain.availability import compile_availability
+from .feasibility import max_slots_for
+
+
+class _Entry(NamedTuple):
+    """The fields of an assignment the constraints depend on."""
+    batch_id: str
+    section_id: str
+    lab_group_id: str | None
+    faculty_id: str
+    room_id: str
+    day: str
+    slot_index: int
+    duration: int
+
+
+def _entry(a: AssignmentResult) -> _Entry:
+    return _Entry(a.batch_id, a.section_id, a.lab_group_id, a.faculty_id, a.room_id, a.day, a.slot_index, a.duration)
+
+
+def _batch_conflict(a: _Entry, b: _Entry) -> bool:
+    """Same-batch sessions overlap unless they are different lab groups of one section."""
+    return not (a.lab_group_id and b.lab_group_id and a.section_id == b.section_id and a.lab_group_id != b.lab_group_id)
+
+
+def verify(req: SolveRequest, assignments: list[AssignmentResult]) -> list[Violation]:
+    """Every hard-constraint violation in ``assignments``; empty means the timetable is valid."""
+    return TimetableIndex(req, assignments).violations()
+
+
+class TimetableIndex:
+    """
+    Slot-indexed occupancy of a timetable: (faculty, slot), (room, slot) and
+    (batch, slot) -> assignment indices, plus weekly faculty load. Building
+    it and a full check are linear in the assigned slots; a move or swap is
+    checked by looking only at the slots it touches.
+    """
+
+    def __init__(self, req: SolveRequest, assignments: list[AssignmentResult]):
+        self.req = req
+        slots = build_time_grid(req.time_config)
+        self._slots = {(s.day, s.index): s for s in slots}
+        self._by_gi = {s.global_index: s for s in slots}
+        self._avail = compile_availability(req, slots)
+        self._faculty = {f.id: f for f in req.faculty}
+        self._rooms = {r.id: r for r in req.rooms}
+        self._batches = {b.id: b for b in req.batches}
+        self._sections = {sec.id: (c, sec) for c in req.courses for sec in c.sections}
+        self._cap = {f.id: max_slots_for(f.max_hours, req.time_config.slot_duration) for f in req.faculty}
+
+        self.assignments = list(assignments)
+        self.entries = [_entry(a) for a in assignments]
+        self._fac: dict[tuple[str, int], list[int]] = defaultdict(list)
+        self._room: dict[tuple[str, int], list[int]] = defaultdict(list)
+        self._batch: dict[tuple[str, int], list[int]] = defaultdict(list)
+        self._load: Counter[str] = Counter()
+        for i in range(len(self.entries)):
+            self._add(i)
+
+    # --- full check ---
+
+    def violations(self) -> list[Violation]:
+        found = [v for i, e in enumerate(self.entries) for v in self._local(i, e)]
+        seen: set[tuple] = set()
+        for kind, table in (("faculty_clash", self._fac), ("room_clash", self._room), ("batch_clash", self._batch)):
+            for key, idxs in table.items():
+                v = self._clash(kind, key, idxs)
+                if v is not None and (kind, key[0], tuple(v.assignments)) not in seen:
+                    seen.add((kind, key[0], tuple(v.assignments)))
+                    found.append(v)
+        found += self._overloads(self._load)
+        found += self._coverage()
+        return found
+
+    # --- incremental checks ---
+
+    def check_move(
+        self,
+        index: int,
+        day: str | None = None,
+        slot_index: int | None = None,
+        faculty_id: str | None = None,
+        room_id: str | None = None,
+    ) -> list[Violation]:
+        """Violations involving assignment ``index`` if it were moved; unset arguments keep current values."""
+        return self._check({index: self._moved(index, day, slot_index, faculty_id, room_id)})
+
+    def check_swap(self, index: int, other: int) -> list[Violation]:
+        """Violations involving the two assignments if their day and slot were exchanged."""
+        return self._check(self._swapped(index, other))
+
+    def check_edit(self, edit: EditPayload) -> list[Violation]:
+        problem = self._edit_problem(edit)
+        if problem:
+            return [Violation(kind="reference", message=problem)]
+        if edit.kind == "swap":
+            return self.check_swap(edit.index, edit.other_index)
+        return self.check_move(edit.index, edit.day, edit.slot_index, edit.faculty_id, edit.room_id)
+
+    def apply_move(self, index: int, day=None, slot_index=None, faculty_id=None, room_id=None) -> None:
+        self._apply({index: self._moved(index, day, slot_index, faculty_id, room_id)})
+
+    def apply_swap(self, index: int, other: int) -> None:
+        self._apply(self._swapped(index, other))
+
+    # --- internals ---
+
+    def _moved(self, index, day, slot_index, faculty_id, room_id) -> _Entry:
+        updates = {"day": day, "slot_index": slot_index, "faculty_id": faculty_id, "room_id": room_id}
+        return self.entries[index]._replace(**{k: v for k, v in updates.items() if v is not None})
+
+    def _swapped(self, index: int, other: int) -> dict[int, _Entry]:
+        a, b = self.entries[index], self.entries[other]
+        return {
+            index: a._replace(day=b.day, slot_index=b.slot_index),
+            other: b._replace(day=a.day, slot_index=a.slot_index),
+        }
+
+    def _edit_problem(self, edit: EditPayload) -> str | None:
+        n = len(self.entries)
+        if edit.kind not in ("move", "swap"):
+            return f"Unknown edit kind '{edit.kind}'; expected 'move' or 'swap'"
+        if not 0 <= edit.index < n:
+            return f"Edit index {edit.index} is out of range (0..{n - 1})"
+        if edit.kind == "swap" and (edit.other_index is None or not 0 <= edit.other_index < n):
+            return f"Swap needs other_index in range (0..{n - 1})"
+        return None
+
+    def _check(self, changes: dict[int, _Entry]) -> list[Violation]:
+        """Apply ``changes`` tentatively, collect violations on the slots they touch, then undo them."""
+        previous = {i: self.entries[i] for i in changes}
+        self._replace(changes)
+        try:
+            found = [v for i, e in changes.items() for v in self._local(i, e)]
+            seen: set[tuple] = set()
+            for i, e in changes.items():
+                for gi in self._gis(e) or ():
+                    for kind, table, key in (
+                        ("faculty_clash", self._fac, (e.faculty_id, gi)),
+                        ("room_clash", self._room, (e.room_id, gi)),
+                        ("batch_clash", self._batch, (e.batch_id, gi)),
+                    ):
+                        v = self._clash(kind, key, table[key])
+                        if v is not None and (kind, tuple(v.assignments)) not in seen:
+                            seen.add((kind, tuple(v.assignments)))
+                            found.append(v)
+            touched = {e.faculty_id for e in changes.values()}
+            found += self._overloads({f: self._load[f] for f in touched})
+            return found
+        finally:
+            self._replace(previous)
+
+    def _apply(self, changes: dict[int, _Entry]) -> None:
+        self._replace(changes)
+        for i, e in changes.items():
+            update = {"day": e.day, "slot_index": e.slot_index, "faculty_id": e.faculty_id, "room_id": e.room_id}
+            gis = self._gis(e)
+            if gis:
+                update["start_time"] = self._by_gi[gis[0]].start_time
+                update["end_time"] = self._by_gi[gis[-1]].end_time
+            self.assignments[i] = self.assignments[i].model_copy(update=update)
+
+    def _replace(self, changes: dict[int, _Entry]) -> None:
+        for i, e in changes.items():
+            self._remove(i)
+            self.entries[i] = e
+            self._add(i)
+
+    def _gis(self, e: _Entry) -> list[int] | None:
+        """Global slots the assignment covers, or None if it does not fit on its day."""
+        gis = []
+        for k in range(e.duration):
+            slot = self._slots.get((e.day, e.slot_index + k))
+            if slot is None:
+                return None
+            gis.append(slot.global_index)
+        return gis
+
+    def _add(self, i: int) -> None:
+        e = self.entries[i]
+        for gi in self._gis(e) or ():
+            self._fac[(e.faculty_id, gi)].append(i)
+            self._room[(e.room_id, gi)].append(i)
+            self._batch[(e.batch_id, gi)].append(i)
+        self._load[e.faculty_id] += e.duration
+
+    def _remove(self, i: int) -> None:
+        e = self.entries[i]
+        for gi in self._gis(e) or ():
+            self._fac[(e.faculty_id, gi)].remove(i)
+            self._room[(e.room_id, gi)].remove(i)
+            self._batch[(e.batch_id, gi)].remove(i)
+        self._load[e.faculty_id] -= e.duration
+
+    def _describe(self, i: int, e: _Entry) -> str:
+        found = self._sections.get(e.section_id)
+        if found is None:
+            return f"#{i} (section {e.section_id})"
+        course, section = found
+        group = next((g.name for g in section.lab_groups if g.id == e.lab_group_id), None)
+        return f"#{i} {course.code} section {section.name}" + (f" {group}" if group else "")
+
+    def _local(self, i: int, e: _Entry) -> list[Violation]:
+        """Checks that depend on one assignment alone."""
+        found: list[Violation] = []
+
+        def add(kind: str, message: str) -> None:
+            found.append(Violation(kind=kind, message=message, assignments=[i]))
+
+        what = self._describe(i, e)
+        batch = self._batches.get(e.batch_id)
+        if batch is None:
+            add("reference", f"{what}: unknown batch {e.batch_id}")
+        section_found = self._sections.get(e.section_id)
+        if section_found is None:
+            add("reference", f"{what}: unknown section {e.section_id}")
+            return found
+        course, section = section_found
+        if batch is not None and e.section_id not in batch.section_ids:
+            add("reference", f"{what}: batch {batch.name} is not enrolled in this section")
+        group_ids = {g.id for g in section.lab_groups}
+        if course.type == "LAB" and group_ids:
+            if e.lab_group_id not in group_ids:
+                add("reference", f"{what}: lab sessions must name one of the section's lab groups")
+        elif e.lab_group_id is not None:
+            add("reference", f"{what}: section has no lab group {e.lab_group_id}")
+
+        fac = self._faculty.get(e.faculty_id)
+        if fac is None:
+            add("reference", f"{what}: unknown faculty {e.faculty_id}")
+        elif course.id not in fac.qualified_course_ids:
+            add("qualification", f"{what}: {fac.name} is not qualified to teach {course.code}")
+
+        room = self._rooms.get(e.room_id)
+        if room is None:
+            add("reference", f"{what}: unknown room {e.room_id}")
+        else:
+            needed_type = "LAB" if course.type == "LAB" else "LECTURE"
+            if room.type != needed_type:
+                add("room_type", f"{what}: room {room.name} is {room.type}, needs {needed_type}")
+            if batch is not None:
+                students = batch.student_count
+                if e.lab_group_id and group_ids:
+                    students = -(-students // len(group_ids))
+                if room.capacity < students:
+                    add("capacity", f"{what}: room {room.name} seats {room.capacity}, needs {students}")
+
+        expected = max(1, course.hours_per_week // course.sessions_per_week)
+        if e.duration != expected:
+            add("duration", f"{what}: lasts {e.duration} slots, {course.code} sessions last {expected}")
+
+        if (e.day, e.slot_index) not in self._slots:
+            add("reference", f"{what}: no slot {e.slot_index} on {e.day}")
+            return found
+        gis = self._gis(e)
+        if gis is None:
+            add("duration", f"{what}: {e.duration} slots from {e.day} slot {e.slot_index} run past the end of the day")
+            return found
+
+        mask = 0
+        for gi in gis:
+            mask |= 1 << gi
+        for label, entity, avail in (
+            ("faculty", fac, self._avail.faculty), ("room", room, self._avail.rooms),
+        ):
+            if entity is None:
+                continue
+            missing = mask & ~avail.get(entity.id, 0)
+            if missing:
+                idx = [self._by_gi[gi].index for gi in gis if missing >> gi & 1]
+                add("availability", f"{what}: {label} {entity.name} is unavailable on {e.day} slot(s) {idx}")
+        return found
+
+    def _clash(self, kind: str, key: tuple[str, int], idxs: list[int]) -> Violation | None:
+        if len(idxs) < 2:
+            return None
+        if kind == "batch_clash":
+            pairs = [
+                (i, j) for a, i in enumerate(idxs) for j in idxs[a + 1:]
+                if _batch_conflict(self.entries[i], self.entries[j])
+            ]
+            involved = sorted({k for pair in pairs for k in pair})
+            if not involved:
+                return None
+        else:
+            involved = sorted(idxs)
+        resource, gi = key
+        slot = self._by_gi[gi]
+        entities = {"faculty_clash": self._faculty, "room_clash": self._rooms, "batch_clash": self._batches}[kind]
+        name = entities[resource].name if resource in entities else resource
+        return Violation(
+            kind=kind,
+            message=(
+                f"{name} is double-booked on {slot.day} slot {slot.index}: "
+                + ", ".join(self._describe(i, self.entries[i]) for i in involved)
+            ),
+            assignments=involved,
+        )
+
+    def _overloads(self, load: dict[str, int]) -> list[Violation]:
+        found = []
+        for fid, slots in load.items():
+            cap = self._cap.get(fid)
+            if cap is not None and slots > cap:
+                found.append(Violation(
+                    kind="max_hours",
+                    message=f"{self._faculty[fid].name} teaches {slots} slots, above max_hours ({cap} slots)",
+                    assignments=[i for i, e in enumerate(self.entries) if e.faculty_id == fid],
+                ))
+        return found
+
+    def _coverage(self) -> list[Violation]:
+        needed = Counter((s.batch_id, s.section_id, s.lab_group_id) for s in expand_sessions(self.req))
+        got = Counter((e.batch_id, e.section_id, e.lab_group_id) for e in self.entries)
+        found = []
+        for key in sorted(needed.keys() | got.keys(), key=str):
+            if needed[key] != got[key]:
+                batch_id, section_id, group_id = key
+                course, section = self._sections.get(section_id, (None, None))
+                label = f"{course.code} section {section.name}" if course else f"section {section_id}"
+                found.append(Violation(
+                    kind="coverage",
+                    message=(
+                        f"{label}{' group ' + group_id if group_id else ''} for batch {batch_id}: "
+                        f"{got[key]} of {needed[key]} sessions scheduled"
+                    ),
+                    assignments=[
+                        i for i, e in enumerate(self.entries)
+                        if (e.batch_id, e.section_id, e.lab_group_id) == key
+                    ],
+                ))
+        return found
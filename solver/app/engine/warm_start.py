@@ -0,0 +1,79 @@
+"""Lock-and-regenerate: map previous assignments back onto freshly expanded sessions."""
+
+from __future__ import annotations
+
+from ..models import AssignmentResult
+from ..domain.types import Placement, Session, Slot
+
+
+def _key(batch_id: str, section_id: str, lab_group_id: str | None) -> tuple:
+    return (batch_id, section_id, lab_group_id)
+
+
+def match_assignments(
+    sessions: list[Session],
+    records: list[AssignmentResult],
+    slots: list[Slot],
+    taken: set[str] = frozenset(),
+) -> dict[str, Placement]:
+    """
+    Pair each assignment with a not-yet-taken session of the same batch,
+    section, lab group and duration. Session ids are regenerated on every
+    expansion, so repeated sessions of a section are interchangeable and are
+    matched in order. Records that no longer fit the grid are dropped.
+    """
+    slot_gi = {(s.day, s.index): s.global_index for s in slots}
+    pool: dict[tuple, list[Session]] = {}
+    for sess in sessions:
+        if sess.id not in taken:
+            pool.setdefault(_key(sess.batch_id, sess.section_id, sess.lab_group_id), []).append(sess)
+
+    matched: dict[str, Placement] = {}
+    for rec in records:
+        gi = slot_gi.get((rec.day, rec.slot_index))
+        candidates = pool.get(_key(rec.batch_id, rec.section_id, rec.lab_group_id), [])
+        sess = next((c for c in candidates if c.duration == rec.duration), None)
+        if gi is None or sess is None:
+            continue
+        candidates.remove(sess)
+        matched[sess.id] = Placement(sess, rec.faculty_id, rec.room_id, gi)
+    return matched
+
+
+def without_records(records: list[AssignmentResult], remove: list[AssignmentResult]) -> list[AssignmentResult]:
+    """``records`` minus one occurrence of each entry in ``remove``."""
+    remaining = list(records)
+    for rec in remove:
+        if rec in remaining:
+            remaining.remove(rec)
+    return remaining
+
+
+def in_neighborhood(p: Placement, changed: set[str], day: str | None = None) -> bool:
+    """
+    Whether a placement touches any changed faculty, room, batch, section, lab
+    group or course, or starts on a changed ``day``.
+    """
+    sess = p.session
+    return bool(changed & {
+        p.faculty_id, p.room_id, sess.batch_id, sess.section_id, sess.lab_group_id, sess.course_id, day,
+    })
+
+
+def pin(
+    fac_starts: dict[str, dict[str, int]],
+    room_starts: dict[str, dict[str, int]],
+    p: Placement,
+) -> bool:
+    """
+    Prune a session's options down to placement ``p`` before any variable is
+    created. Returns False, leaving the options untouched, if ``p`` is not
+    currently feasible for the session.
+    """
+    sid = p.session.id
+    bit = 1 << p.start_gi
+    if not (fac_starts[sid].get(p.faculty_id, 0) & bit and room_starts[sid].get(p.room_id, 0) & bit):
+        return False
+    fac_starts[sid] = {p.faculty_id: bit}
+    room_starts[sid] = {p.room_id: bit}
+    return True
@@ -0,0 +1,214 @@
+"""Asynchronous solve jobs run in a bounded process pool."""
+
+from __future__ import annotations
+import multiprocessing
+import os
+import queue
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from .models import SolveRequest, SolveResponse, SolutionEvent, JobStatus
+from .engine.solver import solve
+from .cache import fingerprint, result_cache
+from .metrics import solve_metrics
+
+_DONE = "done"
+
+
+def _run_job(req: SolveRequest, events, cancel) -> SolveResponse:
+    """Job body executed in a worker process; streams solutions through ``events``."""
+    events.put(("started", None))
+    try:
+        return solve(req, on_solution=lambda ev: events.put(("solution", ev.model_dump())), cancel=cancel)
+    finally:
+        events.put((_DONE, None))
+
+
+class QueueFullError(Exception):
+    """Raised when the number of pending jobs reaches the configured limit."""
+
+
+@dataclass
+class Job:
+    id: str
+    future: Future
+    cancel: object  # manager Event proxy
+    events: list[SolutionEvent] = field(default_factory=list)
+    status: str = "QUEUED"
+    result: SolveResponse | None = None
+    error: str | None = None
+    fingerprint: str | None = None
+    response_format: str = "rows"  # of the submitted request, for GET /jobs/{id}
+    changed: threading.Condition = field(default_factory=threading.Condition)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("COMPLETED", "CANCELLED", "FAILED")
+
+    def to_status(self) -> JobStatus:
+        with self.changed:
+            return JobStatus(
+                job_id=self.id,
+                status=self.status,
+                solutions_found=len(self.events),
+                best_objective=self.events[-1].objective if self.events else None,
+                result=self.result,
+                error=self.error,
+            )
+
+
+class JobManager:
+    """
+    Owns the worker pool and job table. Each job gets a manager queue for
+    solution events and a manager event for cancellation; a pump thread per
+    job moves events into the ``Job`` and wakes any streaming readers.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, max_finished: int = 100):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._manager = None
+
+    def _ensure_pool(self) -> None:
+        if self._pool is None:
+            ctx = multiprocessing.get_context("spawn")
+            self._manager = ctx.Manager()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+
+    def submit(self, req: SolveRequest) -> Job:
+        """Queue ``req``; a request already in the result cache completes immediately."""
+        key = fingerprint(req)
+        cached = result_cache.get(key)
+        if cached is not None:
+            future: Future = Future()
+            future.set_result(cached)
+            job = Job(
+                id=uuid.uuid4().hex, future=future, cancel=threading.Event(),
+                status="COMPLETED", result=cached, fingerprint=key, response_format=req.response_format,
+            )
+            with self._lock:
+                self._jobs[job.id] = job
+                self._prune()
+            return job
+
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if not j.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} jobs already pending")
+            self._ensure_pool()
+            events = self._manager.Queue()
+            cancel = self._manager.Event()
+            future = self._pool.submit(_run_job, req, events, cancel)
+            job = Job(
+                id=uuid.uuid4().hex, future=future, cancel=cancel, fingerprint=key,
+                response_format=req.response_format,
+            )
+            self._jobs[job.id] = job
+            self._prune()
+
+        threading.Thread(target=self._pump, args=(job, events), daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel.set()
+        if job.future.cancel():
+            # Never started: no pump event will arrive, so finish it here
+            with job.changed:
+                job.status = "CANCELLED"
+                job.changed.notify_all()
+        return job
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                job.cancel.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._manager.shutdown()
+            self._pool = None
+
+    def _pump(self, job: Job, events) -> None:
+        while True:
+            try:
+                kind, payload = events.get(timeout=0.5)
+            except queue.Empty:
+                if job.future.done():
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+            if kind == _DONE:
+                break
+            with job.changed:
+                if kind == "started" and job.status == "QUEUED":
+                    job.status = "RUNNING"
+                elif kind == "solution":
+                    job.events.append(SolutionEvent.model_validate(payload))
+                job.changed.notify_all()
+
+        try:
+            result = job.future.result()
+            error = None
+        except Exception as exc:  # worker crashed or job was cancelled before start
+            result, error = None, repr(exc)
+        if result is not None:
+            solve_metrics.observe(result)
+            if not job.cancel.is_set():
+                result_cache.put(job.fingerprint, result)
+
+        with job.changed:
+            job.result = result
+            job.error = error
+            if job.cancel.is_set():
+                job.status = "CANCELLED"
+            elif error is not None:
+                job.status = "FAILED"
+            else:
+                job.status = "COMPLETED"
+            job.changed.notify_all()
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished]
+        for job in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+
+def stream_events(job: Job, poll_seconds: float = 15.0):
+    """
+    Yield ``(kind, payload)`` pairs for a job: every solution event (including
+    ones already recorded), then a final ``("status", JobStatus)``.
+    """
+    sent = 0
+    while True:
+        with job.changed:
+            while sent == len(job.events) and not job.finished:
+                if not job.changed.wait(poll_seconds):
+                    break
+            pending = job.events[sent:]
+            finished = job.finished
+        for ev in pending:
+            yield "solution", ev
+        sent += len(pending)
+        if finished and sent == len(job.events):
+            yield "status", job.to_status()
+            return
+        if not pending:
+            yield "ping", None
+
+
+job_manager = JobManager(
+    max_workers=int(os.environ.get("SOLVER_JOB_WORKERS", "2")),
+    max_pending=int(os.environ.get("SOLVER_MAX_PENDING_JOBS", "16")),
+)
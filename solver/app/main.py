@@ -1,8 +1,41 @@
-from fastapi import FastAPI
-from .models import SolveRequest, SolveResponse
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from .models import (
+    SolveRequest, SolveResponse, JobStatus, VerifyRequest, VerifyResponse, EditCheck, WhatIfRequest, WhatIfResponse,
+    DeltaRequest,
+)
 from .engine.solver import solve
+from .engine.profiles import sync_time_limit
+from .engine.verifier import TimetableIndex
+from .engine.pool import shutdown_pool
+from .engine.progress import search_logger
+from .cache import result_cache
+from .columnar import columnar_response, encode, wants_columnar
+from .jobs import QueueFullError, job_manager, stream_events
+from .metrics import solve_metrics
+from .resident import model_store
+from .whatif import run_what_if
+
+# CP-SAT search logs are off unless SOLVER_LOG_SEARCH is set
+if os.environ.get("SOLVER_LOG_SEARCH"):
+    logging.basicConfig()
+    search_logger.setLevel(logging.DEBUG)
+
 
-app = FastAPI(title="Timetable Solver", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    job_manager.shutdown()
+    shutdown_pool()
+
+
+app = FastAPI(title="Timetable Solver", version="1.0.0", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -10,6 +43,139 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(
+        solve_metrics.render() + result_cache.render_metrics() + model_store.render_metrics(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+def _solve_and_observe(req: SolveRequest) -> SolveResponse:
+    res = solve(req, time_limit=sync_time_limit(req))
+    solve_metrics.observe(res)
+    return res
+
+
 @app.post("/solve", response_model=SolveResponse)
-def solve_endpoint(req: SolveRequest):
-    return solve(req)
+def solve_endpoint(req: SolveRequest, accept: str | None = Header(default=None)):
+    """
+    Identical requests (up to ordering and ``schedule_id``) are served from the
+    result cache. The columnar encoding is returned when asked for by
+    ``response_format`` or the ``Accept`` header.
+    """
+    res = result_cache.get_or_solve(req, _solve_and_observe)
+    if wants_columnar(req.response_format, accept):
+        return columnar_response(encode(res))
+    return res
+
+
+@app.put("/schedules/{schedule_id}", response_model=SolveResponse)
+def solve_resident(schedule_id: str, req: SolveRequest, accept: str | None = Header(default=None)):
+    """
+    Solve with the schedule's resident model: built on the first request (or
+    when the time grid, faculty or rooms change), updated in place after that.
+    """
+    res = model_store.solve(req.model_copy(update={"schedule_id": schedule_id}), sync_time_limit(req))
+    solve_metrics.observe(res)
+    if wants_columnar(req.response_format, accept):
+        return columnar_response(encode(res))
+    return res
+
+
+@app.post("/schedules/{schedule_id}/deltas", response_model=SolveResponse)
+def apply_delta(schedule_id: str, body: DeltaRequest, accept: str | None = Header(default=None)):
+    """
+    Apply availability, course and lock changes to the resident request and
+    re-solve without a rebuild. The response uses the resident request's
+    ``response_format`` unless the ``Accept`` header asks for columnar.
+    """
+    resident = model_store.request(schedule_id)
+    res = None
+    if resident is not None:
+        # the delta's deadline replaces the resident request's, so the cap applies only without either
+        limit = sync_time_limit(resident) if body.deadline_seconds is None else None
+        res = model_store.apply(schedule_id, body, limit)
+    if res is None:
+        raise HTTPException(status_code=404, detail="Schedule has no resident model; PUT the full request first")
+    solve_metrics.observe(res)
+    if wants_columnar(resident.response_format, accept):
+        return columnar_response(encode(res))
+    return res
+
+
+@app.delete("/schedules/{schedule_id}", status_code=204)
+def drop_resident(schedule_id: str):
+    if not model_store.drop(schedule_id):
+        raise HTTPException(status_code=404, detail="Schedule has no resident model")
+    return Response(status_code=204)
+
+
+@app.post("/whatif", response_model=WhatIfResponse)
+def what_if(body: WhatIfRequest):
+    """Solve scenario variants of a base request concurrently; each is compared with the base solution."""
+    return run_what_if(body)
+
+
+@app.post("/verify", response_model=VerifyResponse)
+def verify_endpoint(body: VerifyRequest):
+    """Check a timetable against every hard constraint, and each edit on its own against it."""
+    t0 = time.perf_counter()
+    index = TimetableIndex(body.request, body.assignments)
+    violations = index.violations()
+    edits = []
+    for edit in body.edits:
+        found = index.check_edit(edit)
+        edits.append(EditCheck(valid=not found, violations=found))
+    return VerifyResponse(
+        valid=not violations,
+        violations=violations,
+        edits=edits,
+        verify_time_ms=int((time.perf_counter() - t0) * 1000),
+    )
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+def submit_job(req: SolveRequest):
+    try:
+        job = job_manager.submit(req)
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    return job.to_status()
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str, accept: str | None = Header(default=None)):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    status = job.to_status()
+    if wants_columnar(job.response_format, accept) and status.result is not None:
+        return columnar_response({**status.model_dump(mode="json", exclude={"result"}), "result": encode(status.result)})
+    return status
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_status()
+
+
+@app.get("/jobs/{job_id}/events")
+def job_events(job_id: str):
+    """Server-sent events: one ``solution`` per improving solution, then a final ``status``."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    def sse():
+        for kind, payload in stream_events(job):
+            if payload is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {kind}\ndata: {payload.model_dump_json()}\n\n"
+
+    return StreamingResponse(sse(), media_type="text/event-stream")
@@ -0,0 +1,110 @@
+"""Per-solve phase timing and process-wide metrics in Prometheus text format."""
+
+from __future__ import annotations
+import threading
+import time
+
+from .models import SolveResponse
+
+
+class PhaseTimer:
+    """
+    Wall time per named phase of one solve, in milliseconds. Phases run back
+    to back: ``lap(name)`` charges the time since the previous lap to ``name``.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, int] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0) + int((now - self._last) * 1000)
+        self._last = now
+
+
+_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class SolveMetrics:
+    """Thread-safe counters fed with every finished ``SolveResponse``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._solves: dict[str, int] = {}
+        self._buckets = [0] * len(_BUCKETS)
+        self._duration_sum = 0.0
+        self._duration_count = 0
+        self._phase_sum: dict[str, float] = {}
+        self._phase_count: dict[str, int] = {}
+        self._counters = {"branches": 0, "conflicts": 0}
+        self._last: dict[str, float] = {}
+
+    def observe(self, res: SolveResponse) -> None:
+        seconds = res.solve_time_ms / 1000
+        stats = res.diagnostics.stats if res.diagnostics else None
+        with self._lock:
+            self._solves[res.status] = self._solves.get(res.status, 0) + 1
+            self._duration_sum += seconds
+            self._duration_count += 1
+            for i, bound in enumerate(_BUCKETS):
+                if seconds <= bound:
+                    self._buckets[i] += 1
+            if stats is None:
+                return
+            for name, ms in stats.phases.items():
+                self._phase_sum[name] = self._phase_sum.get(name, 0.0) + ms / 1000
+                self._phase_count[name] = self._phase_count.get(name, 0) + 1
+            self._counters["branches"] += stats.branches
+            self._counters["conflicts"] += stats.conflicts
+            self._last = {
+                "sessions": stats.sessions,
+                "variables": stats.num_variables,
+                "constraints": stats.num_constraints,
+                **stats.model_counts,
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP timetable_solves_total Finished solves by response status.",
+                "# TYPE timetable_solves_total counter",
+            ]
+            lines += [f'timetable_solves_total{{status="{s}"}} {n}' for s, n in sorted(self._solves.items())]
+
+            lines += [
+                "# HELP timetable_solve_duration_seconds End-to-end solve time.",
+                "# TYPE timetable_solve_duration_seconds histogram",
+            ]
+            lines += [
+                f'timetable_solve_duration_seconds_bucket{{le="{b}"}} {n}'
+                for b, n in zip(_BUCKETS, self._buckets)
+            ]
+            lines += [
+                f'timetable_solve_duration_seconds_bucket{{le="+Inf"}} {self._duration_count}',
+                f"timetable_solve_duration_seconds_sum {self._duration_sum:.3f}",
+                f"timetable_solve_duration_seconds_count {self._duration_count}",
+                "# HELP timetable_solve_phase_seconds Time spent per solve phase.",
+                "# TYPE timetable_solve_phase_seconds summary",
+            ]
+            for name in sorted(self._phase_sum):
+                lines.append(f'timetable_solve_phase_seconds_sum{{phase="{name}"}} {self._phase_sum[name]:.3f}')
+                lines.append(f'timetable_solve_phase_seconds_count{{phase="{name}"}} {self._phase_count[name]}')
+
+            for name, value in self._counters.items():
+                lines += [
+                    f"# HELP timetable_search_{name}_total CP-SAT search {name} across all solves.",
+                    f"# TYPE timetable_search_{name}_total counter",
+                    f"timetable_search_{name}_total {value}",
+                ]
+
+            lines += [
+                "# HELP timetable_last_model_size Size of the most recently built model.",
+                "# TYPE timetable_last_model_size gauge",
+            ]
+            lines += [f'timetable_last_model_size{{kind="{k}"}} {v}' for k, v in sorted(self._last.items())]
+            return "\n".join(lines) + "\n"
+
+
+solve_metrics = SolveMetrics()
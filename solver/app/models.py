@@ -56,6 +56,15 @@ class BatchPayload(BaseModel):
     section_ids: list[str]
 
 
+class SolverOptions(BaseModel):
+    profile: str | None = None  # "small" | "medium" | "large" | "xlarge"
+    max_time_seconds: float | None = None
+    num_workers: int | None = None  # 0 = every available core
+    linearization_level: int | None = None  # 0 | 1 | 2
+    presolve: bool | None = None
+    search_branching: str | None = None  # CP-SAT SearchBranching, e.g. "AUTOMATIC_SEARCH" | "FIXED_SEARCH"
+
+
 class SolveRequest(BaseModel):
     schedule_id: str
     time_config: TimeConfigPayload
@@ -63,6 +72,21 @@ class SolveRequest(BaseModel):
     faculty: list[FacultyPayload]
     rooms: list[RoomPayload]
     batches: list[BatchPayload]
+    engine: str = "boolean"  # "boolean" | "interval"
+    mode: str = "default"  # "default" | "fast": greedy timetable only, CP-SAT only if the greedy one gets stuck
+    room_assignment: str = "model"  # "model" | "deferred": boolean engine picks times and faculty, rooms matched after
+    previous_assignments: list[AssignmentResult] = []  # warm start: hinted, changes penalised
+    locked_assignments: list[AssignmentResult] = []  # kept exactly as given
+    neighborhood: list[str] = []  # changed faculty/room/batch/section/course ids or days; other previous assignments stay fixed
+    decompose: bool = False  # solve independent components as separate models in parallel
+    improve_seconds: float = 0.0  # large neighborhood search budget after the first solution; 0 = off
+    improve_workers: int = 1  # neighborhoods re-solved in parallel worker processes per round
+    solver: SolverOptions = SolverOptions()  # overrides for the profile chosen by instance size
+    deadline_seconds: float | None = None  # wall-clock budget for the whole request, build and search included
+    explain_seconds: float = 0.0  # budget for naming a small conflicting set of requirements when infeasible; 0 = off
+    solutions: int = 1  # solution pool: up to this many timetables, the best first and the rest as alternatives
+    min_distance: int = 1  # sessions each pooled timetable must place differently from every other one
+    response_format: str = "rows"  # "rows" | "columnar": lookup tables plus integer columns (also via the Accept header)
 
 
 class AssignmentResult(BaseModel):
@@ -86,9 +110,167 @@ class SolveResponse(BaseModel):
     total_score: float | None = None
     assignments: list[AssignmentResult] = []
     diagnostics: DiagnosticsPayload | None = None
+    alternatives: list[AlternativeSolution] = []  # solution pool beyond ``assignments``, ranked by objective
+    cancelled: bool = False  # a cancel stopped the search before it finished
+
+
+class AlternativeSolution(BaseModel):
+    objective: float
+    distance: int  # sessions placed differently from the best solution
+    assignments: list[AssignmentResult]
+    added: list[AssignmentResult] = []  # relative to the best solution
+    removed: list[AssignmentResult] = []
 
 
 class DiagnosticsPayload(BaseModel):
     hard_score: float = 0.0
     soft_score: float = 0.0
     reasons: list[str] = []
+    components: list[ComponentReport] = []
+    stats: SolveStats | None = None
+    improvement: list[ImprovementPoint] = []  # objective over time during neighborhood search
+    violations: list[Violation] = []  # hard constraints the returned timetable breaks (debug verification)
+
+
+class SolveStats(BaseModel):
+    solver_status: str  # CP-SAT status name, e.g. "OPTIMAL" | "FEASIBLE" | "INFEASIBLE" | "UNKNOWN"
+    build_time_ms: int  # time grid, expansion, prechecks and model construction
+    presolve_time_ms: int
+    search_time_ms: int  # CP-SAT search after presolve
+    num_variables: int
+    num_constraints: int
+    objective: float | None = None  # best solution found, optimal or not
+    best_bound: float | None = None
+    gap: float | None = None  # |objective - best_bound| / max(1, |objective|)
+    branches: int = 0
+    conflicts: int = 0
+    sessions: int = 0
+    phases: dict[str, int] = {}  # ms per pipeline phase, in execution order
+    model_counts: dict[str, int] = {}  # formulation-specific, e.g. option literals, at-most-ones, auxiliaries
+    profile: str | None = None  # solver parameter profile used
+    num_workers: int = 0
+    max_time_seconds: float = 0.0
+    options_before_reduction: int = 0  # (faculty, room, start) options before domain reduction
+    options_removed: int = 0
+
+
+class ComponentReport(BaseModel):
+    index: int
+    batch_ids: list[str]
+    sessions: int
+    status: str
+    solve_time_ms: int
+    objective: float | None = None
+    solver_status: str | None = None  # CP-SAT's status for the component; None when no search ran
+
+
+class ImprovementPoint(BaseModel):
+    elapsed_ms: int  # since the start of the request
+    objective: float
+    neighborhood: str | None = None  # accepted neighborhood, e.g. "day MON"; None for the starting solution
+
+
+class SolutionEvent(BaseModel):
+    index: int  # 1-based count of solutions found so far
+    objective: float
+    best_bound: float
+    elapsed_ms: int
+    added: list[AssignmentResult] = []  # assignments new or changed since the previous solution
+    removed: list[AssignmentResult] = []  # assignments they replace
+
+
+class Violation(BaseModel):
+    kind: str  # "reference" | "duration" | "availability" | "qualification" | "room_type" | "capacity" | "faculty_clash" | "room_clash" | "batch_clash" | "max_hours" | "coverage"
+    message: str
+    assignments: list[int] = []  # indices into the verified assignment list
+
+
+class EditPayload(BaseModel):
+    kind: str  # "move" | "swap"
+    index: int
+    other_index: int | None = None  # swap: the assignment whose day/slot is exchanged with ``index``
+    day: str | None = None  # move: new values; unset fields keep the current ones
+    slot_index: int | None = None
+    faculty_id: str | None = None
+    room_id: str | None = None
+
+
+class VerifyRequest(BaseModel):
+    request: SolveRequest
+    assignments: list[AssignmentResult]
+    edits: list[EditPayload] = []  # each checked on its own against ``assignments``
+
+
+class EditCheck(BaseModel):
+    valid: bool
+    violations: list[Violation] = []
+
+
+class VerifyResponse(BaseModel):
+    valid: bool
+    violations: list[Violation] = []
+    edits: list[EditCheck] = []
+    verify_time_ms: int = 0
+
+
+class PatchOp(BaseModel):
+    op: str  # "add_room" | "remove_room" | "set_availability" | "remove_days" | "set_sessions_per_week"
+    target_id: str | None = None  # room, faculty or course id the op applies to
+    room: RoomPayload | None = None  # add_room
+    availability: dict[str, list[int]] | None = None  # set_availability, for a faculty member or room
+    days: list[str] = []  # remove_days: days the faculty member or room is no longer available
+    sessions_per_week: int | None = None  # set_sessions_per_week; hours_per_week is unchanged
+
+
+class Scenario(BaseModel):
+    name: str
+    patches: list[PatchOp]
+
+
+class WhatIfRequest(BaseModel):
+    base: SolveRequest
+    scenarios: list[Scenario]
+    cores: int | None = None  # CP-SAT threads across all concurrent solves; default every available core
+
+
+class ScenarioResult(BaseModel):
+    name: str
+    status: str  # SolveResponse status, or "FAILED" for a patch that does not apply
+    objective: float | None = None  # "prefer earlier slots" objective of the timetable, comparable across scenarios
+    solve_time_ms: int = 0
+    assignments: int = 0
+    unchanged: int = 0  # assignments identical to the base solution
+    added: list[AssignmentResult] = []  # not in the base solution
+    removed: list[AssignmentResult] = []  # base assignments no longer present
+    reasons: list[str] = []
+
+
+class WhatIfResponse(BaseModel):
+    base: ScenarioResult
+    scenarios: list[ScenarioResult]
+    solve_time_ms: int
+
+
+class DeltaOp(BaseModel):
+    op: str  # "add_availability" | "remove_availability" | "set_sessions_per_week" | "add_course" | "remove_course" | "lock" | "unlock"
+    target_id: str | None = None  # faculty or room id (availability ops), course id (course ops)
+    availability: dict[str, list[int]] = {}  # add_/remove_availability: slot indices per day
+    sessions_per_week: int | None = None  # set_sessions_per_week; hours_per_week is unchanged
+    course: CoursePayload | None = None  # add_course
+    faculty_ids: list[str] = []  # add_course: faculty qualified to teach it
+    batch_id: str | None = None  # add_course: batch enrolled in all of its sections
+    assignment: AssignmentResult | None = None  # lock / unlock
+
+
+class DeltaRequest(BaseModel):
+    ops: list[DeltaOp]  # applied in order to the resident request, then re-solved
+    deadline_seconds: float | None = None  # replaces the resident request's deadline when set
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str  # "QUEUED" | "RUNNING" | "COMPLETED" | "CANCELLED" | "FAILED"
+    solutions_found: int = 0
+    best_objective: float | None = None
+    result: SolveResponse | None = None
+    error: str | None = None
@@ -0,0 +1,184 @@
+"""Resident models per ``schedule_id``: a re-solve after a small delta skips the model build."""
+
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+
+from .models import SolveRequest, SolveResponse, DiagnosticsPayload, DeltaOp, DeltaRequest
+from .engine.resident import ResidentModel, resident_problems
+from .engine.warm_start import without_records
+
+
+class DeltaError(ValueError):
+    """A delta op that does not apply to the resident request."""
+
+
+def apply_delta(req: SolveRequest, ops: list[DeltaOp]) -> SolveRequest:
+    """Copy of ``req`` with ``ops`` applied in order; raises ``DeltaError``."""
+    variant = req.model_copy(deep=True)
+    for op in ops:
+        _apply(variant, op)
+    return variant
+
+
+def _apply(req: SolveRequest, op: DeltaOp) -> None:
+    if op.op in ("add_availability", "remove_availability"):
+        entity = next((e for e in [*req.faculty, *req.rooms] if e.id == op.target_id), None)
+        if entity is None:
+            raise DeltaError(f"{op.op}: no faculty member or room {op.target_id}")
+        merged = {}
+        for day in dict.fromkeys([*entity.availability, *op.availability]):
+            current = set(entity.availability.get(day, []))
+            change = set(op.availability.get(day, []))
+            slots = current | change if op.op == "add_availability" else current - change
+            if slots:
+                merged[day] = sorted(slots)
+        entity.availability = merged
+    elif op.op == "set_sessions_per_week":
+        course = _find(req.courses, op.target_id, "course")
+        if op.sessions_per_week is None or op.sessions_per_week < 1:
+            raise DeltaError("set_sessions_per_week needs sessions_per_week >= 1")
+        course.sessions_per_week = op.sessions_per_week
+    elif op.op == "add_course":
+        if op.course is None or op.batch_id is None:
+            raise DeltaError("add_course needs a course and a batch_id")
+        if any(c.id == op.course.id for c in req.courses):
+            raise DeltaError(f"Course {op.course.id} already exists")
+        batch = _find(req.batches, op.batch_id, "batch")
+        req.courses.append(op.course)
+        batch.section_ids += [sec.id for sec in op.course.sections]
+        for fid in op.faculty_ids:
+            _find(req.faculty, fid, "faculty member").qualified_course_ids.append(op.course.id)
+    elif op.op == "remove_course":
+        course = _find(req.courses, op.target_id, "course")
+        req.courses.remove(course)
+        sections = {sec.id for sec in course.sections}
+        for batch in req.batches:
+            batch.section_ids = [s for s in batch.section_ids if s not in sections]
+        for fac in req.faculty:
+            fac.qualified_course_ids = [c for c in fac.qualified_course_ids if c != course.id]
+        req.locked_assignments = [a for a in req.locked_assignments if a.section_id not in sections]
+    elif op.op == "lock":
+        if op.assignment is None:
+            raise DeltaError("lock needs an assignment")
+        req.locked_assignments.append(op.assignment)
+    elif op.op == "unlock":
+        if op.assignment is None or op.assignment not in req.locked_assignments:
+            raise DeltaError("unlock needs an assignment that is currently locked")
+        req.locked_assignments = without_records(req.locked_assignments, [op.assignment])
+    else:
+        raise DeltaError(f"Unknown delta op '{op.op}'")
+
+
+def _find(items: list, target_id: str | None, kind: str):
+    found = next((item for item in items if item.id == target_id), None)
+    if found is None:
+        raise DeltaError(f"No {kind} {target_id}")
+    return found
+
+
+def _failed(reasons: list[str]) -> SolveResponse:
+    return SolveResponse(status="FAILED", solve_time_ms=0, diagnostics=DiagnosticsPayload(reasons=reasons))
+
+
+class ModelStore:
+    """
+    LRU of ``ResidentModel`` by ``schedule_id``, bounded by their estimated
+    memory. A request whose time grid, faculty or rooms differ from the
+    resident model's replaces it with a new build; anything else updates
+    the resident model in place. Runs on one schedule are serialised.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, ResidentModel] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self.counters = {"builds": 0, "updates": 0, "evictions": 0}
+
+    def solve(self, req: SolveRequest, time_limit: float | None = None) -> SolveResponse:
+        """Solve ``req`` with its schedule's resident model, building one if needed; ``time_limit`` caps the search."""
+        problems = resident_problems(req)
+        if problems:
+            return _failed(problems)
+        resident = self._get(req.schedule_id)
+        if resident is not None:
+            with resident.lock:
+                if resident.compatible(req):
+                    res = resident.run(req, time_limit)
+                    self._admit(req.schedule_id, resident, "updates")
+                    return res
+        resident = ResidentModel(req)
+        with resident.lock:
+            res = resident.run(req, time_limit)
+        self._admit(req.schedule_id, resident, "builds")
+        return res
+
+    def apply(self, schedule_id: str, body: DeltaRequest, time_limit: float | None = None) -> SolveResponse | None:
+        """Apply ``body`` to the resident request and re-solve; None if the schedule is not resident."""
+        resident = self._get(schedule_id)
+        if resident is None:
+            return None
+        with resident.lock:
+            try:
+                req = apply_delta(resident.req, body.ops)
+            except DeltaError as exc:
+                return _failed([str(exc)])
+            if body.deadline_seconds is not None:
+                req.deadline_seconds = body.deadline_seconds
+            res = resident.run(req, time_limit)
+        self._admit(schedule_id, resident, "updates")
+        return res
+
+    def request(self, schedule_id: str) -> SolveRequest | None:
+        """The request the schedule's resident model last solved, or None if it is not resident."""
+        with self._lock:
+            resident = self._entries.get(schedule_id)
+        return resident.req if resident is not None else None
+
+    def drop(self, schedule_id: str) -> bool:
+        with self._lock:
+            self._sizes.pop(schedule_id, None)
+            return self._entries.pop(schedule_id, None) is not None
+
+    def render_metrics(self) -> str:
+        """Prometheus text lines for the resident model counters."""
+        with self._lock:
+            lines = [
+                "# HELP timetable_resident_events_total Resident model builds, in-place updates and evictions.",
+                "# TYPE timetable_resident_events_total counter",
+            ]
+            lines += [f'timetable_resident_events_total{{event="{k}"}} {v}' for k, v in self.counters.items()]
+            lines += [
+                "# HELP timetable_resident_models Models held in memory.",
+                "# TYPE timetable_resident_models gauge",
+                f"timetable_resident_models {len(self._entries)}",
+                "# HELP timetable_resident_bytes Estimated memory of the resident models.",
+                "# TYPE timetable_resident_bytes gauge",
+                f"timetable_resident_bytes {sum(self._sizes.values())}",
+            ]
+            return "\n".join(lines) + "\n"
+
+    def _get(self, schedule_id: str) -> ResidentModel | None:
+        with self._lock:
+            resident = self._entries.get(schedule_id)
+            if resident is not None:
+                self._entries.move_to_end(schedule_id)
+            return resident
+
+    def _admit(self, schedule_id: str, resident: ResidentModel, event: str) -> None:
+        """(Re)insert ``resident`` as most recent and evict the least recent until within budget."""
+        size = resident.nbytes()
+        with self._lock:
+            self.counters[event] += 1
+            self._entries[schedule_id] = resident
+            self._entries.move_to_end(schedule_id)
+            self._sizes[schedule_id] = size
+            while self._entries and sum(self._sizes.values()) > self.budget_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                del self._sizes[evicted]
+                self.counters["evictions"] += 1
+
+
+model_store = ModelStore(budget_bytes=int(float(os.environ.get("SOLVER_RESIDENT_MB", "1024")) * 2**20))
@@ -0,0 +1,170 @@
+"""What-if analysis: solve patched variants of a base request concurrently and compare them."""
+
+from __future__ import annotations
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from .models import (
+    SolveRequest, SolveResponse, AssignmentResult, DiagnosticsPayload, PatchOp,
+    ScenarioResult, WhatIfRequest, WhatIfResponse,
+)
+from .domain.types import Slot
+from .domain.time_grid import build_time_grid
+from .engine.solver import solve
+from .engine.alternatives import diff
+from .engine.lns import objective_of
+from .engine.pool import available_cores, get_pool
+from .engine.profiles import MIN_PORTFOLIO, sync_time_limit
+from .cache import fingerprint, result_cache
+from .metrics import solve_metrics
+
+
+class PatchError(ValueError):
+    """A patch that does not apply to the base request."""
+
+
+def apply_patches(req: SolveRequest, patches: list[PatchOp]) -> SolveRequest:
+    """Copy of ``req`` with ``patches`` applied in order; raises ``PatchError``."""
+    variant = req.model_copy(deep=True)
+    for patch in patches:
+        _apply(variant, patch)
+    return variant
+
+
+def _apply(req: SolveRequest, patch: PatchOp) -> None:
+    if patch.op == "add_room":
+        if patch.room is None:
+            raise PatchError("add_room needs a room")
+        if any(r.id == patch.room.id for r in req.rooms):
+            raise PatchError(f"Room {patch.room.id} already exists")
+        req.rooms.append(patch.room)
+    elif patch.op == "remove_room":
+        req.rooms.remove(_find(req.rooms, patch.target_id, "room"))
+    elif patch.op in ("set_availability", "remove_days"):
+        entity = next((e for e in [*req.faculty, *req.rooms] if e.id == patch.target_id), None)
+        if entity is None:
+            raise PatchError(f"{patch.op}: no faculty member or room {patch.target_id}")
+        if patch.op == "set_availability":
+            if patch.availability is None:
+                raise PatchError("set_availability needs availability")
+            entity.availability = dict(patch.availability)
+        else:
+            entity.availability = {d: s for d, s in entity.availability.items() if d not in patch.days}
+    elif patch.op == "set_sessions_per_week":
+        course = _find(req.courses, patch.target_id, "course")
+        if patch.sessions_per_week is None or patch.sessions_per_week < 1:
+            raise PatchError("set_sessions_per_week needs sessions_per_week >= 1")
+        course.sessions_per_week = patch.sessions_per_week
+    else:
+        raise PatchError(f"Unknown patch op '{patch.op}'")
+
+
+def _find(items: list, target_id: str | None, kind: str):
+    found = next((item for item in items if item.id == target_id), None)
+    if found is None:
+        raise PatchError(f"No {kind} {target_id}")
+    return found
+
+
+def _result(name: str, res: SolveResponse, base: list[AssignmentResult], slots: list[Slot]) -> ScenarioResult:
+    unchanged, added, removed = diff(base, res.assignments)
+    return ScenarioResult(
+        name=name,
+        status=res.status,
+        objective=objective_of(res.assignments, slots) if res.status == "SUCCESS" else None,
+        solve_time_ms=res.solve_time_ms,
+        assignments=len(res.assignments),
+        unchanged=unchanged,
+        added=added,
+        removed=removed,
+        reasons=res.diagnostics.reasons if res.diagnostics else [],
+    )
+
+
+def _solve_and_observe(req: SolveRequest, time_limit: float | None) -> SolveResponse:
+    res = solve(req, time_limit=time_limit)
+    solve_metrics.observe(res)
+    return res
+
+
+def _concurrency(scenarios: int, budget: int) -> tuple[int, int]:
+    """(CP-SAT workers per solve, solves at once) for ``scenarios`` solves sharing ``budget`` cores."""
+    per_solve = max(min(MIN_PORTFOLIO, budget), budget // max(1, scenarios))
+    return per_solve, max(1, budget // per_solve)
+
+
+def run_what_if(body: WhatIfRequest) -> WhatIfResponse:
+    """
+    Solve the base request (through the result cache), then every scenario
+    with the base solution as its warm start, so changes are hinted away
+    and each diff shows only what the patch forces. Scenarios run on the
+    shared process pool, as many at a time as the core budget allows with
+    ``MIN_PORTFOLIO`` CP-SAT workers each.
+
+    Every solve is capped like a synchronous /solve. A ``deadline_seconds``
+    on the base request covers the whole comparison instead: the base solve
+    and each wave of scenarios get an equal share of the time left.
+    """
+    t0 = time.time()
+    slots = build_time_grid(body.base.time_config)  # patches never touch the time config
+    budget = max(1, body.cores or available_cores())
+    deadline = body.base.deadline_seconds
+    base_limit = sync_time_limit(body.base)
+    if deadline is not None:
+        _, concurrent = _concurrency(len(body.scenarios), budget)
+        base_limit = deadline / (1 + math.ceil(len(body.scenarios) / concurrent))
+    base_res = result_cache.get_or_solve(body.base, lambda req: _solve_and_observe(req, base_limit))
+    base_assignments = base_res.assignments if base_res.status == "SUCCESS" else []
+
+    results: dict[int, ScenarioResult] = {}
+    pending: list[tuple[int, SolveRequest, str]] = []
+    for i, scenario in enumerate(body.scenarios):
+        try:
+            variant = apply_patches(body.base, scenario.patches)
+        except PatchError as exc:
+            results[i] = ScenarioResult(name=scenario.name, status="FAILED", reasons=[str(exc)])
+            continue
+        if base_assignments:
+            variant.previous_assignments = base_assignments
+        key = fingerprint(variant)
+        cached = result_cache.get(key)
+        if cached is not None:
+            results[i] = _result(scenario.name, cached, base_assignments, slots)
+        else:
+            pending.append((i, variant, key))
+
+    per_solve, concurrent = _concurrency(len(pending), budget)
+    limit = sync_time_limit(body.base)
+    if deadline is not None:
+        limit = max(0.0, deadline - (time.time() - t0)) / max(1, math.ceil(len(pending) / concurrent))
+
+    pool = get_pool()
+    running: dict[Future, tuple[int, str]] = {}
+    while pending or running:
+        while pending and len(running) < concurrent:
+            i, variant, key = pending.pop(0)
+            if variant.solver.num_workers is None:
+                # cached under the fingerprint without this: the worker count does not change the problem
+                variant.solver = variant.solver.model_copy(update={"num_workers": per_solve})
+            running[pool.submit(solve, variant, time_limit=limit)] = (i, key)
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            i, key = running.pop(fut)
+            try:
+                res = fut.result()
+            except Exception as exc:  # worker crashed; report and keep the other scenarios
+                res = SolveResponse(
+                    status="FAILED", solve_time_ms=0,
+                    diagnostics=DiagnosticsPayload(reasons=[f"Scenario solve failed: {exc!r}"]),
+                )
+            else:
+                solve_metrics.observe(res)
+                result_cache.put(key, res)
+            results[i] = _result(body.scenarios[i].name, res, base_assignments, slots)
+
+    return WhatIfResponse(
+        base=_result("base", base_res, base_assignments, slots),
+        scenarios=[results[i] for i in range(len(body.scenarios))],
+        solve_time_ms=int((time.time() - t0) * 1000),
+    )
@@ -0,0 +1 @@
+"""Solver benchmarks: synthetic instance generator and tiered runner."""
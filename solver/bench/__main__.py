@@ -0,0 +1,108 @@
+"""
+Usage (from the solver directory):
+
+    python -m bench run --tiers small,medium --engines boolean,interval --out bench.json
+    python -m bench run --tiers small --improve 5 --out bench_lns.json
+    python -m bench compare base.json bench.json
+    python -m bench generate medium --seed 3 > medium.json
+    python -m bench tune --tiers tiny,small --candidates w1,w4,w8 --max-time 5 --out tune.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+from dataclasses import replace
+
+from .generator import TIERS, generate
+from .runner import compare, load, run, save
+from .tune import CANDIDATES, recommend, sweep
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="solve generated instances and write a results file")
+    p_run.add_argument("--tiers", default="tiny,small,medium", help=f"comma-separated, of {', '.join(TIERS)}")
+    p_run.add_argument("--engines", default="boolean,interval")
+    p_run.add_argument("--seeds", default="0", help="comma-separated generator seeds")
+    p_run.add_argument("--out", default="bench_results.json")
+    p_run.add_argument("--improve", type=float, default=0.0, help="neighborhood-search seconds after each solve")
+
+    p_cmp = sub.add_parser("compare", help="compare two results files; exit 1 on regression")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=0.2, help="relative growth treated as a regression")
+
+    p_gen = sub.add_parser("generate", help="print one generated SolveRequest as JSON")
+    p_gen.add_argument("tier", choices=list(TIERS))
+    p_gen.add_argument("--seed", type=int, default=0)
+
+    p_tune = sub.add_parser("tune", help="sweep solver parameter candidates and recommend one per tier")
+    p_tune.add_argument("--tiers", default="tiny,small")
+    p_tune.add_argument("--candidates", default=",".join(CANDIDATES), help="comma-separated, of bench/tune.py CANDIDATES")
+    p_tune.add_argument("--seeds", default="0")
+    p_tune.add_argument("--engine", default="boolean")
+    p_tune.add_argument("--max-time", type=float, default=None, help="same time limit for every candidate")
+    p_tune.add_argument("--out", default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        tiers = args.tiers.split(",")
+        unknown = [t for t in tiers if t not in TIERS]
+        if unknown:
+            parser.error(f"unknown tiers: {', '.join(unknown)}")
+
+        def report(r: dict) -> None:
+            print(
+                f"{r['tier']:<8} {r['engine']:<9} seed={r['seed']:<3} {r['status']:<10} "
+                f"sessions={r['sessions']:<5} wall={r['wall_time_ms']}ms build={r['build_time_ms']}ms "
+                f"vars={r['num_variables']} objective={r['objective']}"
+                + (f" (from {r['improvement'][0]['objective']:g})" if r["improvement"] else ""),
+                file=sys.stderr,
+            )
+
+        seeds = [int(s) for s in args.seeds.split(",")]
+        results = run(tiers, args.engines.split(","), seeds, report, args.improve)
+        save(results, args.out)
+        print(f"Wrote {len(results['results'])} results to {args.out}", file=sys.stderr)
+        return 0
+
+    if args.command == "compare":
+        lines, regressed = compare(load(args.base), load(args.new), args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+
+    if args.command == "tune":
+        unknown = [c for c in args.candidates.split(",") if c not in CANDIDATES]
+        unknown += [t for t in args.tiers.split(",") if t not in TIERS]
+        if unknown:
+            parser.error(f"unknown tiers or candidates: {', '.join(unknown)}")
+
+        def report(r: dict) -> None:
+            print(
+                f"{r['tier']:<8} seed={r['seed']:<3} {r['candidate']:<16} {r['solver_status'] or r['status']:<10} "
+                f"wall={r['wall_time_ms']}ms workers={r['num_workers']} objective={r['objective']}",
+                file=sys.stderr,
+            )
+
+        records = sweep(
+            args.tiers.split(","), args.candidates.split(","), [int(s) for s in args.seeds.split(",")],
+            args.engine, args.max_time, report,
+        )
+        best = recommend(records)
+        for tier, name in best.items():
+            print(f"{tier}: {name}")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump({"results": records, "recommended": best}, f, indent=2)
+        return 0
+
+    print(generate(replace(TIERS[args.tier], seed=args.seed)).model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
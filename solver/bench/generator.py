@@ -0,0 +1,163 @@
+"""Synthetic institutions: reproducible ``SolveRequest`` instances from a few size parameters."""
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass, asdict
+
+from app.models import SolveRequest, TimeConfigPayload
+from app.domain.time_grid import build_time_grid, slots_per_day
+
+DAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT"]
+
+
+@dataclass(frozen=True)
+class InstanceParams:
+    """
+    Shape of a generated institution. Batches are grouped into programs of
+    ``sections_per_course`` batches that take the same courses, each batch in
+    its own section.
+    """
+    batches: int = 2
+    sections_per_course: int = 1
+    courses_per_batch: int = 6
+    labs_per_batch: int = 2  # of courses_per_batch
+    lab_groups: int = 2
+    faculty: int = 10
+    faculty_per_course: int = 2  # qualified faculty per course
+    part_time_share: float = 0.2
+    lecture_rooms: int = 4
+    lab_rooms: int = 2
+    availability_density: float = 0.9  # chance each faculty/room half-day is available
+    days: int = 5
+    slot_duration: int = 60  # minutes
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+TIERS: dict[str, InstanceParams] = {
+    "tiny": InstanceParams(batches=1, courses_per_batch=5, faculty=4, lecture_rooms=2, lab_rooms=1),
+    "small": InstanceParams(batches=2, faculty=8, lecture_rooms=3, lab_rooms=2),
+    "medium": InstanceParams(
+        batches=6, sections_per_course=2, courses_per_batch=7, faculty=20, lecture_rooms=6, lab_rooms=3,
+    ),
+    "large": InstanceParams(
+        batches=12, sections_per_course=3, courses_per_batch=8, faculty=40, lecture_rooms=12, lab_rooms=6,
+    ),
+    "xlarge": InstanceParams(
+        batches=24, sections_per_course=3, courses_per_batch=8, lab_groups=3, faculty=80,
+        lecture_rooms=24, lab_rooms=12,
+    ),
+}
+
+
+def generate(params: InstanceParams) -> SolveRequest:
+    """Build a request; the same ``params`` (including ``seed``) always give the same request."""
+    rnd = random.Random(params.seed)
+    time_config = TimeConfigPayload(
+        days=DAYS[:params.days],
+        start_time="09:00",
+        end_time="17:00",
+        slot_duration=params.slot_duration,
+        break_start="12:00",
+        break_end="13:00",
+    )
+    per_day = {day: len(s) for day, s in slots_per_day(build_time_grid(time_config)).items()}
+
+    def availability() -> dict[str, list[int]]:
+        # Real unavailability comes in blocks, so drop whole half-days
+        result = {}
+        for day, n in per_day.items():
+            half = n // 2
+            result[day] = [
+                i for part in (range(half), range(half, n))
+                if rnd.random() < params.availability_density
+                for i in part
+            ]
+        return result
+
+    # Lecture hours scale with slot length so a course is ~3h/week at any granularity
+    slots_per_hour = max(1, 60 // params.slot_duration)
+    courses = []
+    batches = []
+    programs = -(-params.batches // params.sections_per_course)
+    for p in range(programs):
+        for c in range(params.courses_per_batch):
+            lab = c < params.labs_per_batch
+            cid = f"c{p}_{c}"
+            sections = []
+            for s in range(params.sections_per_course):
+                sid = f"sec{p}_{c}_{s}"
+                groups = [
+                    {"id": f"{sid}_g{g}", "name": f"G{g + 1}"} for g in range(params.lab_groups)
+                ] if lab else []
+                sections.append({"id": sid, "name": chr(ord("A") + s), "lab_groups": groups})
+            courses.append({
+                "id": cid,
+                "code": f"{'LB' if lab else 'CS'}{p + 1}{c:02d}",
+                "name": f"{'Lab' if lab else 'Course'} {p + 1}.{c + 1}",
+                "type": "LAB" if lab else "LECTURE",
+                "hours_per_week": 2 * slots_per_hour if lab else 3 * slots_per_hour,
+                "sessions_per_week": 1 if lab else 3,
+                "sections": sections,
+            })
+
+        for s in range(params.sections_per_course):
+            b = p * params.sections_per_course + s
+            if b >= params.batches:
+                break
+            batches.append({
+                "id": f"b{b}",
+                "name": f"Program {p + 1} {chr(ord('A') + s)}",
+                "student_count": rnd.randint(40, 60),
+                "section_ids": [f"sec{p}_{c}_{s}" for c in range(params.courses_per_batch)],
+            })
+
+    # Every course gets faculty_per_course qualified faculty, chosen among the
+    # least loaded so each one's expected teaching load stays roughly even
+    qualified: dict[int, list[str]] = {f: [] for f in range(params.faculty)}
+    load = {f: rnd.random() for f in range(params.faculty)}  # random tie-break
+    per_course = min(params.faculty_per_course, params.faculty)
+    for course in sorted(courses, key=_weekly_slots, reverse=True):
+        for f in sorted(load, key=load.get)[:per_course]:
+            qualified[f].append(course["id"])
+            load[f] += _weekly_slots(course) / per_course
+
+    faculty = []
+    for f in range(params.faculty):
+        part_time = rnd.random() < params.part_time_share
+        faculty.append({
+            "id": f"f{f}",
+            "name": f"Faculty {f + 1}",
+            "type": "PARTTIME" if part_time else "FULLTIME",
+            "max_hours": 12 if part_time else 20,
+            "availability": availability(),
+            "qualified_course_ids": qualified[f],
+        })
+
+    # Room capacity is enforced, so the first room of each type seats any
+    # batch (or lab group); the rest vary and may be too small for some
+    rooms = [
+        {"id": f"r{i}", "name": f"LH-{i + 1}", "type": "LECTURE",
+         "capacity": 120 if i == 0 else rnd.choice([50, 80, 120]), "availability": availability()}
+        for i in range(params.lecture_rooms)
+    ] + [
+        {"id": f"l{i}", "name": f"LAB-{i + 1}", "type": "LAB",
+         "capacity": 40 if i == 0 else rnd.choice([30, 40]), "availability": availability()}
+        for i in range(params.lab_rooms)
+    ]
+
+    return SolveRequest(
+        schedule_id=f"bench-{params.seed}",
+        time_config=time_config,
+        courses=courses,
+        faculty=faculty,
+        rooms=rooms,
+        batches=batches,
+    )
+
+
+def _weekly_slots(course: dict) -> int:
+    groups = sum(max(1, len(sec["lab_groups"])) for sec in course["sections"])
+    return course["hours_per_week"] * groups
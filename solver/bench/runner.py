@@ -0,0 +1,158 @@
+"""Run ``solve()`` across size tiers and write / compare machine-readable results."""
+
+from __future__ import annotations
+import json
+import os
+import platform
+import subprocess
+import time
+from dataclasses import replace
+
+import ortools
+
+from app.engine.solver import solve
+from app.domain.session_expander import expand_sessions
+from .generator import TIERS, InstanceParams, generate
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_instance(tier: str, params: InstanceParams, engine: str, improve_seconds: float = 0.0) -> dict:
+    """Solve one generated instance and return its result record."""
+    req = generate(params).model_copy(update={"engine": engine, "improve_seconds": improve_seconds})
+    sessions = len(expand_sessions(req))
+    t0 = time.time()
+    res = solve(req)
+    wall_ms = int((time.time() - t0) * 1000)
+    stats = res.diagnostics.stats if res.diagnostics else None
+    return {
+        "tier": tier,
+        "engine": engine,
+        "seed": params.seed,
+        "params": params.to_dict(),
+        "sessions": sessions,
+        "status": res.status,
+        "solver_status": stats.solver_status if stats else None,
+        "objective": stats.objective if stats else res.total_score,
+        "assignments": len(res.assignments),
+        "wall_time_ms": wall_ms,
+        "build_time_ms": stats.build_time_ms if stats else None,
+        "presolve_time_ms": stats.presolve_time_ms if stats else None,
+        "search_time_ms": stats.search_time_ms if stats else None,
+        "num_variables": stats.num_variables if stats else None,
+        "num_constraints": stats.num_constraints if stats else None,
+        "branches": stats.branches if stats else None,
+        "gap": stats.gap if stats else None,
+        "phases_ms": stats.phases if stats else {},
+        "model_counts": stats.model_counts if stats else {},
+        "improvement": [p.model_dump() for p in res.diagnostics.improvement] if res.diagnostics else [],
+    }
+
+
+def run(
+    tiers: list[str], engines: list[str], seeds: list[int], on_result=None, improve_seconds: float = 0.0,
+) -> dict:
+    """
+    Run every (tier, engine, seed) combination; ``on_result`` sees each record
+    as it completes. ``improve_seconds`` adds a neighborhood-search stage to
+    every solve and records its objective over time.
+    """
+    results = []
+    for tier in tiers:
+        for seed in seeds:
+            params = replace(TIERS[tier], seed=seed)
+            for engine in engines:
+                record = run_instance(tier, params, engine, improve_seconds)
+                results.append(record)
+                if on_result is not None:
+                    on_result(record)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "ortools": ortools.__version__,
+            "cpu_count": os.cpu_count(),
+            "improve_seconds": improve_seconds,
+        },
+        "results": results,
+    }
+
+
+def _key(record: dict) -> tuple:
+    return record["tier"], record["engine"], record["seed"]
+
+
+# Outcome ordering, best first; prechecked requests carry no CP-SAT status
+STATUS_RANK = {"OPTIMAL": 0, "FEASIBLE": 1, "SUCCESS": 1, "UNKNOWN": 2, "FAILED": 2, "INFEASIBLE": 3}
+
+
+def _outcome(record: dict) -> str:
+    return record.get("solver_status") or record["status"]
+
+
+def compare(
+    base: dict, new: dict, threshold: float = 0.2, min_time_delta_ms: int = 50,
+) -> tuple[list[str], bool]:
+    """
+    Line-per-instance comparison of two result files. An instance regresses
+    when its outcome or objective gets worse, or its wall / build time or
+    model size grows by more than ``threshold`` (relative; times must also
+    grow by ``min_time_delta_ms`` so timer noise on tiny instances is ignored).
+    """
+    base_by_key = {_key(r): r for r in base["results"]}
+    lines = [
+        f"{'tier':<8} {'engine':<9} {'seed':>4}  {'status':<22} {'wall ms':>17} "
+        f"{'build ms':>15} {'variables':>21} {'objective':>21}"
+    ]
+    regressed = False
+    for r in new["results"]:
+        b = base_by_key.get(_key(r))
+        if b is None:
+            lines.append(f"{r['tier']:<8} {r['engine']:<9} {r['seed']:>4}  (new) {r['status']}")
+            continue
+        flags = []
+        if STATUS_RANK.get(_outcome(r), 4) > STATUS_RANK.get(_outcome(b), 4):
+            flags.append("status")
+        if b["objective"] is not None and r["objective"] is not None and r["objective"] > b["objective"]:
+            flags.append("objective")
+        for field in ("wall_time_ms", "build_time_ms", "num_variables", "num_constraints"):
+            old, cur = b.get(field), r.get(field)
+            slack = min_time_delta_ms if field.endswith("_ms") else 0
+            if old and cur and cur > old * (1 + threshold) and cur - old > slack:
+                flags.append(field)
+        regressed = regressed or bool(flags)
+        lines.append(
+            f"{r['tier']:<8} {r['engine']:<9} {r['seed']:>4}  "
+            f"{_outcome(b) + '->' + _outcome(r):<22} "
+            f"{_pair(b['wall_time_ms'], r['wall_time_ms']):>17} "
+            f"{_pair(b['build_time_ms'], r['build_time_ms']):>15} "
+            f"{_pair(b['num_variables'], r['num_variables']):>21} "
+            f"{_pair(b['objective'], r['objective']):>21}"
+            + (f"  REGRESSION: {', '.join(flags)}" if flags else "")
+        )
+    return lines, regressed
+
+
+def _pair(old, new) -> str:
+    fmt = lambda v: "-" if v is None else f"{v:g}" if isinstance(v, float) else str(v)
+    return f"{fmt(old)} -> {fmt(new)}"
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(results: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
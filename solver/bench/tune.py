@@ -0,0 +1,83 @@
+"""Sweep CP-SAT parameter candidates over generated instances to pick profile defaults."""
+
+from __future__ import annotations
+import time
+from dataclasses import replace
+
+from app.models import SolverOptions
+from app.engine.profiles import PROFILES
+from app.engine.solver import solve
+from .generator import TIERS, generate
+from .runner import STATUS_RANK
+
+CANDIDATES: dict[str, SolverOptions] = {
+    **{f"profile-{name}": SolverOptions(profile=name) for name in PROFILES},
+    "w1": SolverOptions(num_workers=1),
+    "w1-lin0": SolverOptions(num_workers=1, linearization_level=0),
+    "w4": SolverOptions(num_workers=4),
+    "w4-lin0": SolverOptions(num_workers=4, linearization_level=0),
+    "w4-lin2": SolverOptions(num_workers=4, linearization_level=2),
+    "w8": SolverOptions(num_workers=8),
+    "w8-lin0": SolverOptions(num_workers=8, linearization_level=0),
+    "w8-restart": SolverOptions(num_workers=8, search_branching="PORTFOLIO_WITH_QUICK_RESTART_SEARCH"),
+    "cores": SolverOptions(num_workers=0),
+}
+
+
+def sweep(
+    tiers: list[str],
+    candidates: list[str],
+    seeds: list[int],
+    engine: str = "boolean",
+    max_time: float | None = None,
+    on_result=None,
+) -> list[dict]:
+    """
+    Solve every (tier, seed) instance with every candidate. ``max_time``
+    gives all candidates the same time limit so only their strategy differs.
+    """
+    records = []
+    for tier in tiers:
+        for seed in seeds:
+            base = generate(replace(TIERS[tier], seed=seed)).model_copy(update={"engine": engine})
+            for name in candidates:
+                options = CANDIDATES[name]
+                if max_time is not None:
+                    options = options.model_copy(update={"max_time_seconds": max_time})
+                t0 = time.time()
+                res = solve(base.model_copy(update={"solver": options}))
+                stats = res.diagnostics.stats if res.diagnostics else None
+                record = {
+                    "tier": tier,
+                    "seed": seed,
+                    "candidate": name,
+                    "options": options.model_dump(exclude_none=True),
+                    "status": res.status,
+                    "solver_status": stats.solver_status if stats else None,
+                    "objective": stats.objective if stats else None,
+                    "wall_time_ms": int((time.time() - t0) * 1000),
+                    "profile": stats.profile if stats else None,
+                    "num_workers": stats.num_workers if stats else None,
+                }
+                records.append(record)
+                if on_result is not None:
+                    on_result(record)
+    return records
+
+
+def recommend(records: list[dict]) -> dict[str, str]:
+    """
+    Best candidate per tier: best outcome summed over seeds, then lowest
+    objective, then lowest wall time.
+    """
+    totals: dict[tuple[str, str], list[float]] = {}
+    for r in records:
+        total = totals.setdefault((r["tier"], r["candidate"]), [0, 0.0, 0])
+        total[0] += STATUS_RANK.get(r["solver_status"] or r["status"], 4)
+        total[1] += r["objective"] if r["objective"] is not None else float("inf")
+        total[2] += r["wall_time_ms"]
+    best: dict[str, tuple[list[float], str]] = {}
+    for (tier, name), total in totals.items():
+        if tier not in best or total < best[tier][0]:
+            best[tier] = (total, name)
+    return {tier: name for tier, (_, name) in best.items()}
@@ -0,0 +1,44 @@
+"""Shared fixtures: generated bench instances and the domains the engines start from."""
+
+from __future__ import annotations
+from dataclasses import replace
+
+import pytest
+
+from app.models import SolveRequest
+from app.domain.time_grid import build_time_grid
+from app.domain.session_expander import expand_sessions
+from app.domain.availability import compile_availability
+from bench.generator import TIERS, generate
+
+
+def instance(tier: str, seed: int = 0) -> SolveRequest:
+    return generate(replace(TIERS[tier], seed=seed))
+
+
+def domains(req: SolveRequest):
+    """(sessions, avail, fac_starts, room_starts) as solve() builds them before domain reduction."""
+    avail = compile_availability(req, build_time_grid(req.time_config))
+    sessions = expand_sessions(req)
+    fac_starts = {s.id: {f: avail.faculty_starts(f, s.duration) for f in s.qualified_faculty_ids} for s in sessions}
+    room_starts = {s.id: {r: avail.room_starts(r, s.duration) for r in s.eligible_room_ids} for s in sessions}
+    return sessions, avail, fac_starts, room_starts
+
+
+def restrict_lecture_rooms(req: SolveRequest, availability: dict[str, list[int]]) -> SolveRequest:
+    """Copy of ``req`` whose lecture rooms are open only in ``availability``."""
+    variant = req.model_copy(deep=True)
+    for room in variant.rooms:
+        if room.type == "LECTURE":
+            room.availability = {d: list(s) for d, s in availability.items()}
+    return variant
+
+
+@pytest.fixture
+def tiny() -> SolveRequest:
+    return instance("tiny")
+
+
+@pytest.fixture
+def small() -> SolveRequest:
+    return instance("small")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+import threading
+
+from app.cache import ResultCache, cacheable, fingerprint
+from app.engine.solver import solve
+from app.models import DiagnosticsPayload, SolveResponse, SolveStats
+
+
+def _response(status: str, reasons: list[str], solver_status: str | None = None) -> SolveResponse:
+    stats = None
+    if solver_status is not None:
+        stats = SolveStats(
+            solver_status=solver_status, build_time_ms=0, presolve_time_ms=0, search_time_ms=0,
+            num_variables=0, num_constraints=0,
+        )
+    return SolveResponse(status=status, solve_time_ms=1, diagnostics=DiagnosticsPayload(reasons=reasons, stats=stats))
+
+
+OPTIMAL = _response("SUCCESS", ["Solver status: OPTIMAL"], "OPTIMAL")
+TIMEOUT = _response("INFEASIBLE", ["Solver status: UNKNOWN"], "UNKNOWN")
+
+
+def test_fingerprint_ignores_order_and_delivery_fields(tiny):
+    shuffled = tiny.model_copy(update={
+        "faculty": list(reversed(tiny.faculty)),
+        "rooms": list(reversed(tiny.rooms)),
+        "schedule_id": "s1",
+        "response_format": "columnar",
+    })
+    assert fingerprint(shuffled) == fingerprint(tiny)
+
+
+def test_fingerprint_changes_with_content(tiny):
+    changed = tiny.model_copy(deep=True)
+    changed.faculty[0].max_hours += 1
+    assert fingerprint(changed) != fingerprint(tiny)
+
+
+def test_only_definitive_outcomes_are_cacheable():
+    assert cacheable(OPTIMAL)
+    assert cacheable(_response("INFEASIBLE", ["Solver status: INFEASIBLE"], "INFEASIBLE"))
+    assert cacheable(_response("INFEASIBLE", ["LECTURE sessions need 9 room-slots per week"]))
+    assert not cacheable(TIMEOUT)
+    assert not cacheable(_response("SUCCESS", ["Solver status: FEASIBLE"], "FEASIBLE"))
+    assert not cacheable(_response("SUCCESS", ["Solver status: UNKNOWN; returning the greedy timetable"], "UNKNOWN"))
+    assert not cacheable(OPTIMAL.model_copy(update={"cancelled": True}))
+
+
+def test_cancelled_searches_are_not_cacheable(tiny):
+    cancel = threading.Event()
+    cancel.set()
+    res = solve(tiny, cancel=cancel)
+    assert res.cancelled
+    assert not cacheable(res)
+
+
+def test_timeouts_are_solved_again(tiny):
+    cache = ResultCache()
+    calls = []
+
+    def solve_fn(req):
+        calls.append(req)
+        return TIMEOUT
+
+    cache.get_or_solve(tiny, solve_fn)
+    cache.get_or_solve(tiny, solve_fn)
+    assert len(calls) == 2
+
+
+def test_hit_after_definitive_result(tiny):
+    cache = ResultCache()
+    assert cache.get_or_solve(tiny, lambda r: OPTIMAL) is OPTIMAL
+    assert cache.get_or_solve(tiny, lambda r: TIMEOUT) is OPTIMAL
+    assert cache.counters["hits"] == 1
+
+
+def test_least_recent_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, OPTIMAL)
+    assert cache.get("a") is None
+    assert cache.get("c") is OPTIMAL
+    assert cache.counters["evictions"] == 1
+
+
+def test_expired_entry_is_evicted():
+    cache = ResultCache(ttl_seconds=-1)
+    cache.put("a", OPTIMAL)
+    assert cache.get("a") is None
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    ResultCache(directory=str(tmp_path)).put("a", OPTIMAL)
+    ResultCache(directory=str(tmp_path)).put("t", TIMEOUT)
+    fresh = ResultCache(directory=str(tmp_path))
+    assert fresh.get("a") == OPTIMAL
+    assert fresh.get("t") is None
+    assert fresh.counters["disk_hits"] == 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json
+
+from fastapi.testclient import TestClient
+
+from app.columnar import COLUMNAR_MEDIA_TYPE, dumps, encode
+from app.engine.solver import solve
+from app.main import app
+from app.models import AssignmentResult
+
+
+def _decode(block: dict, tables: dict) -> list[AssignmentResult]:
+    rows = []
+    for i in range(len(block["course"])):
+        code, name = tables["courses"][block["course"][i]]
+        group = block["lab_group"][i]
+        rows.append(AssignmentResult(
+            course_code=code,
+            course_name=name,
+            faculty_id=tables["faculty"][block["faculty"][i]],
+            room_id=tables["rooms"][block["room"][i]],
+            batch_id=tables["batches"][block["batch"][i]],
+            section_id=tables["sections"][block["section"][i]],
+            lab_group_id=tables["lab_groups"][group] if group >= 0 else None,
+            day=tables["days"][block["day"][i]],
+            slot_index=block["slot_index"][i],
+            duration=block["duration"][i],
+            start_time=tables["times"][block["start_time"][i]],
+            end_time=tables["times"][block["end_time"][i]],
+        ))
+    return rows
+
+
+def test_round_trip_is_lossless(tiny):
+    res = solve(tiny.model_copy(update={"solutions": 2}))
+    payload = json.loads(dumps(encode(res)))
+    assert payload["status"] == res.status
+    assert _decode(payload["assignments"], payload["tables"]) == res.assignments
+    assert len(payload["alternatives"]) == len(res.alternatives) == 1
+    for alt, encoded in zip(res.alternatives, payload["alternatives"]):
+        assert _decode(encoded["assignments"], payload["tables"]) == alt.assignments
+        assert _decode(encoded["added"], payload["tables"]) == alt.added
+
+
+def test_accept_header_selects_columnar(tiny):
+    client = TestClient(app)
+    body = tiny.model_dump(mode="json")
+    rows = client.post("/solve", json=body)
+    columnar = client.post("/solve", json=body, headers={"Accept": COLUMNAR_MEDIA_TYPE})
+    assert rows.headers["content-type"] == "application/json"
+    assert columnar.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+    payload = columnar.json()
+    assert _decode(payload["assignments"], payload["tables"]) == [
+        AssignmentResult.model_validate(a) for a in rows.json()["assignments"]
+    ]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from app.engine.decompose import find_components
+from app.domain.session_expander import expand_sessions
+from app.engine.solver import solve
+from app.engine.verifier import verify
+from app.models import SolveRequest
+from .conftest import instance
+
+
+def _prefixed(obj, prefix: str):
+    """``obj`` with every id and id reference prefixed, so two copies share nothing."""
+    if isinstance(obj, dict):
+        return {
+            k: prefix + v if isinstance(v, str) and (k == "id" or k.endswith("_id"))
+            else [prefix + x for x in v] if k.endswith("_ids")
+            else _prefixed(v, prefix)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_prefixed(x, prefix) for x in obj]
+    return obj
+
+
+def _only(data: dict, room_type: str) -> dict:
+    """Keep the courses and rooms of one type, so the copies do not share rooms either."""
+    data["courses"] = [c for c in data["courses"] if (c["type"] == "LAB") == (room_type == "LAB")]
+    sections = {sec["id"] for c in data["courses"] for sec in c["sections"]}
+    for batch in data["batches"]:
+        batch["section_ids"] = [s for s in batch["section_ids"] if s in sections]
+    data["rooms"] = [r for r in data["rooms"] if r["type"] == room_type]
+    return data
+
+
+def _two_components() -> SolveRequest:
+    base = instance("tiny").model_dump()
+    merged = _only(_prefixed(base, "a-"), "LECTURE")
+    other = _only(_prefixed(base, "b-"), "LAB")
+    for key in ("batches", "faculty", "rooms", "courses"):
+        merged[key] += other[key]
+    return SolveRequest.model_validate(merged)
+
+
+def test_components_are_solved_separately_and_reported():
+    req = _two_components().model_copy(update={"decompose": True, "deadline_seconds": 10.0})
+    sessions = expand_sessions(req)
+    assert len(find_components(req, sessions)) == 2
+
+    events = []
+    res = solve(req, on_solution=events.append)
+    assert res.status == "SUCCESS"
+    assert verify(req, res.assignments) == []
+    assert [c.status for c in res.diagnostics.components] == ["SUCCESS", "SUCCESS"]
+    assert [c.solver_status for c in res.diagnostics.components] == ["OPTIMAL", "OPTIMAL"]
+    assert sum(c.sessions for c in res.diagnostics.components) == len(sessions)
+    assert [e.index for e in events] == [1, 2]
+    added = [a.model_dump_json() for e in events for a in e.added]
+    assert sorted(added) == sorted(a.model_dump_json() for a in res.assignments)
+
+
+def test_shared_resources_keep_one_component(tiny):
+    assert len(find_components(tiny, expand_sessions(tiny))) == 1
@@ -0,0 +1,34 @@
+from __future__ import annotations
+import time
+
+from app.domain.time_grid import build_time_grid
+from app.engine.explain import explain_infeasibility
+from app.engine.solver import solve
+from .conftest import domains, restrict_lecture_rooms
+
+
+def _over_constrained(req):
+    """Passes the prechecks but has no timetable: lecture rooms and faculty share only Tuesday."""
+    grid = build_time_grid(req.time_config)
+    variant = restrict_lecture_rooms(req, {d: [s.index for s in grid if s.day == d] for d in ("MON", "TUE")})
+    for fac in variant.faculty:
+        fac.availability = {d: s for d, s in fac.availability.items() if d in ("TUE", "WED")}
+    return variant
+
+
+def test_model_build_counts_against_the_budget(tiny):
+    req = _over_constrained(tiny)
+    sessions, avail, _, _ = domains(req)
+    slots = build_time_grid(req.time_config)
+    reasons = explain_infeasibility(req, sessions, avail, slots, {}, budget=1e-6)
+    assert reasons == ["Explanation: not attempted; building the model took longer than 1e-06s"]
+
+
+def test_explanation_stays_within_budget(tiny):
+    req = _over_constrained(tiny).model_copy(update={"explain_seconds": 1.0})
+    t0 = time.time()
+    res = solve(req)
+    assert res.status == "INFEASIBLE"
+    assert res.diagnostics.stats.solver_status == "INFEASIBLE"
+    assert any(r.startswith("Explanation:") for r in res.diagnostics.reasons)
+    assert time.time() - t0 < 1.0 + 5.0  # the budget plus the main solve
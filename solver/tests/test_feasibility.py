@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from app.engine.feasibility import check_feasibility
+from app.engine.solver import solve
+from app.engine.verifier import verify
+from .conftest import domains, restrict_lecture_rooms
+
+
+def test_generated_instance_passes_prechecks(tiny):
+    sessions, avail, _, _ = domains(tiny)
+    assert check_feasibility(tiny, sessions, avail) == []
+
+
+def test_room_supply_shortfall_is_reported(tiny):
+    res = solve(restrict_lecture_rooms(tiny, {"MON": [0, 1, 2, 3]}))
+    assert res.status == "INFEASIBLE"
+    assert res.diagnostics.stats is None  # decided before any model was built
+    assert any("LECTURE sessions need" in r for r in res.diagnostics.reasons)
+
+
+def test_overloaded_faculty_is_reported(tiny):
+    for fac in tiny.faculty:
+        fac.max_hours = 1
+    sessions, avail, _, _ = domains(tiny)
+    assert check_feasibility(tiny, sessions, avail)
+
+
+def test_other_course_types_use_lecture_rooms(tiny):
+    course = next(c for c in tiny.courses if c.type == "LECTURE")
+    course.type = "TUTORIAL"
+    sessions, avail, _, _ = domains(tiny)
+    assert check_feasibility(tiny, sessions, avail) == []
+
+    res = solve(tiny)
+    assert res.status == "SUCCESS"
+    assert verify(tiny, res.assignments) == []
+    lecture_rooms = {r.id for r in tiny.rooms if r.type == "LECTURE"}
+    sections = {sec.id for sec in course.sections}
+    assert all(a.room_id in lecture_rooms for a in res.assignments if a.section_id in sections)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from app.domain.types import Session
+from app.engine.feasibility import max_slots_for
+from app.engine.greedy import construct
+from app.engine.solver import solve
+from app.engine.verifier import verify
+from .conftest import domains
+
+
+def test_fast_mode_returns_a_valid_timetable(small):
+    res = solve(small.model_copy(update={"mode": "fast"}))
+    assert res.status == "SUCCESS"
+    assert res.diagnostics.reasons[0].startswith("Fast mode")
+    assert verify(small, res.assignments) == []
+
+
+def test_construction_places_every_session(tiny):
+    sessions, _, fac_starts, room_starts = domains(tiny)
+    result = construct(
+        sessions, fac_starts, room_starts,
+        {r.id: r.capacity for r in tiny.rooms},
+        {f.id: max_slots_for(f.max_hours, tiny.time_config.slot_duration) for f in tiny.faculty},
+    )
+    assert result.complete
+    assert sorted(p.session.id for p in result.placements) == sorted(s.id for s in sessions)
+
+
+def test_conflicting_sessions_leave_the_construction_incomplete(tiny):
+    sessions, _, fac_starts, room_starts = domains(tiny)
+    first, second = [s for s in sessions if s.lab_group_id is None][:2]
+    start = next(iter(fac_starts[first.id].values())) & -next(iter(fac_starts[first.id].values()))
+    for sess in (first, second):  # same batch, same single start
+        fac_starts[sess.id] = {f: start for f in fac_starts[sess.id]}
+        room_starts[sess.id] = {r: start for r in room_starts[sess.id]}
+    result = construct(
+        sessions, fac_starts, room_starts,
+        {r.id: r.capacity for r in tiny.rooms},
+        {f.id: max_slots_for(f.max_hours, tiny.time_config.slot_duration) for f in tiny.faculty},
+        max_backtracks=10,
+    )
+    assert not result.complete
+    assert 0 < result.backtracks <= 11
+    assert len(result.placements) < len(sessions)
+
+
+def test_backtracking_tries_other_faculty_at_the_same_start():
+    def session(sid: str, faculty: list[str], room: str) -> Session:
+        return Session(sid, "c", "C", "C", "LECTURE", f"sec-{sid}", None, f"b-{sid}", 1, faculty, [room])
+
+    # "a" goes first and takes the least loaded of f1 and f2, i.e. f1, which "b" needs at the only start
+    sessions = [session("a", ["f1", "f2"], "r1"), session("b", ["f1"], "r2")]
+    fac_starts = {"a": {"f1": 1, "f2": 1}, "b": {"f1": 1}}
+    room_starts = {"a": {"r1": 1}, "b": {"r2": 1}}
+    result = construct(sessions, fac_starts, room_starts, {"r1": 30, "r2": 30}, {"f1": 10, "f2": 10})
+    assert result.complete
+    assert {p.session.id: p.faculty_id for p in result.placements} == {"a": "f2", "b": "f1"}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import time
+
+import pytest
+
+from app.cache import result_cache
+from app.jobs import JobManager
+from .conftest import instance
+
+
+def _wait(job, statuses: tuple[str, ...], timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    with job.changed:
+        while job.status not in statuses:
+            assert job.changed.wait(max(0.0, deadline - time.time())), f"job stuck in {job.status}"
+
+
+@pytest.fixture
+def manager():
+    result_cache.clear()  # submissions must run, not complete from an earlier test's result
+    manager = JobManager(max_workers=1, max_pending=4)
+    yield manager
+    manager.shutdown()
+
+
+def test_job_completes_with_progress(manager, tiny):
+    job = manager.submit(tiny)
+    _wait(job, ("COMPLETED",))
+    status = job.to_status()
+    assert status.result.status == "SUCCESS"
+    assert status.solutions_found == len(job.events) > 0
+
+
+def test_running_and_queued_jobs_can_be_cancelled(manager):
+    req = instance("medium")
+    running = manager.submit(req)
+    queued = manager.submit(req)
+    _wait(running, ("RUNNING",))
+
+    t0 = time.time()
+    manager.cancel(running.id)
+    # the pool may already hold the queued job; it then stops as soon as it starts
+    manager.cancel(queued.id)
+    for job in (running, queued):
+        _wait(job, ("CANCELLED",), timeout=30.0)
+    assert time.time() - t0 < 30.0
+    assert running.to_status().status == "CANCELLED"
+    assert result_cache.get(running.fingerprint) is None
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from app.engine.reduction import ReductionReport, apply_bounds, count_options, propagate
+from .conftest import domains
+
+
+def test_bounds_drop_rooms_too_small(tiny):
+    room = next(r for r in tiny.rooms if r.type == "LECTURE")
+    room.capacity = 1
+    sessions, _, fac_starts, room_starts = domains(tiny)
+    report = ReductionReport(options_before=count_options(sessions, fac_starts, room_starts))
+    apply_bounds(tiny, sessions, fac_starts, room_starts, report)
+    assert report.small_rooms > 0
+    assert all(room.id not in rooms for rooms in room_starts.values())
+    assert report.reasons == []
+
+
+def test_pinned_session_blocks_its_batch(tiny):
+    sessions, _, fac_starts, room_starts = domains(tiny)
+    pinned = next(s for s in sessions if s.lab_group_id is None)
+    fid, fmask = next(iter(fac_starts[pinned.id].items()))
+    rid, rmask = next((r, m) for r, m in room_starts[pinned.id].items() if m & fmask)
+    gi = (fmask & rmask & -(fmask & rmask)).bit_length() - 1
+    fac_starts[pinned.id] = {fid: 1 << gi}
+    room_starts[pinned.id] = {rid: 1 << gi}
+
+    report = ReductionReport(options_before=count_options(sessions, fac_starts, room_starts))
+    propagate(tiny, sessions, fac_starts, room_starts, report)
+    assert report.reasons == []
+    assert count_options(sessions, fac_starts, room_starts) < report.options_before
+
+    for sess in sessions:
+        if sess.id == pinned.id or sess.batch_id != pinned.batch_id:
+            continue
+        for table in (fac_starts, room_starts):
+            for mask in table[sess.id].values():
+                for start in range(mask.bit_length()):
+                    if mask >> start & 1:
+                        assert start + sess.duration <= gi or start >= gi + pinned.duration
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.columnar import COLUMNAR_MEDIA_TYPE
+from app.engine import profiles
+from app.engine.verifier import verify
+from app.main import app
+from app.models import DeltaOp, DeltaRequest
+from app.resident import ModelStore, apply_delta
+
+
+def _store_with(req):
+    """A store holding ``req`` as schedule "s1"; its deltas inherit the 1s deadline."""
+    store = ModelStore(budget_bytes=2**30)
+    res = store.solve(req.model_copy(update={"schedule_id": "s1", "deadline_seconds": 1.0}))
+    assert res.status == "SUCCESS"
+    return store
+
+
+def test_deltas_update_the_model_in_place(tiny):
+    store = _store_with(tiny)
+    course = next(c for c in tiny.courses if c.type == "LECTURE" and c.sessions_per_week > 1)
+    fac = tiny.faculty[0]
+    day = next(iter(fac.availability))
+    ops = [
+        DeltaOp(op="set_sessions_per_week", target_id=course.id, sessions_per_week=course.sessions_per_week - 1),
+        DeltaOp(op="remove_availability", target_id=fac.id, availability={day: fac.availability[day]}),
+    ]
+    res = store.apply("s1", DeltaRequest(ops=ops))
+    assert res.status == "SUCCESS"
+    assert any(r.startswith("Resident model: updated in place") for r in res.diagnostics.reasons)
+    updated = apply_delta(tiny, ops)
+    assert day not in next(f for f in updated.faculty if f.id == fac.id).availability
+    assert verify(updated, res.assignments) == []
+    assert not any(a.faculty_id == fac.id and a.day == day for a in res.assignments)
+    assert store.counters == {"builds": 1, "updates": 1, "evictions": 0}
+
+
+def test_lock_keeps_the_placement(tiny):
+    store = _store_with(tiny)
+    first = store.apply("s1", DeltaRequest(ops=[]))
+    locked = first.assignments[0]
+    res = store.apply("s1", DeltaRequest(ops=[DeltaOp(op="lock", assignment=locked)]))
+    assert res.status == "SUCCESS"
+    assert locked in res.assignments
+
+
+def test_bad_delta_is_rejected(tiny):
+    store = _store_with(tiny)
+    res = store.apply("s1", DeltaRequest(ops=[DeltaOp(op="remove_course", target_id="nope")]))
+    assert res.status == "FAILED"
+    assert res.diagnostics.reasons == ["No course nope"]
+    assert store.apply("s1", DeltaRequest(ops=[])).status == "SUCCESS"
+
+
+def test_models_over_budget_are_evicted(tiny):
+    store = ModelStore(budget_bytes=1)
+    store.solve(tiny.model_copy(update={"schedule_id": "s1", "deadline_seconds": 1.0}))
+    assert store.apply("s1", DeltaRequest(ops=[])) is None
+    assert store.counters["evictions"] == 1
+
+
+def test_deltas_answer_in_the_resident_format(tiny):
+    client = TestClient(app)
+    body = tiny.model_copy(update={"deadline_seconds": 1.0, "response_format": "columnar"}).model_dump(mode="json")
+    try:
+        assert client.put("/schedules/fmt", json=body).headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        res = client.post("/schedules/fmt/deltas", json={"ops": []})
+        assert res.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        assert "tables" in res.json()
+    finally:
+        client.delete("/schedules/fmt")
+
+
+def test_unsupported_options_are_rejected(tiny):
+    store = ModelStore(budget_bytes=2**30)
+    res = store.solve(tiny.model_copy(update={"schedule_id": "s1", "mode": "fast", "explain_seconds": 1.0}))
+    assert res.status == "FAILED"
+    assert len(res.diagnostics.reasons) == 2
+    assert store.request("s1") is None
+
+
+def test_synchronous_cap_applies_without_a_deadline(tiny, monkeypatch):
+    monkeypatch.setattr(profiles, "SYNC_TIME_LIMIT", 0.5)
+    client = TestClient(app)
+
+    def limit(res) -> float:
+        return res.json()["diagnostics"]["stats"]["max_time_seconds"]
+
+    try:
+        assert limit(client.put("/schedules/cap", json=tiny.model_dump(mode="json"))) == 0.5
+        assert limit(client.post("/schedules/cap/deltas", json={"ops": []})) == 0.5
+        assert limit(client.post("/schedules/cap/deltas", json={"ops": [], "deadline_seconds": 2.0})) > 0.5
+    finally:
+        client.delete("/schedules/cap")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from app.engine.solver import solve
+from app.engine.verifier import verify
+from .conftest import instance
+
+
+@pytest.mark.parametrize("tier", ["tiny", "small"])
+def test_deferred_rooms_are_matched_to_real_rooms(tier):
+    req = instance(tier).model_copy(update={"room_assignment": "deferred"})
+    res = solve(req)
+    assert res.status == "SUCCESS"
+    assert verify(req, res.assignments) == []
+    assert len({a.room_id for a in res.assignments}) > 2  # not left on the type representatives
+
+
+def test_deferred_rooms_need_the_boolean_engine(tiny):
+    res = solve(tiny.model_copy(update={"room_assignment": "deferred", "engine": "interval"}))
+    assert res.status == "FAILED"
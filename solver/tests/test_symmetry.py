@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from app.engine.solver import solve
+from app.engine.symmetry import symmetric_chains
+from .conftest import domains
+
+
+def _parallel_labs(req):
+    """
+    One lab course whose two groups meet twice a week in double slots, with
+    two lab rooms open for exactly two such slots: every timetable runs the
+    groups side by side.
+    """
+    req = req.model_copy(deep=True)
+    lab = next(c for c in req.courses if c.type == "LAB")
+    lab.hours_per_week, lab.sessions_per_week = 4, 2
+    section = lab.sections[0]
+    batch = next(b for b in req.batches if section.id in b.section_ids)
+    batch.section_ids = [section.id]
+    room = next(r for r in req.rooms if r.type == "LAB")
+    room.availability = {"MON": [0, 1], "TUE": [0, 1]}
+    twin = room.model_copy(update={"id": f"{room.id}-twin", "name": f"{room.name} twin"})
+    for fac in req.faculty:
+        fac.qualified_course_ids = [lab.id]
+        fac.availability = {day: list(range(7)) for day in req.time_config.days}
+        fac.max_hours = 40
+    return req.model_copy(update={"courses": [lab], "batches": [batch], "rooms": [room, twin]})
+
+
+def test_lab_groups_of_a_section_can_share_a_slot(tiny):
+    req = _parallel_labs(tiny)
+    sessions, _, fac_starts, room_starts = domains(req)
+    assert symmetric_chains(sessions, fac_starts, room_starts, set())
+
+    res = solve(req)
+    assert res.status == "SUCCESS"
+    starts = {}
+    for a in res.assignments:
+        starts.setdefault(a.lab_group_id, set()).add((a.day, a.slot_index))
+    assert len(starts) == 2
+    assert len(set.intersection(*starts.values())) == 2
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from app.engine.solver import solve
+from app.engine.verifier import TimetableIndex, verify
+from .conftest import instance
+
+
+@pytest.mark.parametrize("tier", ["tiny", "small"])
+def test_solved_tiers_verify_clean(tier):
+    req = instance(tier)
+    res = solve(req)
+    assert res.status == "SUCCESS"
+    assert res.assignments
+    assert verify(req, res.assignments) == []
+
+
+def test_detects_double_booked_room(tiny):
+    res = solve(tiny)
+    index = TimetableIndex(tiny, res.assignments)
+    first, other = next(
+        (i, j)
+        for i, a in enumerate(res.assignments) for j, b in enumerate(res.assignments)
+        if i != j and a.room_id == b.room_id and a.duration == b.duration
+    )
+    target = res.assignments[other]
+    violations = index.check_move(first, day=target.day, slot_index=target.slot_index)
+    assert any(v.kind == "room_clash" for v in violations)
+
+
+def test_missing_session_is_reported(tiny):
+    res = solve(tiny)
+    violations = verify(tiny, res.assignments[1:])
+    assert [v.kind for v in violations] == ["coverage"]
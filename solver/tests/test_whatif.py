@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from app.models import PatchOp, Scenario, WhatIfRequest
+from app.whatif import run_what_if
+from .conftest import instance
+
+
+def test_deadline_covers_the_whole_comparison():
+    req = instance("medium").model_copy(update={"deadline_seconds": 4.0})
+    room = next(r for r in req.rooms if r.type == "LECTURE")
+    body = WhatIfRequest(base=req, cores=1, scenarios=[
+        Scenario(name="no-room", patches=[PatchOp(op="remove_room", target_id=room.id)]),
+        Scenario(name="no-fri", patches=[PatchOp(op="remove_days", target_id=room.id, days=["FRI"])]),
+    ])
+    res = run_what_if(body)
+    # one core: the base and the two scenarios run one after another, so each gets about a third
+    for result in (res.base, *res.scenarios):
+        assert result.status == "SUCCESS"
+        assert result.solve_time_ms < 4000 / 2